@@ -0,0 +1,9 @@
+"""Reproducible performance measurements for maintainers.
+
+Executable modules:
+- benchmarks_embedding_batching: time fixed and token-budget embedding batches
+"""
+
+from __future__ import annotations
+
+__all__: list[str] = []
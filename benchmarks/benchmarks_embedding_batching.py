@@ -0,0 +1,259 @@
+"""
+===============================================================================
+benchmarks_embedding_batching.py
+===============================================================================
+Measure local embedding throughput with fixed and token-budget batching.
+
+Responsibilities:
+  - Build a seeded corpus that mixes short headings with long paragraphs.
+  - Time the SentenceTransformer provider with fixed batches and token budgets.
+  - Print passages per second, model batches, and padded tokens as JSON.
+
+Design principles:
+  - Drive the production provider, so the measured batching is the shipped one.
+  - Without ``--model``, time a NumPy stand-in encoder whose cost grows with
+    padded tokens and sequence length, so batching stays measurable offline.
+  - Batch and sort exactly like ``SentenceTransformer.encode``, which groups
+    length-sorted passages into ``batch_size`` batches inside one call.
+
+Boundaries:
+  - Reports relative batching effects, not absolute model quality or latency.
+  - Never downloads a model unless ``--model`` names one.
+
+Notes:
+  - Execute with ``python -m benchmarks.benchmarks_embedding_batching``.
+===============================================================================
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable, Sequence
+from typing import Any, TextIO
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src import embeddings
+
+__all__: list[str] = []
+
+_DIMENSION = 384
+_WORDS = ("retrieval", "document", "section", "vector", "passage", "answer", "page")
+
+
+class _StandInEncoder:
+    """Encode like a one-layer transformer, paying for every padded token.
+
+    Notes
+    -----
+    Token lengths use the provider's four-characters-per-token estimate, which
+    the provider also applies because this model has no tokenizer.
+    """
+
+    def __init__(self, seed: int) -> None:
+        generator = np.random.default_rng(seed)
+        self._embedding = generator.standard_normal((512, _DIMENSION)).astype(
+            np.float32
+        )
+        self._projection = generator.standard_normal((_DIMENSION, _DIMENSION)).astype(
+            np.float32
+        ) / np.sqrt(_DIMENSION)
+
+    @staticmethod
+    def token_length(text: str) -> int:
+        return len(text) // 4 + 2
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return _DIMENSION
+
+    def encode(self, texts: Sequence[str], *, batch_size: int, **_kwargs: Any) -> Any:
+        lengths = [self.token_length(text) for text in texts]
+        order = np.argsort([-length for length in lengths], kind="stable")
+        encoded = np.empty((len(texts), _DIMENSION), dtype=np.float32)
+        for first in range(0, len(texts), batch_size):
+            rows = order[first : first + batch_size]
+            padded = max(lengths[row] for row in rows)
+            hidden = np.broadcast_to(
+                self._embedding[:padded], (len(rows), padded, _DIMENSION)
+            )
+            # Self-attention and the projection both scale with the padded shape.
+            scores = hidden @ hidden.transpose(0, 2, 1) / np.sqrt(_DIMENSION)
+            scores = np.exp(scores - scores.max(axis=2, keepdims=True))
+            scores /= scores.sum(axis=2, keepdims=True)
+            pooled = np.tanh((scores @ hidden) @ self._projection).mean(axis=1)
+            encoded[rows] = pooled / np.linalg.norm(pooled, axis=1, keepdims=True)
+        return encoded
+
+
+class _RecordingModel:
+    """Forward to a model and record the batches one ``encode`` call forms."""
+
+    def __init__(self, model: Any, token_length: Callable[[str], int]) -> None:
+        self.model = model
+        self.token_length = token_length
+        self.batches: list[list[str]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.model, name)
+
+    def encode(self, texts: Sequence[str], *, batch_size: int, **kwargs: Any) -> Any:
+        ordered = sorted(texts, key=len, reverse=True)
+        self.batches.extend(
+            ordered[first : first + batch_size]
+            for first in range(0, len(ordered), batch_size)
+        )
+        return self.model.encode(texts, batch_size=batch_size, **kwargs)
+
+    def padded_tokens(self) -> int:
+        return sum(
+            len(batch) * max(map(self.token_length, batch)) for batch in self.batches
+        )
+
+
+def _corpus(
+    count: int, short_fraction: float, seed: int
+) -> tuple[list[str], NDArray[np.int64]]:
+    generator = np.random.default_rng(seed)
+    short = generator.random(count) < short_fraction
+    tokens = np.where(
+        short,
+        generator.integers(4, 17, count),
+        generator.integers(120, 257, count),
+    )
+    texts = []
+    for number, token_count in enumerate(tokens.tolist()):
+        words = " ".join(
+            _WORDS[(number + offset) % len(_WORDS)] for offset in range(64)
+        )
+        text = f"{number} {words * (token_count // 100 + 1)}"
+        texts.append(text[: token_count * 4])
+    return texts, tokens
+
+
+def _measure(
+    model: _RecordingModel,
+    texts: list[str],
+    *,
+    batch_size: int,
+    max_batch_tokens: int | None,
+    repeats: int,
+) -> dict[str, Any]:
+    provider = embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider(
+        model_id="benchmark-model",
+        dimension=model.get_sentence_embedding_dimension(),
+        batch_size=batch_size,
+        use_e5_prefixes=False,
+        model_factory=lambda _model_id: model,
+        max_batch_tokens=max_batch_tokens,
+    )
+    # The first call loads the model and warms caches outside the timings.
+    provider.embed_documents_array(texts[:batch_size])
+    timings = []
+    for _ in range(repeats):
+        model.batches.clear()
+        started = time.perf_counter()
+        provider.embed_documents_array(texts)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        "batching": (
+            f"fixed batch_size={batch_size}"
+            if max_batch_tokens is None
+            else f"max_batch_tokens={max_batch_tokens}"
+        ),
+        "passages_per_second": round(len(texts) / best, 1),
+        "best_seconds": round(best, 4),
+        "model_batches": len(model.batches),
+        "padded_tokens": model.padded_tokens(),
+    }
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Time fixed and token-budget local embedding batches."
+    )
+    parser.add_argument("--passages", type=int, default=2_000)
+    parser.add_argument(
+        "--short-fraction",
+        type=float,
+        default=0.4,
+        help="Share of 4-16 token passages; the rest have 120-256 tokens.",
+    )
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument(
+        "--budgets", type=int, nargs="+", default=[4_096, 8_192, 16_384]
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--model",
+        help="SentenceTransformer model to load instead of the NumPy stand-in.",
+    )
+    return parser
+
+
+def run(argv: Sequence[str] | None = None, *, stdout: TextIO = sys.stdout) -> int:
+    """Run every batching configuration and print one JSON report.
+
+    Parameters
+    ----------
+    argv
+        Command-line arguments; defaults to ``sys.argv[1:]``.
+    stdout
+        Stream receiving the report.
+
+    Returns
+    -------
+    int
+        ``0`` after the report is printed.
+    """
+
+    args = _parser().parse_args(argv)
+    texts, tokens = _corpus(args.passages, args.short_fraction, args.seed)
+    if args.model is None:
+        stand_in = _StandInEncoder(args.seed)
+        model = _RecordingModel(stand_in, stand_in.token_length)
+    else:
+        from sentence_transformers import SentenceTransformer
+
+        loaded = SentenceTransformer(args.model)
+        model = _RecordingModel(
+            loaded,
+            lambda text: len(
+                loaded.tokenizer(
+                    text, truncation=True, max_length=loaded.max_seq_length
+                )["input_ids"]
+            ),
+        )
+    results = [
+        _measure(
+            model,
+            texts,
+            batch_size=args.batch_size,
+            max_batch_tokens=budget,
+            repeats=args.repeats,
+        )
+        for budget in [None, *args.budgets]
+    ]
+    report = {
+        "model": args.model or "numpy-stand-in",
+        "passages": len(texts),
+        "short_passages": int((tokens < 17).sum()),
+        "results": results,
+    }
+    stdout.write(f"{json.dumps(report, indent=2)}\n")
+    return 0
+
+
+def main() -> None:
+    """Execute the benchmark and terminate with its returned status code."""
+
+    raise SystemExit(run())
+
+
+if __name__ == "__main__":
+    main()
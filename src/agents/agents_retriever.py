@@ -8,6 +8,7 @@ Responsibilities:
   - Bound and serialize the current question with recent user history.
   - Validate embedding-model and vector-dimension compatibility.
   - Embed the query and return the nearest session-owned records.
+  - Optionally reuse recent query vectors through a shared bounded LRU.
 
 Design principles:
   - Place the current question first so truncation preserves intent.
@@ -21,9 +22,15 @@ Boundaries:
 
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from typing import Any, Protocol, Sequence
 
+import numpy as np
+from numpy.typing import NDArray
+
 __all__ = [
+    "QueryEmbeddingCache",
     "RetrievalConfigurationError",
     "RetrievalError",
     "RetrievalValidationError",
@@ -84,6 +91,120 @@ class _VectorSearchStore(Protocol):
         ...
 
 
+class QueryEmbeddingCache:
+    """Share recently embedded retrieval inputs between retrievers.
+
+    Parameters
+    ----------
+    max_entries
+        Positive number of query vectors kept in memory.
+
+    Raises
+    ------
+    ValueError
+        If ``max_entries`` is not a positive integer.
+
+    Notes
+    -----
+    Vectors are keyed by embedding model identifier and the exact embedding
+    input, which already includes the bounded history, and the least recently
+    used vector is evicted first. Vectors are stored as read-only ``float64``
+    arrays, so a hit returns exactly the values the provider produced. The
+    cache is thread-safe.
+    """
+
+    def __init__(self, *, max_entries: int = 1_024) -> None:
+        """Configure the number of cached query vectors."""
+
+        if (
+            isinstance(max_entries, bool)
+            or not isinstance(max_entries, int)
+            or max_entries <= 0
+        ):
+            raise ValueError("max_entries must be a positive integer")
+        self.max_entries = max_entries
+        self._vectors: OrderedDict[tuple[str, str], NDArray[np.float64]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached query vectors."""
+
+        with self._lock:
+            return len(self._vectors)
+
+    @property
+    def hits(self) -> int:
+        """Return the number of lookups answered from the cache."""
+
+        with self._lock:
+            return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Return the number of lookups that found no cached vector."""
+
+        with self._lock:
+            return self._misses
+
+    def get(self, model_id: str, text: str) -> list[float] | None:
+        """Return the cached vector for one embedding input, if present.
+
+        Parameters
+        ----------
+        model_id
+            Identifier of the model that embedded the input.
+        text
+            Exact embedding input.
+
+        Returns
+        -------
+        list of float or None
+            Cached query vector, or ``None`` on a miss.
+        """
+
+        key = (model_id, text)
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._vectors.move_to_end(key)
+        return vector.tolist()
+
+    def put(self, model_id: str, text: str, vector: Sequence[float]) -> None:
+        """Cache the vector of one embedding input.
+
+        Parameters
+        ----------
+        model_id
+            Identifier of the model that embedded the input.
+        text
+            Exact embedding input.
+        vector
+            Query vector returned by the embedding provider.
+
+        Raises
+        ------
+        ValueError
+            If ``vector`` is not a non-empty, finite, one-dimensional sequence.
+        """
+
+        stored = _finite_vector(vector)
+        if stored is None:
+            raise ValueError(
+                "vector must be a non-empty finite one-dimensional sequence"
+            )
+        stored.setflags(write=False)
+        with self._lock:
+            self._vectors[(model_id, text)] = stored
+            self._vectors.move_to_end((model_id, text))
+            while len(self._vectors) > self.max_entries:
+                self._vectors.popitem(last=False)
+
+
 class RetrieverAgent:
     """Embed history-aware questions against one session-owned FAISS store.
 
@@ -97,6 +218,8 @@ class RetrieverAgent:
         Maximum number of nearest records returned per question.
     max_query_characters
         Character bound for the current question and retained user history.
+    query_cache
+        Optional cache of query vectors shared with other retrievers.
 
     Raises
     ------
@@ -113,6 +236,7 @@ class RetrieverAgent:
         *,
         top_k: int = 5,
         max_query_characters: int = 4_000,
+        query_cache: QueryEmbeddingCache | None = None,
     ) -> None:
         """Create a retriever sharing the ingestion embedding provider."""
 
@@ -132,6 +256,7 @@ class RetrieverAgent:
         self.embedder = embedder
         self.top_k = top_k
         self.max_query_characters = max_query_characters
+        self.query_cache = query_cache
 
     def retrieve_documents(
         self, query: str, history: Sequence[dict[str, str]]
@@ -189,5 +314,30 @@ class RetrieverAgent:
         if prior_questions:
             prior_questions.reverse()
             embedding_input += history_prefix + "\n".join(prior_questions)
+        return self.faiss_store.search(self._embed_query(embedding_input), k=self.top_k)
+
+    def _embed_query(self, embedding_input: str) -> list[float]:
+        if self.query_cache is None:
+            return self.embedder.embed_query(embedding_input)
+        cached = self.query_cache.get(self.embedder.model_id, embedding_input)
+        if cached is not None:
+            return cached
         query_embedding = self.embedder.embed_query(embedding_input)
-        return self.faiss_store.search(query_embedding, k=self.top_k)
+        # Invalid vectors go uncached so the store rejects them on every call
+        # instead of one session's failure being replayed to all others.
+        vector = _finite_vector(query_embedding)
+        if vector is not None and vector.shape == (self.embedder.dimension,):
+            self.query_cache.put(
+                self.embedder.model_id, embedding_input, query_embedding
+            )
+        return query_embedding
+
+
+def _finite_vector(vector: Sequence[float]) -> NDArray[np.float64] | None:
+    try:
+        array = np.array(vector, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    if array.ndim != 1 or not array.size or not np.isfinite(array).all():
+        return None
+    return array
@@ -6,6 +6,8 @@ Compose session-owned application components from validated configuration.
 
 Responsibilities:
   - Share one lazy local embedding provider across Streamlit reruns.
+  - Share prepared documents, indexed segments, and query vectors between
+    sessions with equal settings.
   - Construct hosted-provider clients only when generation is invoked.
   - Wire session isolation, orchestration, routing, and quota enforcement.
 
@@ -21,7 +23,9 @@ Boundaries:
 
 from __future__ import annotations
 
+import json
 import logging
+import weakref
 from functools import lru_cache
 from typing import Any
 
@@ -42,7 +46,14 @@ from . import application_session as session
 __all__ = ["create_application_session", "create_embedding_provider"]
 
 _BYTES_PER_MEGABYTE = 1024 * 1024
+_MAX_CHUNK_LENGTH = 1000
+_CHUNK_OVERLAP_LENGTH = 200
 _LOGGER = logging.getLogger(__name__)
+# Providers whose warm-up failed; later sessions leave loading to the first
+# request instead of paying for another failed model load.
+_FAILED_WARM_UPS: weakref.WeakSet[embeddings.contracts.EmbeddingProvider] = (
+    weakref.WeakSet()
+)
 
 
 @lru_cache(maxsize=8)
@@ -51,12 +62,93 @@ def _cached_embedding_provider(
     dimension: int,
     batch_size: int,
     use_e5_prefixes: bool,
-) -> embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider:
-    return embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider(
-        model_id=model_id,
+    max_batch_tokens: int | None,
+    worker_processes: int,
+    cache_entries: int,
+    cache_path: str | None,
+    onnx_model_path: str | None,
+) -> embeddings.cache.CachedEmbeddingProvider:
+    provider: embeddings.contracts.EmbeddingProvider
+    prefix_mode = "e5" if use_e5_prefixes else "none"
+    if onnx_model_path is None:
+        provider = embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider(
+            model_id=model_id,
+            dimension=dimension,
+            batch_size=batch_size,
+            use_e5_prefixes=use_e5_prefixes,
+            max_batch_tokens=max_batch_tokens,
+            worker_processes=worker_processes,
+        )
+    else:
+        provider = embeddings.onnx.OnnxEmbeddingProvider(
+            model_id=model_id,
+            model_path=onnx_model_path,
+            dimension=dimension,
+            batch_size=batch_size,
+            use_e5_prefixes=use_e5_prefixes,
+        )
+        # Quantized vectors are close to, not equal to, the PyTorch ones.
+        prefix_mode = f"{prefix_mode}:onnx:{onnx_model_path}"
+    return embeddings.cache.CachedEmbeddingProvider(
+        provider,
+        prefix_mode=prefix_mode,
+        max_entries=cache_entries,
+        path=cache_path,
+    )
+
+
+@lru_cache(maxsize=8)
+def _cached_prepared_cache(
+    configuration_key: str, max_bytes: int, path: str | None
+) -> ingestion.cache.PreparedDocumentCache:
+    return ingestion.cache.PreparedDocumentCache(
+        configuration_key=configuration_key, max_bytes=max_bytes, path=path
+    )
+
+
+def _preparation_key(config: configuration.runtime.AppConfig) -> str:
+    # Every setting or code version that changes chunk text, order, or vectors
+    # belongs here.
+    return json.dumps(
+        {
+            "embedding_model": config.embedding_model,
+            "embedding_dimension": config.embedding_dimension,
+            "embedding_uses_e5_prefixes": config.embedding_uses_e5_prefixes,
+            "embedding_onnx_model_path": config.embedding_onnx_model_path,
+            "chunk_schema_version": ingestion.chunker.CHUNK_SCHEMA_VERSION,
+            "pipeline_version": ingestion.processor.PREPARATION_PIPELINE_VERSION,
+            "max_chunk_length": _MAX_CHUNK_LENGTH,
+            "overlap_length": _CHUNK_OVERLAP_LENGTH,
+        },
+        sort_keys=True,
+    )
+
+
+@lru_cache(maxsize=8)
+def _cached_query_cache(
+    embedding_provider: embeddings.contracts.EmbeddingProvider, max_entries: int
+) -> agents.retriever.QueryEmbeddingCache:
+    # One cache per shared provider keeps backends with equal model IDs apart.
+    return agents.retriever.QueryEmbeddingCache(max_entries=max_entries)
+
+
+@lru_cache(maxsize=8)
+def _cached_pdf_loader(page_workers: int) -> ingestion.loader.UniversalPDFLoader:
+    return ingestion.loader.UniversalPDFLoader(page_workers=page_workers)
+
+
+@lru_cache(maxsize=8)
+def _cached_segment_cache(
+    dimension: int,
+    embedding_model: str,
+    index_spec: vectorstore.faiss.FAISSIndexSpec,
+    metric: vectorstore.faiss.VectorMetric,
+) -> vectorstore.segments.SegmentCache:
+    return vectorstore.segments.SegmentCache(
         dimension=dimension,
-        batch_size=batch_size,
-        use_e5_prefixes=use_e5_prefixes,
+        embedding_model=embedding_model,
+        index_spec=index_spec,
+        metric=metric,
     )
 
 
@@ -68,7 +160,9 @@ def create_embedding_provider(
     Parameters
     ----------
     config
-        Validated model identifier, dimension, batch size, and prefix settings.
+        Validated model identifier, dimension, batch size, optional batch token
+        budget, prefix, worker-process, embedding-cache, optional ONNX model,
+        and warm-up settings.
 
     Returns
     -------
@@ -78,14 +172,43 @@ def create_embedding_provider(
     Notes
     -----
     This function caches provider objects, not eagerly loaded model instances.
+    A configured ONNX model path selects
+    :class:`embeddings.onnx.OnnxEmbeddingProvider` instead of the
+    SentenceTransformer provider.
+    The provider reuses document embeddings through
+    :class:`embeddings.cache.CachedEmbeddingProvider`, so re-uploading a PDF in
+    another session does not embed its chunks again. When warm-up is enabled,
+    the first call loads the model and runs one tiny encode; a failure is logged
+    once, is not retried by later calls, and is left for the first request to
+    report.
     """
 
-    return _cached_embedding_provider(
+    provider = _cached_embedding_provider(
         config.embedding_model,
         config.embedding_dimension,
         config.embedding_batch_size,
         config.embedding_uses_e5_prefixes,
+        config.embedding_max_batch_tokens,
+        config.embedding_worker_processes,
+        config.embedding_cache_entries,
+        config.embedding_cache_path,
+        config.embedding_onnx_model_path,
     )
+    if (
+        config.embedding_warm_up
+        and not provider.ready
+        and provider not in _FAILED_WARM_UPS
+    ):
+        try:
+            provider.warm_up()
+        except embeddings.contracts.EmbeddingError as exc:
+            _FAILED_WARM_UPS.add(provider)
+            _LOGGER.warning(
+                "embedding_warm_up_failed model=%s error_type=%s",
+                config.embedding_model,
+                type(exc.__cause__ or exc).__name__,
+            )
+    return provider
 
 
 def _generation_router(
@@ -185,26 +308,45 @@ def create_application_session(
     Notes
     -----
     Hosted clients, Redis connections, and the local embedding model remain lazy.
+    Session stores reference process-wide document segments, and sessions share
+    one prepared-document cache, so a document that several sessions upload is
+    loaded, chunked, embedded, indexed, and held in memory once.
     """
 
     embedding_provider = create_embedding_provider(config)
+    query_cache = _cached_query_cache(embedding_provider, config.query_cache_entries)
+    pdf_loader = _cached_pdf_loader(config.pdf_page_workers)
     generation_router = _generation_router(config)
 
-    def store_factory() -> vectorstore.faiss.FAISSStore:
-        return vectorstore.faiss.FAISSStore(
-            dimension=config.embedding_dimension,
-            embedding_model=config.embedding_model,
-        )
+    index_spec = vectorstore.faiss.FAISSIndexSpec(
+        index_type=config.vector_index_type,
+        nlist=config.vector_index_nlist,
+        nprobe=config.vector_index_nprobe,
+        hnsw_m=config.vector_index_hnsw_m,
+        ef_search=config.vector_index_ef_search,
+        pq_m=config.vector_index_pq_m,
+    )
+
+    segment_cache = _cached_segment_cache(
+        config.embedding_dimension,
+        config.embedding_model,
+        index_spec,
+        config.vector_metric,
+    )
+
+    def store_factory() -> vectorstore.contracts.VectorStore:
+        return vectorstore.segments.SegmentStore(segment_cache)
 
     def processor_factory(
-        store: vectorstore.faiss.FAISSStore,
+        store: vectorstore.contracts.VectorStore,
     ) -> ingestion.processor.DocumentProcessor:
         return ingestion.processor.DocumentProcessor(
             faiss_store=store,
             embedding_provider=embedding_provider,
+            loader=pdf_loader,
             chunker_instance=ingestion.chunker.PDFChunker(
-                max_chunk_length=1000,
-                overlap_length=200,
+                max_chunk_length=_MAX_CHUNK_LENGTH,
+                overlap_length=_CHUNK_OVERLAP_LENGTH,
             ),
         )
 
@@ -215,7 +357,7 @@ def create_application_session(
     )
 
     def chatbot_factory(
-        store: vectorstore.faiss.FAISSStore,
+        store: vectorstore.contracts.VectorStore,
         session_conversation_store: memory.contracts.ConversationStore,
     ) -> orchestration.rag.RAGChatbot:
         return orchestration.rag.RAGChatbot(
@@ -223,6 +365,7 @@ def create_application_session(
                 store,
                 embedding_provider,
                 top_k=config.retrieval_top_k,
+                query_cache=query_cache,
             ),
             generator_agent=agents.generator.GeneratorAgent(
                 generation_router,
@@ -238,6 +381,11 @@ def create_application_session(
         max_upload_file_bytes=config.max_upload_file_mb * _BYTES_PER_MEGABYTE,
         max_upload_total_bytes=config.max_upload_total_mb * _BYTES_PER_MEGABYTE,
         max_upload_files=config.max_upload_files,
+        prepared_cache=_cached_prepared_cache(
+            _preparation_key(config),
+            config.prepared_cache_mb * _BYTES_PER_MEGABYTE,
+            config.prepared_cache_path,
+        ),
     )
     return session.ApplicationSession(
         session_id=session_id,
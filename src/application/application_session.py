@@ -7,10 +7,11 @@ Own uploads, vector state, and chat lifecycle for one application session.
 Responsibilities:
   - Validate and atomically activate one browser session's upload set.
   - Reuse unchanged prepared documents and rebuild the graph when needed.
+  - Apply upload changes to the active store one document at a time.
   - Expose the session-owned question-answering boundary.
 
 Design principles:
-  - Commit candidate upload state only after complete successful preparation.
+  - Change the active store only after every new document has been prepared.
   - Identify uploaded content with deterministic SHA-256 digests.
 
 Boundaries:
@@ -47,7 +48,7 @@ class _DocumentPreparer(Protocol):
     def prepare_bytes(
         self, content: bytes, /, *, file_name: str
     ) -> ingestion.processor.PreparedDocument:
-        """Prepare one uploaded PDF for candidate-store insertion."""
+        """Prepare one uploaded PDF for store insertion."""
 
         ...
 
@@ -117,32 +118,39 @@ class SessionDocumentManager:
     Parameters
     ----------
     store_factory
-        Factory for isolated empty FAISS stores.
+        Factory for isolated empty session stores.
     processor_factory
-        Factory that binds ingestion to a candidate store.
+        Factory that binds ingestion to the active store.
     max_upload_file_bytes
         Positive byte bound applied to every selected PDF.
     max_upload_total_bytes
         Positive byte bound applied to the complete selected upload set.
     max_upload_files
         Positive maximum number of selected PDFs.
+    prepared_cache
+        Optional process-wide cache consulted before a document is prepared.
 
     Notes
     -----
-    A changed upload set is prepared in a candidate store. Active state changes
-    only after every new document has been prepared and indexed successfully.
+    New documents in a changed upload set are prepared, or taken from the
+    prepared-document cache, before the active store changes. Dropped documents
+    are then removed and new documents added in place, so unchanged documents
+    are never re-indexed.
     """
 
     def __init__(
         self,
         *,
-        store_factory: Callable[[], vectorstore.faiss.FAISSStore],
-        processor_factory: Callable[[vectorstore.faiss.FAISSStore], _DocumentPreparer],
+        store_factory: Callable[[], vectorstore.contracts.VectorStore],
+        processor_factory: Callable[
+            [vectorstore.contracts.VectorStore], _DocumentPreparer
+        ],
         max_upload_file_bytes: int,
         max_upload_total_bytes: int,
         max_upload_files: int,
+        prepared_cache: ingestion.cache.PreparedDocumentCache | None = None,
     ) -> None:
-        """Create a manager with candidate-store factories and upload bounds."""
+        """Create a manager with store factories and upload bounds."""
 
         for name, value in (
             ("max_upload_file_bytes", max_upload_file_bytes),
@@ -160,6 +168,7 @@ class SessionDocumentManager:
         self.max_upload_file_bytes = max_upload_file_bytes
         self.max_upload_total_bytes = max_upload_total_bytes
         self.max_upload_files = max_upload_files
+        self._prepared_cache = prepared_cache
         self.store = store_factory()
         self._active_signature: tuple[str, ...] = ()
         self._prepared_by_hash: dict[str, ingestion.processor.PreparedDocument] = {}
@@ -186,8 +195,10 @@ class SessionDocumentManager:
 
         Notes
         -----
-        Unchanged prepared documents are reused by content hash. Any failure
-        leaves the previous active store and upload signature intact.
+        Unchanged documents stay indexed and are identified by content hash. A
+        preparation failure leaves the store untouched; a failure while changing
+        the store restores the previous documents before the error propagates.
+        Record positions follow the order in which documents became active.
         """
 
         if len(uploads) > self.max_upload_files:
@@ -224,25 +235,40 @@ class SessionDocumentManager:
                 active_document_ids=self._active_signature,
             )
 
-        candidate_store = self._store_factory()
         processor: _DocumentPreparer | None = None
         candidate_prepared: dict[str, ingestion.processor.PreparedDocument] = {}
         newly_processed: list[ingestion.processor.ProcessingResult] = []
 
         for upload in unique_uploads:
             prepared = self._prepared_by_hash.get(upload.content_hash)
+            if prepared is None and self._prepared_cache is not None:
+                prepared = self._prepared_cache.get(upload.content_hash)
+                if prepared is not None:
+                    # Another session may have uploaded the bytes under another name.
+                    prepared = prepared.renamed(upload.file_name)
+                    newly_processed.append(prepared.result)
             if prepared is None:
                 if processor is None:
-                    processor = self._processor_factory(candidate_store)
+                    processor = self._processor_factory(self.store)
                 prepared = processor.prepare_bytes(
                     upload.content, file_name=upload.file_name
                 )
                 newly_processed.append(prepared.result)
+                if self._prepared_cache is not None:
+                    self._prepared_cache.put(prepared)
             candidate_prepared[upload.content_hash] = prepared
-            candidate_store.add_embedded_chunks(prepared.embedded_chunks)
 
-        # Commit only after every active document has been prepared and indexed.
-        self.store = candidate_store
+        previous_prepared = self._prepared_by_hash
+        try:
+            for document_id in previous_prepared.keys() - candidate_prepared.keys():
+                self.store.remove_document(document_id)
+            for document_id, prepared in candidate_prepared.items():
+                if document_id not in previous_prepared:
+                    self.store.add_vectors(prepared.vectors, prepared.records)
+        except BaseException:
+            self._restore_documents(previous_prepared, candidate_prepared)
+            raise
+
         self._prepared_by_hash = candidate_prepared
         self._active_signature = signature
         return UploadSyncResult(
@@ -257,6 +283,19 @@ class SessionDocumentManager:
 
         return len(self._active_signature)
 
+    def _restore_documents(
+        self,
+        previous: dict[str, ingestion.processor.PreparedDocument],
+        candidate: dict[str, ingestion.processor.PreparedDocument],
+    ) -> None:
+        # Each store mutation is atomic, so undo whichever ones completed.
+        for document_id in candidate.keys() - previous.keys():
+            self.store.remove_document(document_id)
+        for document_id in previous.keys() - candidate.keys():
+            self.store.replace_document(
+                document_id, previous[document_id].embedded_chunks
+            )
+
     def clear(self) -> None:
         """Discard all documents and cached preparations for this manager.
 
@@ -297,7 +336,7 @@ class ApplicationSession:
         document_manager: SessionDocumentManager,
         conversation_store: memory.contracts.ConversationStore,
         chatbot_factory: Callable[
-            [vectorstore.faiss.FAISSStore, memory.contracts.ConversationStore],
+            [vectorstore.contracts.VectorStore, memory.contracts.ConversationStore],
             orchestration.rag.RAGChatbot,
         ],
     ) -> None:
@@ -312,7 +351,7 @@ class ApplicationSession:
         self._chatbot: orchestration.rag.RAGChatbot | None = None
 
     @property
-    def vector_store(self) -> vectorstore.faiss.FAISSStore:
+    def vector_store(self) -> vectorstore.contracts.VectorStore:
         """Return the currently active session-owned vector store."""
 
         return self.document_manager.store
@@ -2,6 +2,7 @@
 
 Executable modules:
 - cli_quota: inspect and update quota limits through the command line
+- cli_snapshots: remove abandoned and superseded FAISS snapshot generations
 """
 
 from __future__ import annotations
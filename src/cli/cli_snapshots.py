@@ -0,0 +1,137 @@
+"""
+===============================================================================
+cli_snapshots.py
+===============================================================================
+Sweep abandoned writes and superseded FAISS snapshot generations.
+
+Responsibilities:
+  - Parse one persistent store directory and its retention policy.
+  - Print a JSON report of removed and retained snapshot paths.
+
+Design principles:
+  - Keep administration explicit, import-safe, and scriptable.
+  - Offer a dry run that reports exactly what a real sweep would remove.
+
+Boundaries:
+  - Retention rules and pointer validation remain in the vectorstore package.
+  - Never loads FAISS indexes or requires the store's embedding configuration.
+
+Notes:
+  - Execute with ``python -m src.cli.cli_snapshots``.
+===============================================================================
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Callable, Sequence
+from dataclasses import asdict
+from pathlib import Path
+from typing import TextIO
+
+from src import vectorstore
+
+__all__: list[str] = []
+
+
+def _parser() -> argparse.ArgumentParser:
+    defaults = vectorstore.faiss.SnapshotRetention()
+    parser = argparse.ArgumentParser(
+        description="Remove abandoned writes and superseded FAISS snapshots."
+    )
+    parser.add_argument(
+        "snapshot_directory",
+        type=Path,
+        help="Persistent store directory containing CURRENT and snapshots/.",
+    )
+    parser.add_argument(
+        "--keep-generations",
+        type=int,
+        default=defaults.keep_generations,
+        help="Superseded base generations to keep beside the current chain.",
+    )
+    parser.add_argument(
+        "--max-age-seconds",
+        type=float,
+        default=defaults.max_age_seconds,
+        help="Remove superseded generations older than this age.",
+    )
+    parser.add_argument(
+        "--pending-grace-seconds",
+        type=float,
+        default=defaults.pending_grace_seconds,
+        help="Minimum age before unreferenced writes are treated as abandoned.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report removable paths without deleting them.",
+    )
+    return parser
+
+
+def run(
+    argv: Sequence[str] | None = None,
+    *,
+    stdout: TextIO = sys.stdout,
+    stderr: TextIO = sys.stderr,
+    collector: Callable[..., vectorstore.faiss.SnapshotCollection] = (
+        vectorstore.faiss.collect_snapshot_garbage
+    ),
+) -> int:
+    """Run one snapshot garbage-collection sweep with injectable boundaries.
+
+    Parameters
+    ----------
+    argv
+        Command arguments excluding the executable name; defaults to ``sys.argv``.
+    stdout
+        Stream for the JSON sweep report.
+    stderr
+        Stream for validation and snapshot-domain errors.
+    collector
+        Function receiving the directory, retention policy, and ``dry_run`` flag.
+
+    Returns
+    -------
+    int
+        ``0`` on success or ``1`` for invalid policies and snapshot errors.
+
+    Notes
+    -----
+    The chain named by ``CURRENT`` is never removed, and a directory without a
+    readable pointer is left untouched.
+    """
+
+    args = _parser().parse_args(argv)
+    try:
+        retention = vectorstore.faiss.SnapshotRetention(
+            keep_generations=args.keep_generations,
+            max_age_seconds=args.max_age_seconds,
+            pending_grace_seconds=args.pending_grace_seconds,
+        )
+        collection = collector(args.snapshot_directory, retention, dry_run=args.dry_run)
+    except (ValueError, vectorstore.faiss.FAISSStoreError) as exc:
+        stderr.write(f"Snapshot collection failed: {exc}\n")
+        return 1
+    stdout.write(f"{json.dumps(asdict(collection), indent=2, sort_keys=True)}\n")
+    return 0
+
+
+def main() -> None:
+    """Execute the sweep and terminate with its returned status code.
+
+    Notes
+    -----
+    This translates :func:`run`'s status to ``SystemExit``. Argument parsing may
+    also exit for invalid command syntax. Importing :mod:`src.cli` does not import
+    this executable module.
+    """
+
+    raise SystemExit(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -25,11 +25,29 @@ import os
 from dataclasses import dataclass
 from typing import Literal, Mapping, cast
 
-__all__ = ["AppConfig", "ConfigurationError", "GenerationMode"]
+__all__ = [
+    "AppConfig",
+    "ConfigurationError",
+    "GenerationMode",
+    "VectorIndexType",
+    "VectorMetric",
+]
 
 # Stable provider-selection values accepted by application configuration.
 GenerationMode = Literal["auto", "huggingface", "openai"]
 
+# FAISS index families accepted by application configuration.
+VectorIndexType = Literal["Flat", "IVFFlat", "HNSWFlat", "IVFPQ"]
+_VECTOR_INDEX_TYPES: dict[str, VectorIndexType] = {
+    "flat": "Flat",
+    "ivfflat": "IVFFlat",
+    "hnswflat": "HNSWFlat",
+    "ivfpq": "IVFPQ",
+}
+
+# FAISS ranking metrics accepted by application configuration.
+VectorMetric = Literal["l2", "inner_product"]
+
 
 class ConfigurationError(RuntimeError):
     """Represent an invalid or missing setting safe for the UI boundary."""
@@ -63,12 +81,36 @@ class AppConfig:
         Fixed vector dimension expected from the local embedding model.
     embedding_batch_size
         Positive number of document passages per local embedding batch.
+    embedding_max_batch_tokens
+        Optional positive token budget per local embedding batch; when set,
+        passages are sorted by length and batched so padded tokens stay within
+        the budget instead of using a fixed ``embedding_batch_size``.
+    embedding_worker_processes
+        Positive number of local embedding processes; values above one start a
+        worker pool that loads one model per process.
+    embedding_cache_entries
+        Positive number of document embeddings kept in the in-process cache.
+    embedding_cache_path
+        Optional SQLite file that keeps document embeddings across restarts.
+    embedding_onnx_model_path
+        Optional exported ONNX model of ``embedding_model``; when set, local
+        embeddings run through ONNX Runtime on CPU instead of PyTorch.
+    embedding_warm_up
+        Whether creating the shared embedding provider loads the model and runs
+        one tiny encode, so the first upload or question does not pay for it.
     max_upload_file_mb
         Positive per-file upload bound in binary megabytes.
     max_upload_total_mb
         Positive combined active-set upload bound in binary megabytes.
     max_upload_files
         Positive maximum number of selected PDF files.
+    pdf_page_workers
+        Positive number of processes that extract pages of long PDFs; values
+        above one start a worker pool on the first long upload.
+    prepared_cache_mb
+        Positive bound in binary megabytes on prepared documents shared by sessions.
+    prepared_cache_path
+        Optional directory that keeps prepared documents across restarts.
     max_input_characters
         Positive character bound for assembled generation input.
     max_output_tokens
@@ -77,6 +119,23 @@ class AppConfig:
         Positive number of messages retained per session.
     retrieval_top_k
         Positive maximum number of FAISS records retrieved per question.
+    query_cache_entries
+        Positive number of query vectors shared between sessions in memory.
+    vector_index_type
+        ``Flat``, ``IVFFlat``, ``HNSWFlat``, or ``IVFPQ`` FAISS index family.
+    vector_index_nlist
+        Positive number of inverted lists for IVF index types.
+    vector_index_nprobe
+        Positive number of inverted lists scanned per IVF query.
+    vector_index_hnsw_m
+        Positive number of graph neighbours per HNSW node.
+    vector_index_ef_search
+        Positive HNSW candidate-list size used while searching.
+    vector_index_pq_m
+        Positive number of product-quantizer subspaces dividing the dimension.
+    vector_metric
+        ``inner_product`` for cosine ranking of the normalized local embeddings,
+        or ``l2`` for squared Euclidean distance.
     provider_timeout_seconds
         Positive hosted-provider timeout in seconds.
 
@@ -97,14 +156,31 @@ class AppConfig:
     embedding_model: str = "intfloat/multilingual-e5-small"
     embedding_dimension: int = 384
     embedding_batch_size: int = 32
+    embedding_max_batch_tokens: int | None = None
+    embedding_worker_processes: int = 1
+    embedding_cache_entries: int = 50_000
+    embedding_cache_path: str | None = None
+    embedding_onnx_model_path: str | None = None
+    embedding_warm_up: bool = False
     max_upload_file_mb: int = 64
     max_upload_total_mb: int = 128
     max_upload_files: int = 10
+    pdf_page_workers: int = 1
+    prepared_cache_mb: int = 256
+    prepared_cache_path: str | None = None
     max_input_characters: int = 24_000
     max_output_tokens: int = 384
     max_history_messages: int = 10
     retrieval_top_k: int = 5
+    query_cache_entries: int = 1_024
     provider_timeout_seconds: float = 45.0
+    vector_index_type: VectorIndexType = "Flat"
+    vector_index_nlist: int = 1024
+    vector_index_nprobe: int = 16
+    vector_index_hnsw_m: int = 32
+    vector_index_ef_search: int = 64
+    vector_index_pq_m: int = 16
+    vector_metric: VectorMetric = "inner_product"
 
     def __post_init__(self) -> None:
         """Reject invalid direct construction as well as invalid source values."""
@@ -124,13 +200,23 @@ class AppConfig:
         for integer_name, integer_value in (
             ("EMBEDDING_DIMENSION", self.embedding_dimension),
             ("EMBEDDING_BATCH_SIZE", self.embedding_batch_size),
+            ("EMBEDDING_WORKER_PROCESSES", self.embedding_worker_processes),
+            ("EMBEDDING_CACHE_ENTRIES", self.embedding_cache_entries),
             ("MAX_UPLOAD_FILE_MB", self.max_upload_file_mb),
             ("MAX_UPLOAD_TOTAL_MB", self.max_upload_total_mb),
             ("MAX_UPLOAD_FILES", self.max_upload_files),
+            ("PDF_PAGE_WORKERS", self.pdf_page_workers),
+            ("PREPARED_CACHE_MB", self.prepared_cache_mb),
             ("MAX_INPUT_CHARACTERS", self.max_input_characters),
             ("MAX_OUTPUT_TOKENS", self.max_output_tokens),
             ("MAX_HISTORY_MESSAGES", self.max_history_messages),
             ("RETRIEVAL_TOP_K", self.retrieval_top_k),
+            ("QUERY_CACHE_ENTRIES", self.query_cache_entries),
+            ("VECTOR_INDEX_NLIST", self.vector_index_nlist),
+            ("VECTOR_INDEX_NPROBE", self.vector_index_nprobe),
+            ("VECTOR_INDEX_HNSW_M", self.vector_index_hnsw_m),
+            ("VECTOR_INDEX_EF_SEARCH", self.vector_index_ef_search),
+            ("VECTOR_INDEX_PQ_M", self.vector_index_pq_m),
         ):
             if (
                 isinstance(integer_value, bool)
@@ -138,12 +224,33 @@ class AppConfig:
                 or integer_value <= 0
             ):
                 raise ConfigurationError(f"{integer_name} must be a positive integer.")
+        if self.embedding_max_batch_tokens is not None and (
+            isinstance(self.embedding_max_batch_tokens, bool)
+            or not isinstance(self.embedding_max_batch_tokens, int)
+            or self.embedding_max_batch_tokens <= 0
+        ):
+            raise ConfigurationError(
+                "EMBEDDING_MAX_BATCH_TOKENS must be a positive integer when set."
+            )
         if self.max_upload_total_mb < self.max_upload_file_mb:
             raise ConfigurationError(
                 "MAX_UPLOAD_TOTAL_MB must be at least MAX_UPLOAD_FILE_MB."
             )
         if self.provider_timeout_seconds <= 0:
             raise ConfigurationError("PROVIDER_TIMEOUT_SECONDS must be positive.")
+        if self.vector_index_type not in _VECTOR_INDEX_TYPES.values():
+            raise ConfigurationError(
+                "VECTOR_INDEX_TYPE must be Flat, IVFFlat, HNSWFlat, or IVFPQ."
+            )
+        if self.vector_metric not in {"l2", "inner_product"}:
+            raise ConfigurationError("VECTOR_METRIC must be l2 or inner_product.")
+        if (
+            self.vector_index_type == "IVFPQ"
+            and self.embedding_dimension % self.vector_index_pq_m
+        ):
+            raise ConfigurationError(
+                "VECTOR_INDEX_PQ_M must divide EMBEDDING_DIMENSION for IVFPQ."
+            )
 
     @classmethod
     def from_sources(
@@ -195,6 +302,11 @@ class AppConfig:
                 raise ConfigurationError(f"{name} must be greater than zero.")
             return parsed
 
+        def optional_integer(name: str) -> int | None:
+            if value(name) is None:
+                return None
+            return integer(name, 0)
+
         def number(name: str, default: float) -> float:
             raw_value = value(name, str(default))
             try:
@@ -222,6 +334,16 @@ class AppConfig:
             raise ConfigurationError(
                 "GENERATION_PROVIDER must be auto, huggingface, or openai."
             )
+        index_type = _VECTOR_INDEX_TYPES.get(
+            cast(str, value("VECTOR_INDEX_TYPE", defaults.vector_index_type)).lower()
+        )
+        if index_type is None:
+            raise ConfigurationError(
+                "VECTOR_INDEX_TYPE must be Flat, IVFFlat, HNSWFlat, or IVFPQ."
+            )
+        metric = cast(str, value("VECTOR_METRIC", defaults.vector_metric)).lower()
+        if metric not in {"l2", "inner_product"}:
+            raise ConfigurationError("VECTOR_METRIC must be l2 or inner_product.")
 
         return cls(
             generation_provider=cast(GenerationMode, mode),
@@ -258,6 +380,16 @@ class AppConfig:
             embedding_batch_size=integer(
                 "EMBEDDING_BATCH_SIZE", defaults.embedding_batch_size
             ),
+            embedding_max_batch_tokens=optional_integer("EMBEDDING_MAX_BATCH_TOKENS"),
+            embedding_worker_processes=integer(
+                "EMBEDDING_WORKER_PROCESSES", defaults.embedding_worker_processes
+            ),
+            embedding_cache_entries=integer(
+                "EMBEDDING_CACHE_ENTRIES", defaults.embedding_cache_entries
+            ),
+            embedding_cache_path=value("EMBEDDING_CACHE_PATH"),
+            embedding_onnx_model_path=value("EMBEDDING_ONNX_MODEL_PATH"),
+            embedding_warm_up=boolean("EMBEDDING_WARM_UP", defaults.embedding_warm_up),
             max_upload_file_mb=integer(
                 "MAX_UPLOAD_FILE_MB", defaults.max_upload_file_mb
             ),
@@ -265,6 +397,9 @@ class AppConfig:
                 "MAX_UPLOAD_TOTAL_MB", defaults.max_upload_total_mb
             ),
             max_upload_files=integer("MAX_UPLOAD_FILES", defaults.max_upload_files),
+            pdf_page_workers=integer("PDF_PAGE_WORKERS", defaults.pdf_page_workers),
+            prepared_cache_mb=integer("PREPARED_CACHE_MB", defaults.prepared_cache_mb),
+            prepared_cache_path=value("PREPARED_CACHE_PATH"),
             max_input_characters=integer(
                 "MAX_INPUT_CHARACTERS", defaults.max_input_characters
             ),
@@ -273,9 +408,27 @@ class AppConfig:
                 "MAX_HISTORY_MESSAGES", defaults.max_history_messages
             ),
             retrieval_top_k=integer("RETRIEVAL_TOP_K", defaults.retrieval_top_k),
+            query_cache_entries=integer(
+                "QUERY_CACHE_ENTRIES", defaults.query_cache_entries
+            ),
             provider_timeout_seconds=number(
                 "PROVIDER_TIMEOUT_SECONDS", defaults.provider_timeout_seconds
             ),
+            vector_index_type=index_type,
+            vector_index_nlist=integer(
+                "VECTOR_INDEX_NLIST", defaults.vector_index_nlist
+            ),
+            vector_index_nprobe=integer(
+                "VECTOR_INDEX_NPROBE", defaults.vector_index_nprobe
+            ),
+            vector_index_hnsw_m=integer(
+                "VECTOR_INDEX_HNSW_M", defaults.vector_index_hnsw_m
+            ),
+            vector_index_ef_search=integer(
+                "VECTOR_INDEX_EF_SEARCH", defaults.vector_index_ef_search
+            ),
+            vector_index_pq_m=integer("VECTOR_INDEX_PQ_M", defaults.vector_index_pq_m),
+            vector_metric=cast(VectorMetric, metric),
         )
 
     @property
@@ -1,15 +1,19 @@
-"""Local embedding contracts and SentenceTransformer implementation.
+"""Local embedding contracts with SentenceTransformer and ONNX implementations.
 
 Provides:
+- cache: memory and SQLite reuse of document embeddings.
 - chunks: deterministic chunk-to-vector mapping.
 - contracts: embedding protocol and project-owned errors.
+- onnx: lazy local embeddings through ONNX Runtime.
 - sentence_transformer: lazy local multilingual embeddings.
 """
 
 from __future__ import annotations
 
+from . import embeddings_cache as cache
 from . import embeddings_chunks as chunks
 from . import embeddings_contracts as contracts
+from . import embeddings_onnx as onnx
 from . import embeddings_sentence_transformer as sentence_transformer
 
-__all__ = ["chunks", "contracts", "sentence_transformer"]
+__all__ = ["cache", "chunks", "contracts", "onnx", "sentence_transformer"]
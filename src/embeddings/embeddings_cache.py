@@ -0,0 +1,307 @@
+"""
+===============================================================================
+embeddings_cache.py
+===============================================================================
+Reuse document embeddings across sessions and process restarts.
+
+Responsibilities:
+  - Wrap an embedding provider and compute only uncached document vectors.
+  - Keep recently used vectors in a bounded in-memory LRU.
+  - Optionally persist vectors in a content-addressed SQLite file.
+
+Design principles:
+  - Key vectors by model identifier, prefix mode, and the SHA-256 of the text,
+    so a changed model or prefix semantics never reuses stale vectors.
+  - Treat the disk tier as an optimization: its failures are logged and
+    disable it instead of failing ingestion.
+
+Boundaries:
+  - Does not cache query vectors, whose semantics differ from passages.
+  - Opens no file until the first document embedding is requested.
+===============================================================================
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+from . import embeddings_contracts as contracts
+
+__all__ = ["CachedEmbeddingProvider"]
+
+_LOGGER = logging.getLogger(__name__)
+# SQLite's default bound on host parameters is 999 in older releases.
+_SQLITE_BATCH = 500
+
+
+class CachedEmbeddingProvider:
+    """Serve document embeddings from memory or disk before computing them.
+
+    Parameters
+    ----------
+    provider
+        Provider that computes vectors on a cache miss.
+    prefix_mode
+        Non-empty label for the provider's passage-prefix semantics, such as
+        ``"e5"`` or ``"none"``; part of every cache key.
+    max_entries
+        Positive number of vectors kept in the in-memory LRU.
+    path
+        Optional SQLite file holding vectors across process restarts.
+
+    Raises
+    ------
+    ValueError
+        If ``prefix_mode`` is empty or ``max_entries`` is not positive.
+
+    Notes
+    -----
+    The wrapper satisfies :class:`contracts.EmbeddingProvider`. Repeated
+    passages within one call are embedded once, and the wrapper is safe to
+    share between threads. Vectors are returned exactly as the provider
+    produced them, so cached and computed batches are interchangeable.
+    """
+
+    def __init__(
+        self,
+        provider: contracts.EmbeddingProvider,
+        *,
+        prefix_mode: str,
+        max_entries: int = 50_000,
+        path: str | Path | None = None,
+    ) -> None:
+        """Configure the memory bound and the optional persistent store."""
+
+        if not isinstance(prefix_mode, str) or not prefix_mode:
+            raise ValueError("prefix_mode must be a non-empty string")
+        if (
+            isinstance(max_entries, bool)
+            or not isinstance(max_entries, int)
+            or max_entries <= 0
+        ):
+            raise ValueError("max_entries must be a positive integer")
+        self.provider = provider
+        self.prefix_mode = prefix_mode
+        self.max_entries = max_entries
+        self.path = None if path is None else Path(path)
+        self._memory: OrderedDict[bytes, NDArray[np.float32]] = OrderedDict()
+        self._connection: sqlite3.Connection | None = None
+        self._disk_enabled = self.path is not None
+        self._lock = threading.Lock()
+
+    @property
+    def model_id(self) -> str:
+        """Return the wrapped provider's model identifier."""
+
+        return self.provider.model_id
+
+    @property
+    def dimension(self) -> int:
+        """Return the wrapped provider's vector dimension."""
+
+        return self.provider.dimension
+
+    @property
+    def ready(self) -> bool:
+        """Return whether the wrapped provider is warmed up.
+
+        A provider without a readiness flag has no warm-up and counts as ready.
+        """
+
+        return bool(getattr(self.provider, "ready", True))
+
+    def warm_up(self) -> None:
+        """Warm up the wrapped provider, if it supports warm-up."""
+
+        warm_up = getattr(self.provider, "warm_up", None)
+        if warm_up is not None:
+            warm_up()
+
+    def embed_documents(self, texts: Sequence[str]) -> list[list[float]]:
+        """Embed ordered passages, computing only uncached vectors.
+
+        Returns
+        -------
+        list of list of float
+            Vectors in the same order as ``texts``.
+        """
+
+        return self.embed_documents_array(texts).tolist()
+
+    def embed_documents_array(self, texts: Sequence[str]) -> NDArray[np.float32]:
+        """Embed ordered passages into one matrix, computing only cache misses.
+
+        Parameters
+        ----------
+        texts
+            Ordered non-empty passages.
+
+        Returns
+        -------
+        numpy.ndarray
+            C-contiguous ``(len(texts), dimension)`` ``float32`` matrix.
+
+        Raises
+        ------
+        ValueError
+            If a passage is empty or not a string, or the wrapped provider
+            rejects it.
+        contracts.EmbeddingError
+            If the wrapped provider fails or returns a matrix of the wrong shape.
+        """
+
+        # Checked before hashing so cache hits honour the provider contract too.
+        if any(not isinstance(text, str) or not text.strip() for text in texts):
+            raise ValueError("Every embedding input must be a non-empty string.")
+        keys = [self._key(text) for text in texts]
+        vectors = np.empty((len(keys), self.dimension), dtype=np.float32)
+        found = self._lookup(keys)
+        missing: dict[bytes, int] = {}
+        for row, key in enumerate(keys):
+            vector = found.get(key)
+            if vector is None:
+                missing.setdefault(key, row)
+            else:
+                vectors[row] = vector
+        if not missing:
+            return vectors
+
+        computed = self.provider.embed_documents_array(
+            [texts[row] for row in missing.values()]
+        )
+        if np.shape(computed) != (len(missing), self.dimension):
+            raise contracts.EmbeddingError(
+                "The embedding provider returned an incompatible vector shape."
+            )
+        computed = np.asarray(computed, dtype=np.float32)
+        by_key = dict(zip(missing, computed, strict=True))
+        for row, key in enumerate(keys):
+            if key in by_key:
+                vectors[row] = by_key[key]
+        self._store(by_key)
+        return vectors
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed one query through the wrapped provider without caching."""
+
+        return self.provider.embed_query(text)
+
+    def close(self) -> None:
+        """Close the persistent store; a later call reopens it on demand."""
+
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.sha256(text.encode("utf-8", "surrogatepass")).digest()
+
+    def _lookup(self, keys: Sequence[bytes]) -> dict[bytes, NDArray[np.float32]]:
+        found: dict[bytes, NDArray[np.float32]] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+            unresolved = list({key: None for key in keys if key not in found})
+            if unresolved and self._disk_enabled:
+                loaded = self._disk_lookup(unresolved)
+                found.update(loaded)
+                self._remember(loaded.items())
+        return found
+
+    def _store(self, vectors: dict[bytes, NDArray[np.float32]]) -> None:
+        with self._lock:
+            self._remember(vectors.items())
+            if not self._disk_enabled:
+                return
+            try:
+                connection = self._open()
+                with connection:
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO embeddings "
+                        "(model_id, prefix_mode, text_sha256, vector) "
+                        "VALUES (?, ?, ?, ?)",
+                        (
+                            (self.model_id, self.prefix_mode, key, vector.tobytes())
+                            for key, vector in vectors.items()
+                        ),
+                    )
+            except (OSError, sqlite3.Error) as exc:
+                self._disable_disk(exc)
+
+    def _remember(self, items: Iterable[tuple[bytes, NDArray[np.float32]]]) -> None:
+        for key, vector in items:
+            row = np.array(vector, dtype=np.float32)
+            row.setflags(write=False)
+            self._memory[key] = row
+            self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_lookup(self, keys: Sequence[bytes]) -> dict[bytes, NDArray[np.float32]]:
+        expected_bytes = self.dimension * np.dtype(np.float32).itemsize
+        found: dict[bytes, NDArray[np.float32]] = {}
+        try:
+            connection = self._open()
+            for start in range(0, len(keys), _SQLITE_BATCH):
+                batch = keys[start : start + _SQLITE_BATCH]
+                rows = connection.execute(
+                    "SELECT text_sha256, vector FROM embeddings "
+                    "WHERE model_id = ? AND prefix_mode = ? "
+                    f"AND text_sha256 IN ({', '.join('?' * len(batch))})",
+                    (self.model_id, self.prefix_mode, *batch),
+                )
+                for key, blob in rows:
+                    # A row of another length cannot belong to this model.
+                    if len(blob) == expected_bytes:
+                        found[key] = np.frombuffer(blob, dtype=np.float32)
+        except (OSError, sqlite3.Error) as exc:
+            self._disable_disk(exc)
+        return found
+
+    def _open(self) -> sqlite3.Connection:
+        if self._connection is None:
+            assert self.path is not None
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            try:
+                # WAL lets several worker processes read while one writes.
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "model_id TEXT NOT NULL, "
+                    "prefix_mode TEXT NOT NULL, "
+                    "text_sha256 BLOB NOT NULL, "
+                    "vector BLOB NOT NULL, "
+                    "PRIMARY KEY (model_id, prefix_mode, text_sha256)"
+                    ") WITHOUT ROWID"
+                )
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self._connection = connection
+        return self._connection
+
+    def _disable_disk(self, error: Exception) -> None:
+        _LOGGER.warning(
+            "Embedding cache file %s is unavailable; continuing in memory only: %s",
+            self.path,
+            error,
+        )
+        self._disk_enabled = False
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
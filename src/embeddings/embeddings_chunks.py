@@ -7,6 +7,9 @@ Attach provider vectors to canonical PDF chunks.
 Responsibilities:
   - Validate the minimal canonical chunk shape.
   - Batch texts through an embedding provider and attach ordered vectors.
+  - Return bulk vectors as one matrix beside embedding-free chunk records.
+  - Embed lazily produced chunks in fixed-size windows, one window at a time
+    or joined into one matrix.
 
 Design principles:
   - Preserve caller-owned chunks through defensive metadata copies.
@@ -21,12 +24,21 @@ Boundaries:
 from __future__ import annotations
 
 import copy
-from collections.abc import Mapping, Sequence
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from itertools import islice
 from typing import Any
 
+import numpy as np
+from numpy.typing import NDArray
+
 from . import embeddings_contracts as contracts
 
-__all__ = ["embed_chunks"]
+__all__ = [
+    "embed_chunk_windows",
+    "embed_chunks",
+    "embed_chunks_array",
+    "iter_chunk_windows",
+]
 
 
 def embed_chunks(
@@ -53,6 +65,168 @@ def embed_chunks(
         If a chunk is invalid or the provider returns the wrong vector count.
     """
 
+    validated = _validated_chunks(chunks)
+    vectors = provider.embed_documents([chunk["text"] for chunk in validated])
+    if len(vectors) != len(validated):
+        raise contracts.EmbeddingError(
+            "The embedding provider returned an unexpected vector count."
+        )
+    return [
+        {**_record(chunk), "embedding": vector}
+        for chunk, vector in zip(validated, vectors, strict=True)
+    ]
+
+
+def embed_chunks_array(
+    chunks: Sequence[Mapping[str, Any]], provider: contracts.EmbeddingProvider
+) -> tuple[list[dict[str, Any]], NDArray[np.float32]]:
+    """Embed canonical chunks into one matrix beside embedding-free records.
+
+    Parameters
+    ----------
+    chunks
+        Ordered mappings containing non-empty ``chunk_id``, ``text``, and
+        mapping-valued ``metadata`` fields.
+    provider
+        Embedding provider used once for the ordered document texts.
+
+    Returns
+    -------
+    tuple
+        Defensive chunk copies without ``embedding`` and a C-contiguous
+        ``float32`` matrix whose row ``i`` embeds record ``i``.
+
+    Raises
+    ------
+    contracts.EmbeddingError
+        If a chunk is invalid or the provider returns the wrong vector count
+        or a non-numeric matrix.
+
+    Notes
+    -----
+    Providers without ``embed_documents_array`` are embedded through
+    ``embed_documents`` and converted once, so older providers keep working.
+    """
+
+    validated = _validated_chunks(chunks)
+    if not validated:
+        return [], np.empty((0, provider.dimension), dtype=np.float32)
+    texts = [chunk["text"] for chunk in validated]
+    embed = getattr(provider, "embed_documents_array", provider.embed_documents)
+    embedded = embed(texts)
+    try:
+        vectors = np.ascontiguousarray(embedded, dtype=np.float32)
+    except (TypeError, ValueError) as exc:
+        raise contracts.EmbeddingError(
+            "The embedding provider returned vectors that are not a numeric matrix."
+        ) from exc
+    if vectors.ndim != 2 or len(vectors) != len(validated):
+        raise contracts.EmbeddingError(
+            "The embedding provider returned an unexpected vector count."
+        )
+    return [_record(chunk) for chunk in validated], vectors
+
+
+def embed_chunk_windows(
+    chunks: Iterable[Mapping[str, Any]],
+    provider: contracts.EmbeddingProvider,
+    *,
+    window_size: int = 256,
+) -> tuple[list[dict[str, Any]], NDArray[np.float32]]:
+    """Embed lazily produced chunks window by window into records and one matrix.
+
+    Parameters
+    ----------
+    chunks
+        Ordered chunks, typically a generator that builds them on demand.
+    provider
+        Embedding provider called once per window.
+    window_size
+        Positive number of chunks held and embedded at a time.
+
+    Returns
+    -------
+    tuple
+        The same records and matrix as :func:`embed_chunks_array` would return
+        for the materialized chunks.
+
+    Raises
+    ------
+    ValueError
+        If ``window_size`` is not a positive integer.
+    contracts.EmbeddingError
+        If a chunk is invalid or the provider returns an unusable matrix.
+
+    Notes
+    -----
+    Each window's chunks are released once their records are copied, so at most
+    ``window_size`` chunks and their texts are alive besides the records.
+    """
+
+    records: list[dict[str, Any]] = []
+    matrices: list[NDArray[np.float32]] = []
+    for window_records, window_vectors in iter_chunk_windows(
+        chunks, provider, window_size=window_size
+    ):
+        records.extend(window_records)
+        matrices.append(window_vectors)
+    if not matrices:
+        return [], np.empty((0, provider.dimension), dtype=np.float32)
+    if len(matrices) == 1:
+        return records, matrices[0]
+    return records, np.concatenate(matrices)
+
+
+def iter_chunk_windows(
+    chunks: Iterable[Mapping[str, Any]],
+    provider: contracts.EmbeddingProvider,
+    *,
+    window_size: int = 256,
+) -> Iterator[tuple[list[dict[str, Any]], NDArray[np.float32]]]:
+    """Yield the records and matrix of each embedded window of chunks.
+
+    Parameters
+    ----------
+    chunks
+        Ordered chunks, typically a generator that builds them on demand.
+    provider
+        Embedding provider called once per window.
+    window_size
+        Positive number of chunks held and embedded at a time.
+
+    Yields
+    ------
+    tuple
+        One window's records and matrix, as :func:`embed_chunks_array`
+        returns them for that window's chunks.
+
+    Raises
+    ------
+    ValueError
+        If ``window_size`` is not a positive integer.
+    contracts.EmbeddingError
+        If a chunk is invalid or the provider returns an unusable matrix.
+    """
+
+    if (
+        isinstance(window_size, bool)
+        or not isinstance(window_size, int)
+        or window_size <= 0
+    ):
+        raise ValueError("window_size must be a positive integer")
+    return _iter_chunk_windows(iter(chunks), provider, window_size)
+
+
+def _iter_chunk_windows(
+    iterator: Iterator[Mapping[str, Any]],
+    provider: contracts.EmbeddingProvider,
+    window_size: int,
+) -> Iterator[tuple[list[dict[str, Any]], NDArray[np.float32]]]:
+    while window := list(islice(iterator, window_size)):
+        yield embed_chunks_array(window, provider)
+
+
+def _validated_chunks(chunks: Sequence[Mapping[str, Any]]) -> list[Mapping[str, Any]]:
     validated: list[Mapping[str, Any]] = []
     for chunk in chunks:
         if (
@@ -67,18 +241,12 @@ def embed_chunks(
                 "A document chunk does not match the canonical embedding schema."
             )
         validated.append(chunk)
+    return validated
 
-    vectors = provider.embed_documents([chunk["text"] for chunk in validated])
-    if len(vectors) != len(validated):
-        raise contracts.EmbeddingError(
-            "The embedding provider returned an unexpected vector count."
-        )
-    return [
-        {
-            "chunk_id": chunk["chunk_id"],
-            "text": chunk["text"],
-            "metadata": copy.deepcopy(dict(chunk["metadata"])),
-            "embedding": vector,
-        }
-        for chunk, vector in zip(validated, vectors, strict=True)
-    ]
+
+def _record(chunk: Mapping[str, Any]) -> dict[str, Any]:
+    return {
+        "chunk_id": chunk["chunk_id"],
+        "text": chunk["text"],
+        "metadata": copy.deepcopy(dict(chunk["metadata"])),
+    }
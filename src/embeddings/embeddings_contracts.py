@@ -6,6 +6,7 @@ Define provider-neutral embedding interfaces and failures.
 
 Responsibilities:
   - Specify separate document and query embedding operations.
+  - Specify a matrix-valued document operation for bulk ingestion.
   - Define stable model and dimension metadata for compatibility checks.
   - Define the project-owned embedding failure boundary.
 
@@ -22,6 +23,9 @@ from __future__ import annotations
 
 from typing import Protocol, Sequence
 
+import numpy as np
+from numpy.typing import NDArray
+
 __all__ = ["EmbeddingError", "EmbeddingProvider"]
 
 
@@ -65,6 +69,28 @@ class EmbeddingProvider(Protocol):
 
         ...
 
+    def embed_documents_array(self, texts: Sequence[str], /) -> NDArray[np.float32]:
+        """Embed document passages into one matrix while preserving input order.
+
+        Parameters
+        ----------
+        texts
+            Ordered non-empty document passages.
+
+        Returns
+        -------
+        numpy.ndarray
+            C-contiguous finite ``float32`` matrix of shape
+            ``(len(texts), dimension)`` whose row ``i`` embeds ``texts[i]``.
+
+        Notes
+        -----
+        Ingestion prefers this method because it avoids one boxed Python float per
+        vector component. Vectors equal those of :meth:`embed_documents`.
+        """
+
+        ...
+
     def embed_query(self, text: str, /) -> list[float]:
         """Embed one retrieval query with provider-specific query semantics.
 
@@ -0,0 +1,327 @@
+"""
+===============================================================================
+embeddings_onnx.py
+===============================================================================
+Run validated local text embeddings from an exported ONNX model.
+
+Responsibilities:
+  - Load one ONNX Runtime CPU session and tokenizer on first use, or ahead of
+    requests through an explicit warm-up.
+  - Apply retrieval-specific prefixes, mean pooling, and L2 normalization.
+  - Reject invalid, non-finite, or dimensionally incompatible vectors.
+  - Produce dynamically int8-quantized copies of exported models.
+
+Design principles:
+  - Match the SentenceTransformer provider's prefix, normalization, shape,
+    and finiteness guarantees so either backend can serve the same index.
+  - Keep ONNX Runtime and tokenizer imports optional and lazy.
+
+Boundaries:
+  - Performs no model loading or optional-dependency import at import time.
+  - Does not export PyTorch models to ONNX; it consumes exported files.
+===============================================================================
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from . import embeddings_contracts as contracts
+
+__all__ = ["OnnxEmbeddingProvider", "quantize_dynamic_int8"]
+
+
+class OnnxEmbeddingProvider:
+    """Provide lazy normalized local embeddings through ONNX Runtime on CPU.
+
+    Parameters
+    ----------
+    model_id
+        Stable model identifier persisted with vector-store snapshots and used
+        by the default tokenizer factory.
+    model_path
+        Exported ONNX model whose first output holds token embeddings of shape
+        ``(batch, tokens, dimension)`` or pooled vectors ``(batch, dimension)``.
+    dimension
+        Positive output dimension required from every encoded vector.
+    batch_size
+        Positive number of passages per inference call.
+    max_length
+        Positive token bound applied by truncation.
+    use_e5_prefixes
+        Whether to apply ``passage:`` and ``query:`` retrieval prefixes.
+    session_factory
+        Optional factory building an inference session from ``model_path``.
+    tokenizer_factory
+        Optional factory building a tokenizer from ``model_id``.
+
+    Notes
+    -----
+    Token embeddings are mean-pooled over the attention mask and normalized,
+    matching SentenceTransformer models such as E5. Only the tokenizer outputs
+    that the model declares as inputs are fed to it. ONNX Runtime is an optional
+    dependency that must be installed separately.
+    """
+
+    def __init__(
+        self,
+        *,
+        model_id: str,
+        model_path: str | Path,
+        dimension: int,
+        batch_size: int = 32,
+        max_length: int = 512,
+        use_e5_prefixes: bool = True,
+        session_factory: Callable[[Path], Any] | None = None,
+        tokenizer_factory: Callable[[str], Any] | None = None,
+    ) -> None:
+        """Configure lazy session loading, vector shape, batching, and prefixes."""
+
+        if not isinstance(model_id, str) or not model_id.strip():
+            raise ValueError("model_id must be a non-empty string")
+        for name, value in (
+            ("dimension", dimension),
+            ("batch_size", batch_size),
+            ("max_length", max_length),
+        ):
+            if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+                raise ValueError(f"{name} must be a positive integer")
+        self._model_id = model_id.strip()
+        self._model_path = Path(model_path)
+        self._dimension = dimension
+        self._batch_size = batch_size
+        self._max_length = max_length
+        self._use_e5_prefixes = use_e5_prefixes
+        self._session_factory = session_factory or self._default_session_factory
+        self._tokenizer_factory = tokenizer_factory or self._default_tokenizer_factory
+        self._session: Any | None = None
+        self._tokenizer: Any | None = None
+        self._input_names: frozenset[str] = frozenset()
+        self._ready = False
+
+    @property
+    def model_id(self) -> str:
+        """Return the persisted model identifier."""
+
+        return self._model_id
+
+    @property
+    def dimension(self) -> int:
+        """Return the expected embedding dimension."""
+
+        return self._dimension
+
+    @property
+    def ready(self) -> bool:
+        """Return whether :meth:`warm_up` has loaded and exercised the model."""
+
+        return self._ready
+
+    def warm_up(self) -> None:
+        """Load the session and tokenizer and run one tiny encode.
+
+        Raises
+        ------
+        contracts.EmbeddingError
+            If the model cannot be loaded or fails to encode the probe text.
+        """
+
+        if self._ready:
+            return
+        prefix = "query: " if self._use_e5_prefixes else ""
+        self._encode(["warm-up"], prefix=prefix)
+        self._ready = True
+
+    @staticmethod
+    def _default_session_factory(model_path: Path) -> Any:
+        import onnxruntime
+
+        return onnxruntime.InferenceSession(
+            str(model_path), providers=["CPUExecutionProvider"]
+        )
+
+    @staticmethod
+    def _default_tokenizer_factory(model_id: str) -> Any:
+        from transformers import AutoTokenizer
+
+        return AutoTokenizer.from_pretrained(model_id)
+
+    def _loaded(self) -> tuple[Any, Any]:
+        if self._session is None or self._tokenizer is None:
+            try:
+                session = self._session_factory(self._model_path)
+                tokenizer = self._tokenizer_factory(self.model_id)
+                input_names = frozenset(item.name for item in session.get_inputs())
+            except Exception as exc:
+                raise contracts.EmbeddingError(
+                    "The local ONNX embedding model could not be loaded."
+                ) from exc
+            self._session = session
+            self._tokenizer = tokenizer
+            self._input_names = input_names
+        return self._session, self._tokenizer
+
+    def _encode(self, texts: Sequence[str], *, prefix: str) -> NDArray[np.float32]:
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        if any(not isinstance(text, str) or not text.strip() for text in texts):
+            raise ValueError("Every embedding input must be a non-empty string.")
+
+        prepared = [f"{prefix}{text.strip()}" for text in texts]
+        session, tokenizer = self._loaded()
+        try:
+            encoded = np.concatenate(
+                [
+                    self._encode_batch(
+                        session, tokenizer, prepared[start : start + self._batch_size]
+                    )
+                    for start in range(0, len(prepared), self._batch_size)
+                ]
+            )
+        except contracts.EmbeddingError:
+            raise
+        except Exception as exc:
+            raise contracts.EmbeddingError(
+                "The local ONNX embedding model could not encode the supplied text."
+            ) from exc
+
+        array = np.ascontiguousarray(encoded, dtype=np.float32)
+        expected_shape = (len(prepared), self.dimension)
+        if array.shape != expected_shape:
+            raise contracts.EmbeddingError(
+                "The local ONNX embedding model returned an incompatible vector shape."
+            )
+        if not np.isfinite(array).all():
+            raise contracts.EmbeddingError(
+                "The local ONNX embedding model returned non-finite vector values."
+            )
+        return array
+
+    def _encode_batch(
+        self, session: Any, tokenizer: Any, texts: Sequence[str]
+    ) -> NDArray[np.float32]:
+        features: Mapping[str, Any] = tokenizer(
+            list(texts),
+            padding=True,
+            truncation=True,
+            max_length=self._max_length,
+            return_tensors="np",
+        )
+        feeds = {
+            name: np.asarray(value, dtype=np.int64)
+            for name, value in features.items()
+            if name in self._input_names
+        }
+        output = np.asarray(session.run(None, feeds)[0], dtype=np.float32)
+        if output.ndim == 3:
+            mask = np.asarray(features["attention_mask"], dtype=np.float32)[..., None]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                output = (output * mask).sum(axis=1) / mask.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # A zero vector becomes non-finite here and is rejected by _encode.
+            return output / np.linalg.norm(output, axis=-1, keepdims=True)
+
+    def embed_documents(self, texts: Sequence[str]) -> list[list[float]]:
+        """Embed ordered passages with configured document-prefix semantics.
+
+        Parameters
+        ----------
+        texts
+            Ordered non-empty passages to encode in configured batches.
+
+        Returns
+        -------
+        list of list of float
+            Normalized vectors in the same order as ``texts``.
+
+        Raises
+        ------
+        ValueError
+            If an input passage is empty or has an invalid type.
+        contracts.EmbeddingError
+            If model loading, inference, or output validation fails.
+        """
+
+        return self.embed_documents_array(texts).tolist()
+
+    def embed_documents_array(self, texts: Sequence[str]) -> NDArray[np.float32]:
+        """Embed ordered passages into one contiguous ``float32`` matrix.
+
+        Parameters
+        ----------
+        texts
+            Ordered non-empty passages to encode in configured batches.
+
+        Returns
+        -------
+        numpy.ndarray
+            Normalized ``(len(texts), dimension)`` matrix in input order.
+
+        Raises
+        ------
+        ValueError
+            If an input passage is empty or has an invalid type.
+        contracts.EmbeddingError
+            If model loading, inference, or output validation fails.
+        """
+
+        prefix = "passage: " if self._use_e5_prefixes else ""
+        return self._encode(texts, prefix=prefix)
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed one query with configured query-prefix semantics.
+
+        Parameters
+        ----------
+        text
+            Non-empty retrieval query.
+
+        Returns
+        -------
+        list of float
+            Normalized fixed-dimension query vector.
+
+        Raises
+        ------
+        ValueError
+            If the query is empty or has an invalid type.
+        contracts.EmbeddingError
+            If model loading, inference, or output validation fails.
+        """
+
+        prefix = "query: " if self._use_e5_prefixes else ""
+        return self._encode([text], prefix=prefix)[0].tolist()
+
+
+def quantize_dynamic_int8(source: str | Path, target: str | Path) -> Path:
+    """Write a dynamically int8-quantized copy of an exported ONNX model.
+
+    Parameters
+    ----------
+    source
+        Exported floating-point ONNX model.
+    target
+        Destination of the quantized model.
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the written quantized model.
+
+    Notes
+    -----
+    Weights are stored as signed 8-bit integers and activations are quantized
+    per batch at run time, which typically shrinks the model about fourfold and
+    speeds up CPU inference. Requires the optional ``onnxruntime`` package.
+    """
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    target_path = Path(target)
+    quantize_dynamic(Path(source), target_path, weight_type=QuantType.QInt8)
+    return target_path
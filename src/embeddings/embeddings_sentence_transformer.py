@@ -5,31 +5,47 @@ embeddings_sentence_transformer.py
 Run validated local text embeddings with SentenceTransformers.
 
 Responsibilities:
-  - Load one injected or local SentenceTransformer instance on first use.
+  - Load one injected or local SentenceTransformer instance on first use, or
+    ahead of requests through an explicit warm-up.
   - Apply retrieval-specific prefixes and normalized batched encoding.
   - Reject invalid, non-finite, or dimensionally incompatible vectors.
 
 Design principles:
   - Load lazily, batch passages, and keep query semantics explicit.
+  - Optionally spread passages over spawned worker processes, each holding
+    one model, and reassemble their vectors in input order.
   - Normalize vectors at the model boundary for consistent FAISS search.
 
 Boundaries:
-  - Performs no model loading at import time.
+  - Performs no model loading and starts no worker process at import time.
   - Does not index vectors or select generation providers.
 ===============================================================================
 """
 
 from __future__ import annotations
 
+import multiprocessing
+import os
+import threading
+import weakref
 from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Any
 
 import numpy as np
+from numpy.typing import NDArray
 
 from . import embeddings_contracts as contracts
 
 __all__ = ["SentenceTransformerEmbeddingProvider"]
 
+# The provider that answers encode requests inside one pool worker process.
+_WORKER_PROVIDER: SentenceTransformerEmbeddingProvider | None = None
+# Holds every warm-up task until each worker of the pool has taken one.
+_WORKER_BARRIER: Any = None
+_WARM_UP_TIMEOUT_SECONDS = 600.0
+
 
 class SentenceTransformerEmbeddingProvider:
     """Provide lazy normalized local embeddings through SentenceTransformers.
@@ -46,11 +62,24 @@ class SentenceTransformerEmbeddingProvider:
         Whether to apply ``passage:`` and ``query:`` retrieval prefixes.
     model_factory
         Optional factory used to construct the model on first embedding call.
+    max_batch_tokens
+        Optional positive bound on padded tokens per model batch. When set,
+        passages are sorted by token length and grouped under the bound instead
+        of in fixed ``batch_size`` groups.
+    worker_processes
+        Positive number of processes that encode passages. Values above one
+        start a pool on first use in which every worker loads its own model;
+        ``model_factory`` must then be picklable.
 
     Notes
     -----
     The provider caches one model instance after first use. Encoded vectors are
     normalized by the model call and validated for shape and finite values.
+    Token-budget batching keeps short headings out of batches padded to long
+    paragraphs; vectors are returned in input order either way. A worker pool
+    uses the ``spawn`` start method, divides each call into one contiguous slice
+    per worker, and is shut down by :meth:`close` or at interpreter exit.
+    :meth:`warm_up` moves model loading out of the first user request.
     """
 
     def __init__(
@@ -61,6 +90,8 @@ class SentenceTransformerEmbeddingProvider:
         batch_size: int = 32,
         use_e5_prefixes: bool = True,
         model_factory: Callable[[str], Any] | None = None,
+        max_batch_tokens: int | None = None,
+        worker_processes: int = 1,
     ) -> None:
         """Configure lazy model loading, vector shape, batching, and prefixes."""
 
@@ -78,12 +109,31 @@ class SentenceTransformerEmbeddingProvider:
             or batch_size <= 0
         ):
             raise ValueError("batch_size must be a positive integer")
+        if max_batch_tokens is not None and (
+            isinstance(max_batch_tokens, bool)
+            or not isinstance(max_batch_tokens, int)
+            or max_batch_tokens <= 0
+        ):
+            raise ValueError("max_batch_tokens must be a positive integer or None")
+        if (
+            isinstance(worker_processes, bool)
+            or not isinstance(worker_processes, int)
+            or worker_processes <= 0
+        ):
+            raise ValueError("worker_processes must be a positive integer")
         self._model_id = model_id.strip()
         self._dimension = dimension
         self._batch_size = batch_size
+        self._max_batch_tokens = max_batch_tokens
         self._use_e5_prefixes = use_e5_prefixes
         self._model_factory = model_factory or self._default_model_factory
         self._model: Any | None = None
+        self._ready = False
+        self._worker_processes = worker_processes
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_finalizer: weakref.finalize | None = None
+        self._pool_barrier: Any = None
+        self._pool_lock = threading.Lock()
 
     @property
     def model_id(self) -> str:
@@ -97,6 +147,61 @@ class SentenceTransformerEmbeddingProvider:
 
         return self._dimension
 
+    @property
+    def ready(self) -> bool:
+        """Return whether :meth:`warm_up` has loaded and exercised the model."""
+
+        return self._ready
+
+    def warm_up(self) -> None:
+        """Load the model and run one tiny encode ahead of the first request.
+
+        Raises
+        ------
+        contracts.EmbeddingError
+            If the model cannot be loaded or fails to encode the probe text.
+
+        Notes
+        -----
+        The probe initializes lazily built kernels as well as the model. With a
+        worker pool, one warm-up task per worker waits on a shared barrier after
+        its probe, so no worker can take a second task and every worker starts
+        and loads its model. Repeated calls return immediately once the
+        provider is ready.
+        """
+
+        if self._ready:
+            return
+        prefix = "query: " if self._use_e5_prefixes else ""
+        if self._worker_processes == 1:
+            self._encode(["warm-up"], prefix=prefix)
+        else:
+            self._warm_up_pool(f"{prefix}warm-up")
+        self._ready = True
+
+    def _warm_up_pool(self, probe: str) -> None:
+        pool = self._worker_pool()
+        assert self._pool_barrier is not None
+        # A previous failed warm-up leaves the barrier broken.
+        self._pool_barrier.reset()
+        futures = [
+            pool.submit(_warm_up_worker, probe) for _ in range(self._worker_processes)
+        ]
+        try:
+            for future in futures:
+                future.result()
+        except BrokenProcessPool as exc:
+            self.close()
+            raise contracts.EmbeddingError(
+                "The local embedding worker pool stopped unexpectedly."
+            ) from exc
+        except contracts.EmbeddingError:
+            raise
+        except Exception as exc:
+            raise contracts.EmbeddingError(
+                "The local embedding workers could not be warmed up."
+            ) from exc
+
     @staticmethod
     def _default_model_factory(model_id: str) -> Any:
         from sentence_transformers import SentenceTransformer
@@ -122,21 +227,22 @@ class SentenceTransformerEmbeddingProvider:
             self._model = model
         return self._model
 
-    def _encode(self, texts: Sequence[str], *, prefix: str) -> list[list[float]]:
+    def _encode(self, texts: Sequence[str], *, prefix: str) -> NDArray[np.float32]:
         if not texts:
-            return []
+            return np.empty((0, self.dimension), dtype=np.float32)
         if any(not isinstance(text, str) or not text.strip() for text in texts):
             raise ValueError("Every embedding input must be a non-empty string.")
 
         prepared = [f"{prefix}{text.strip()}" for text in texts]
         try:
-            encoded = self._loaded_model().encode(
-                prepared,
-                batch_size=self._batch_size,
-                convert_to_numpy=True,
-                normalize_embeddings=True,
-                show_progress_bar=False,
-            )
+            if self._worker_processes > 1:
+                encoded = self._encode_in_pool(prepared)
+            elif self._max_batch_tokens is None:
+                encoded = self._encode_batch(
+                    self._loaded_model(), prepared, self._batch_size
+                )
+            else:
+                encoded = self._encode_by_token_budget(self._loaded_model(), prepared)
         except contracts.EmbeddingError:
             raise
         except Exception as exc:
@@ -144,7 +250,7 @@ class SentenceTransformerEmbeddingProvider:
                 "The local embedding model could not encode the supplied text."
             ) from exc
 
-        array = np.asarray(encoded, dtype=np.float32)
+        array = np.ascontiguousarray(encoded, dtype=np.float32)
         expected_shape = (len(prepared), self.dimension)
         if array.shape != expected_shape:
             raise contracts.EmbeddingError(
@@ -154,7 +260,124 @@ class SentenceTransformerEmbeddingProvider:
             raise contracts.EmbeddingError(
                 "The local embedding model returned non-finite vector values."
             )
-        return array.tolist()
+        return array
+
+    def _encode_in_pool(self, texts: Sequence[str]) -> NDArray[np.float32]:
+        pool = self._worker_pool()
+        slices = np.array_split(
+            np.arange(len(texts)), min(self._worker_processes, len(texts))
+        )
+        futures = [
+            pool.submit(_encode_in_worker, [texts[row] for row in rows.tolist()])
+            for rows in slices
+        ]
+        try:
+            return np.concatenate([future.result() for future in futures])
+        except BrokenProcessPool as exc:
+            self.close()
+            raise contracts.EmbeddingError(
+                "The local embedding worker pool stopped unexpectedly."
+            ) from exc
+
+    def _worker_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                settings = {
+                    "model_id": self._model_id,
+                    "dimension": self._dimension,
+                    "batch_size": self._batch_size,
+                    "use_e5_prefixes": False,
+                    "model_factory": self._model_factory,
+                    "max_batch_tokens": self._max_batch_tokens,
+                }
+                threads = max(1, (os.cpu_count() or 1) // self._worker_processes)
+                # Spawned workers do not inherit the host's threads or locks.
+                context = multiprocessing.get_context("spawn")
+                barrier = context.Barrier(self._worker_processes)
+                pool = ProcessPoolExecutor(
+                    max_workers=self._worker_processes,
+                    mp_context=context,
+                    initializer=_initialize_worker,
+                    initargs=(settings, threads, barrier),
+                )
+                self._pool_barrier = barrier
+                self._pool = pool
+                self._pool_finalizer = weakref.finalize(
+                    self, pool.shutdown, wait=True, cancel_futures=True
+                )
+            return self._pool
+
+    def close(self) -> None:
+        """Shut down the worker pool, if started; later calls start a new one."""
+
+        with self._pool_lock:
+            if self._pool_finalizer is not None:
+                self._pool_finalizer()
+                # A new pool loads its models again.
+                self._ready = False
+            self._pool = None
+            self._pool_finalizer = None
+            self._pool_barrier = None
+
+    @staticmethod
+    def _encode_batch(model: Any, texts: Sequence[str], batch_size: int) -> Any:
+        return model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+
+    def _encode_by_token_budget(
+        self, model: Any, texts: Sequence[str]
+    ) -> NDArray[np.float32]:
+        assert self._max_batch_tokens is not None
+        lengths = self._token_lengths(model, texts)
+        encoded = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for batch in self._token_budget_batches(lengths, self._max_batch_tokens):
+            vectors = np.asarray(
+                self._encode_batch(model, [texts[row] for row in batch], len(batch)),
+                dtype=np.float32,
+            )
+            if vectors.shape != (len(batch), self.dimension):
+                raise contracts.EmbeddingError(
+                    "The local embedding model returned an incompatible vector shape."
+                )
+            encoded[batch] = vectors
+        return encoded
+
+    @staticmethod
+    def _token_lengths(model: Any, texts: Sequence[str]) -> NDArray[np.int64]:
+        tokenizer = getattr(model, "tokenizer", None)
+        if callable(tokenizer):
+            token_ids = tokenizer(
+                list(texts),
+                add_special_tokens=True,
+                truncation=True,
+                max_length=getattr(model, "max_seq_length", None),
+            )["input_ids"]
+            return np.fromiter(map(len, token_ids), dtype=np.int64, count=len(texts))
+        # Without a tokenizer, estimate four characters per token plus specials.
+        return np.fromiter(
+            (len(text) // 4 + 2 for text in texts), dtype=np.int64, count=len(texts)
+        )
+
+    @staticmethod
+    def _token_budget_batches(
+        lengths: NDArray[np.int64], max_batch_tokens: int
+    ) -> list[list[int]]:
+        batches: list[list[int]] = []
+        batch: list[int] = []
+        for row in np.argsort(lengths, kind="stable").tolist():
+            # Rows arrive shortest first, so the new row sets the padded length.
+            if batch and (len(batch) + 1) * int(lengths[row]) > max_batch_tokens:
+                batches.append(batch)
+                batch = []
+            batch.append(row)
+        if batch:
+            batches.append(batch)
+        return batches
 
     def embed_documents(self, texts: Sequence[str]) -> list[list[float]]:
         """Embed ordered passages with configured document-prefix semantics.
@@ -177,6 +400,29 @@ class SentenceTransformerEmbeddingProvider:
             If model loading, encoding, or output validation fails.
         """
 
+        return self.embed_documents_array(texts).tolist()
+
+    def embed_documents_array(self, texts: Sequence[str]) -> NDArray[np.float32]:
+        """Embed ordered passages into one contiguous ``float32`` matrix.
+
+        Parameters
+        ----------
+        texts
+            Ordered non-empty passages to encode in configured batches.
+
+        Returns
+        -------
+        numpy.ndarray
+            Normalized ``(len(texts), dimension)`` matrix in input order.
+
+        Raises
+        ------
+        ValueError
+            If an input passage is empty or has an invalid type.
+        contracts.EmbeddingError
+            If model loading, encoding, or output validation fails.
+        """
+
         prefix = "passage: " if self._use_e5_prefixes else ""
         return self._encode(texts, prefix=prefix)
 
@@ -202,4 +448,34 @@ class SentenceTransformerEmbeddingProvider:
         """
 
         prefix = "query: " if self._use_e5_prefixes else ""
-        return self._encode([text], prefix=prefix)[0]
+        return self._encode([text], prefix=prefix)[0].tolist()
+
+
+def _initialize_worker(settings: dict[str, Any], threads: int, barrier: Any) -> None:
+    global _WORKER_PROVIDER, _WORKER_BARRIER
+    try:
+        import torch
+    except ImportError:
+        pass
+    else:
+        # Share the host's cores between workers instead of oversubscribing them.
+        torch.set_num_threads(threads)
+    _WORKER_PROVIDER = SentenceTransformerEmbeddingProvider(**settings)
+    _WORKER_BARRIER = barrier
+
+
+def _encode_in_worker(texts: list[str]) -> NDArray[np.float32]:
+    assert _WORKER_PROVIDER is not None
+    # Texts arrive already prefixed, so the worker provider adds no prefix.
+    return _WORKER_PROVIDER._encode(texts, prefix="")
+
+
+def _warm_up_worker(probe: str) -> None:
+    assert _WORKER_PROVIDER is not None and _WORKER_BARRIER is not None
+    try:
+        _WORKER_PROVIDER._encode([probe], prefix="")
+    except BaseException:
+        # Release the other workers instead of leaving them to time out.
+        _WORKER_BARRIER.abort()
+        raise
+    _WORKER_BARRIER.wait(timeout=_WARM_UP_TIMEOUT_SECONDS)
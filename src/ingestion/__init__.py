@@ -1,6 +1,7 @@
 """PDF loading, preprocessing, chunking, and ingestion coordination.
 
 Provides:
+- cache: process-wide reuse of prepared documents.
 - chunker: canonical deterministic chunk schema.
 - loader: PDF byte extraction.
 - preprocessing: structural PDF normalization.
@@ -9,9 +10,10 @@ Provides:
 
 from __future__ import annotations
 
+from . import ingestion_cache as cache
 from . import ingestion_chunker as chunker
 from . import ingestion_loader as loader
 from . import ingestion_preprocessing as preprocessing
 from . import ingestion_processor as processor
 
-__all__ = ["chunker", "loader", "preprocessing", "processor"]
+__all__ = ["cache", "chunker", "loader", "preprocessing", "processor"]
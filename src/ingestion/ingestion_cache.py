@@ -0,0 +1,263 @@
+"""
+===============================================================================
+ingestion_cache.py
+===============================================================================
+Share prepared documents between sessions of one process.
+
+Responsibilities:
+  - Hold prepared documents keyed by content hash within one configuration.
+  - Bound memory by estimated bytes and evict least recently used documents.
+  - Optionally persist prepared documents as JSON records and NumPy matrices.
+
+Design principles:
+  - Bind every cache to one chunking and embedding configuration key, so a
+    changed setting never serves documents prepared under another.
+  - Treat the disk tier as an optimization: its failures are logged and
+    disable it instead of failing an upload.
+
+Boundaries:
+  - Does not prepare documents or decide when a session consults the cache.
+  - Does not bound or garbage-collect the optional cache directory.
+===============================================================================
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+
+from . import ingestion_processor as processor
+
+__all__ = ["PreparedDocumentCache"]
+
+_LOGGER = logging.getLogger(__name__)
+_SCHEMA_VERSION = 1
+
+
+class PreparedDocumentCache:
+    """Reuse prepared documents across sessions with LRU byte accounting.
+
+    Parameters
+    ----------
+    configuration_key
+        Non-empty identity of the chunking and embedding settings that produced
+        every cached document.
+    max_bytes
+        Positive bound on the estimated size of documents held in memory.
+    path
+        Optional directory that keeps prepared documents across restarts.
+
+    Raises
+    ------
+    ValueError
+        If ``configuration_key`` is empty or ``max_bytes`` is not positive.
+
+    Notes
+    -----
+    A document's size is its vector bytes plus the UTF-8 length of its JSON
+    manifest, which holds the records. A document larger than ``max_bytes`` is
+    not held in memory, but is still written to the optional directory. The
+    cache is thread-safe, and documents loaded from disk memory-map their
+    vectors read-only.
+    """
+
+    def __init__(
+        self,
+        *,
+        configuration_key: str,
+        max_bytes: int,
+        path: str | Path | None = None,
+    ) -> None:
+        """Configure the memory bound and the optional cache directory."""
+
+        if not isinstance(configuration_key, str) or not configuration_key:
+            raise ValueError("configuration_key must be a non-empty string")
+        if (
+            isinstance(max_bytes, bool)
+            or not isinstance(max_bytes, int)
+            or max_bytes <= 0
+        ):
+            raise ValueError("max_bytes must be a positive integer")
+        self.configuration_key = configuration_key
+        self.max_bytes = max_bytes
+        self.path = None if path is None else Path(path)
+        self._documents: OrderedDict[str, tuple[processor.PreparedDocument, int]] = (
+            OrderedDict()
+        )
+        self._size_bytes = 0
+        self._disk_enabled = self.path is not None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of documents held in memory."""
+
+        with self._lock:
+            return len(self._documents)
+
+    @property
+    def size_bytes(self) -> int:
+        """Return the estimated size of the documents held in memory."""
+
+        with self._lock:
+            return self._size_bytes
+
+    def get(self, document_id: str) -> processor.PreparedDocument | None:
+        """Return the prepared document for a content hash, if cached.
+
+        Parameters
+        ----------
+        document_id
+            SHA-256 content hash of the uploaded bytes.
+
+        Returns
+        -------
+        PreparedDocument or None
+            Cached preparation from memory or disk, or ``None`` on a miss.
+        """
+
+        with self._lock:
+            entry = self._documents.get(document_id)
+            if entry is not None:
+                self._documents.move_to_end(document_id)
+                return entry[0]
+            if not self._disk_enabled:
+                return None
+        loaded = self._read(document_id)
+        if loaded is not None:
+            prepared, size = loaded
+            with self._lock:
+                self._remember(prepared, size)
+            return prepared
+        return None
+
+    def put(self, prepared: processor.PreparedDocument) -> None:
+        """Cache one prepared document under its content hash.
+
+        Parameters
+        ----------
+        prepared
+            Document prepared under this cache's configuration.
+        """
+
+        manifest = self._manifest(prepared)
+        size = prepared.vectors.nbytes + len(manifest)
+        with self._lock:
+            self._remember(prepared, size)
+            write = self._disk_enabled
+        if write:
+            self._write(prepared, manifest)
+
+    def _remember(self, prepared: processor.PreparedDocument, size: int) -> None:
+        document_id = prepared.result.document_id
+        previous = self._documents.pop(document_id, None)
+        if previous is not None:
+            self._size_bytes -= previous[1]
+        if size > self.max_bytes:
+            return
+        self._documents[document_id] = (prepared, size)
+        self._size_bytes += size
+        while self._size_bytes > self.max_bytes:
+            _evicted, (_document, evicted_size) = self._documents.popitem(last=False)
+            self._size_bytes -= evicted_size
+
+    def _entry_stem(self, document_id: str) -> Path:
+        assert self.path is not None
+        digest = hashlib.sha256(
+            f"{self.configuration_key}\0{document_id}".encode()
+        ).hexdigest()
+        return self.path / digest
+
+    def _read(self, document_id: str) -> tuple[processor.PreparedDocument, int] | None:
+        stem = self._entry_stem(document_id)
+        manifest_path = stem.with_suffix(".json")
+        try:
+            manifest_bytes = manifest_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            self._disable_disk(exc)
+            return None
+        try:
+            manifest = json.loads(manifest_bytes)
+            if (
+                manifest["schema_version"] != _SCHEMA_VERSION
+                or manifest["configuration_key"] != self.configuration_key
+                or manifest["result"]["document_id"] != document_id
+            ):
+                return None
+            vectors = np.load(stem.with_suffix(".npy"), mmap_mode="r")
+            prepared = processor.PreparedDocument(
+                result=processor.ProcessingResult(**manifest["result"]),
+                records=tuple(manifest["records"]),
+                vectors=vectors,
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            # A partial or foreign entry is a miss; preparing again overwrites it.
+            return None
+        return prepared, prepared.vectors.nbytes + len(manifest_bytes)
+
+    def _manifest(self, prepared: processor.PreparedDocument) -> bytes:
+        return json.dumps(
+            {
+                "schema_version": _SCHEMA_VERSION,
+                "configuration_key": self.configuration_key,
+                "result": {
+                    "document_id": prepared.result.document_id,
+                    "file_name": prepared.result.file_name,
+                    "chunk_count": prepared.result.chunk_count,
+                },
+                "records": prepared.records,
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+    def _write(self, prepared: processor.PreparedDocument, manifest: bytes) -> None:
+        stem = self._entry_stem(prepared.result.document_id)
+        try:
+            assert self.path is not None
+            self.path.mkdir(parents=True, exist_ok=True)
+            # The manifest is published last, so readers never see half an entry.
+            self._replace_file(
+                stem.with_suffix(".npy"),
+                lambda file: np.save(file, prepared.vectors, allow_pickle=False),
+            )
+            self._replace_file(
+                stem.with_suffix(".json"), lambda file: file.write(manifest)
+            )
+        except OSError as exc:
+            self._disable_disk(exc)
+
+    @staticmethod
+    def _replace_file(target: Path, write: Callable[[BinaryIO], object]) -> None:
+        file_descriptor, temporary_name = tempfile.mkstemp(
+            prefix=f".{target.name}-", dir=target.parent
+        )
+        temporary = Path(temporary_name)
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                write(file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, target)
+        finally:
+            temporary.unlink(missing_ok=True)
+
+    def _disable_disk(self, error: OSError) -> None:
+        _LOGGER.warning(
+            "Prepared-document cache directory %s is unavailable; "
+            "continuing in memory only: %s",
+            self.path,
+            error,
+        )
+        with self._lock:
+            self._disk_enabled = False
@@ -5,7 +5,9 @@ ingestion_chunker.py
 Build deterministic, structure-aware chunks from preprocessed PDF content.
 
 Responsibilities:
-  - Traverse preprocessed document sources in stable order.
+  - Traverse preprocessed document sources in stable order, returning all
+    chunks or yielding validated chunks one source at a time.
+  - Chunk documents whose pages arrive one at a time with their own tables.
   - Split text with explicit character overlap and emit canonical metadata.
   - Validate the chunk contract shared with embeddings and FAISS.
 
@@ -24,6 +26,7 @@ from __future__ import annotations
 import hashlib
 import json
 from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
 from typing import Any, Mapping
 
 __all__ = [
@@ -48,6 +51,11 @@ SUPPORTED_SOURCE_TYPES = {
     "table",
 }
 
+# Returns the indexed tables emitted after one page's paragraphs.
+_PageTables = Callable[
+    [Mapping[str, Any], int], Iterable[tuple[int, Mapping[str, Any]]]
+]
+
 
 class ChunkingError(ValueError):
     """Represent a UI-safe document or chunk-schema validation failure."""
@@ -157,6 +165,37 @@ class PDFChunker:
             If an emitted record violates the shared chunk schema.
         """
 
+        return list(self.iter_chunks(document))
+
+    def iter_chunks(self, document: Mapping[str, Any]) -> Iterator[dict[str, Any]]:
+        """Yield the chunks of :meth:`chunk_document` one source at a time.
+
+        Parameters
+        ----------
+        document
+            Loader/preprocessor mapping with a SHA-256 document identity and
+            supported structural source collections.
+
+        Yields
+        ------
+        dict
+            Validated canonical chunks ordered by source and part sequence.
+
+        Raises
+        ------
+        InvalidDocumentError
+            If required document metadata or structural fields are invalid.
+        InvalidChunkError
+            If an emitted record violates the shared chunk schema.
+
+        Notes
+        -----
+        Document-level fields are validated before the first chunk is yielded.
+        Later structural or schema errors are raised when the offending source is
+        reached, so a consumer must not publish chunks before exhausting the
+        iterator.
+        """
+
         if not isinstance(document, Mapping):
             raise InvalidDocumentError("Document must be a mapping.")
         metadata = document.get("metadata")
@@ -170,7 +209,100 @@ class PDFChunker:
         document_metadata = self._document_metadata(metadata, document_id)
         tables_by_page, tables_without_page = self._tables_by_page(metadata)
 
-        chunks: list[dict[str, Any]] = []
+        return self._iter_validated_chunks(
+            pages,
+            document_metadata,
+            lambda _page, page_number: tables_by_page.get(page_number, []),
+            tables_without_page,
+        )
+
+    def iter_page_chunks(
+        self, metadata: dict[str, Any], pages: Iterable[Any]
+    ) -> Iterator[dict[str, Any]]:
+        """Yield the chunks of a document whose pages arrive one at a time.
+
+        Parameters
+        ----------
+        metadata
+            Preprocessed document metadata with a SHA-256 ``file_hash``.
+        pages
+            Preprocessed pages in document order, each holding its own tables
+            in a ``tables`` list instead of the document's ``metadata.tables``.
+
+        Yields
+        ------
+        dict
+            The chunks :meth:`iter_chunks` yields for the assembled document.
+
+        Raises
+        ------
+        InvalidDocumentError
+            If the metadata lacks a file hash or a page or table is invalid.
+        InvalidChunkError
+            If an emitted record violates the shared chunk schema.
+
+        Notes
+        -----
+        Each page is consumed only after the previous page's chunks have been
+        yielded. Without a file hash the identity would digest the whole
+        document, so streamed documents must provide one.
+        """
+
+        if not isinstance(metadata, dict):
+            raise InvalidDocumentError("Document metadata must be a dictionary.")
+        file_hash = metadata.get("file_hash")
+        if not isinstance(file_hash, str) or not file_hash.strip():
+            raise InvalidDocumentError("Streamed documents need metadata.file_hash.")
+        document_metadata = self._document_metadata(
+            metadata, self._document_id({"metadata": metadata})
+        )
+        table_count = 0
+
+        def page_tables(
+            page: Mapping[str, Any], page_number: int
+        ) -> list[tuple[int, Mapping[str, Any]]]:
+            nonlocal table_count
+            tables = page.get("tables", [])
+            if not isinstance(tables, list):
+                raise InvalidDocumentError(
+                    f"Tables on page {page_number} must be a list."
+                )
+            indexed = []
+            for table_index, table in enumerate(tables, start=table_count):
+                if not isinstance(table, Mapping):
+                    raise InvalidDocumentError(
+                        f"Table at position {table_index} must be a mapping."
+                    )
+                indexed.append((table_index, table))
+            table_count += len(tables)
+            return indexed
+
+        return self._iter_validated_chunks(pages, document_metadata, page_tables, [])
+
+    def _iter_validated_chunks(
+        self,
+        pages: Iterable[Any],
+        document_metadata: dict[str, Any],
+        page_tables: _PageTables,
+        tables_without_page: list[tuple[int, Mapping[str, Any]]],
+    ) -> Iterator[dict[str, Any]]:
+        chunk_ids: set[str] = set()
+        for chunk in self._iter_source_chunks(
+            pages, document_metadata, page_tables, tables_without_page
+        ):
+            if chunk["chunk_id"] in chunk_ids:
+                raise InvalidChunkError("Chunk generation produced duplicate IDs.")
+            chunk_ids.add(chunk["chunk_id"])
+            self.validate_chunk(chunk)
+            yield chunk
+
+    def _iter_source_chunks(
+        self,
+        pages: Iterable[Any],
+        document_metadata: dict[str, Any],
+        page_tables: _PageTables,
+        tables_without_page: list[tuple[int, Mapping[str, Any]]],
+    ) -> Iterator[dict[str, Any]]:
         chunk_sequence = 0
         source_sequence = 0
 
@@ -211,11 +343,11 @@ class PDFChunker:
                     document_metadata=document_metadata,
                     source_metadata=source_metadata,
                 )
-                chunks.extend(emitted)
+                yield from emitted
                 chunk_sequence += len(emitted)
                 source_sequence += 1
 
-            for table_index, table in tables_by_page.get(page_number, []):
+            for table_index, table in page_tables(page, page_number):
                 emitted = self._emit_table_chunks(
                     table=table,
                     table_index=table_index,
@@ -224,7 +356,7 @@ class PDFChunker:
                     chunk_sequence_start=chunk_sequence,
                     document_metadata=document_metadata,
                 )
-                chunks.extend(emitted)
+                yield from emitted
                 chunk_sequence += len(emitted)
                 source_sequence += 1
 
@@ -237,17 +369,10 @@ class PDFChunker:
                 chunk_sequence_start=chunk_sequence,
                 document_metadata=document_metadata,
             )
-            chunks.extend(emitted)
+            yield from emitted
             chunk_sequence += len(emitted)
             source_sequence += 1
 
-        chunk_ids = [chunk["chunk_id"] for chunk in chunks]
-        if len(chunk_ids) != len(set(chunk_ids)):
-            raise InvalidChunkError("Chunk generation produced duplicate IDs.")
-        for chunk in chunks:
-            self.validate_chunk(chunk)
-        return chunks
-
     @staticmethod
     def validate_chunk(chunk: Mapping[str, Any]) -> None:
         """Validate one chunk against the shared embedding and storage schema.
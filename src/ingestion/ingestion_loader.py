@@ -8,14 +8,24 @@ Responsibilities:
   - Accept in-memory, file-like, or path-based PDF sources.
   - Extract metadata, paragraphs, links, and optional tables.
   - Produce the stable preprocessing input schema and SHA-256 identity.
+  - Release each page's parser caches once its text, paragraphs, and tables
+    are extracted.
+  - Group lines, font sizes, and paragraph breaks with array operations rather
+    than per-glyph Python loops.
+  - Optionally extract page ranges of long documents in worker processes.
+  - Yield pages one at a time, after a paragraph-only survey pass when a
+    consumer needs document-wide statistics first.
 
 Design principles:
   - Derive identities from bytes and avoid shared temporary upload files.
   - Preserve seekable caller-owned stream positions when possible.
+  - Extract every page independently, then assign links across pages in page
+    order, so serial and parallel extraction produce identical documents.
 
 Boundaries:
   - Does not classify document structure, chunk text, or create embeddings.
   - Does not perform OCR or persist uploaded bytes.
+  - Starts no worker process at import time or for short documents.
 ===============================================================================
 """
 
@@ -23,29 +33,107 @@ from __future__ import annotations
 
 import hashlib
 import io
+import multiprocessing
 import os
 import re
+import threading
+import weakref
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from itertools import pairwise, repeat
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
 
+import numpy as np
 import pdfplumber
 from langdetect import DetectorFactory, detect
 from langdetect.lang_detect_exception import LangDetectException
+from numpy.typing import NDArray
 
 __all__ = ["UniversalPDFLoader"]
 
 
+@dataclass(frozen=True)
+class _PageContent:
+    """Hold everything extracted from one page before cross-page link assignment."""
+
+    raw_text: str
+    links: frozenset[str]
+    paragraphs: list[dict[str, Any]]
+    tables: list[list[list[str]]]
+
+
+@dataclass(frozen=True)
+class _TextLines:
+    """Group one page's characters into lines ordered by vertical position.
+
+    Line ``i`` spans ``bounds[i]:bounds[i + 1]`` of the per-character fields,
+    which keep page order within a line, and sits at ``y_positions[i]``, the
+    character top rounded to 0.1 points.
+    """
+
+    texts: list[str]
+    font_names: list[str]
+    sizes: NDArray[np.float64]
+    bounds: NDArray[np.intp]
+    y_positions: NDArray[np.float64]
+
+
 class UniversalPDFLoader:
     """Extract deterministic structured records from PDF inputs.
 
+    Parameters
+    ----------
+    page_workers
+        Positive number of processes that extract pages. Values above one start
+        a pool on first use for documents long enough to split.
+    min_pages_per_worker
+        Positive number of pages each worker must receive; shorter documents use
+        fewer workers or are extracted in the calling process.
+
+    Raises
+    ------
+    ValueError
+        If either bound is not a positive integer.
+
     Notes
     -----
     Uploaded bytes remain in memory. Seekable caller-owned streams are restored to
     their original position when possible, and document IDs are SHA-256 digests of
-    the exact input bytes.
+    the exact input bytes. A worker pool uses the ``spawn`` start method; every
+    worker opens the PDF once and extracts one contiguous page range, and the
+    results are merged in page order. The pool is shut down by :meth:`close` or at
+    interpreter exit.
     """
 
+    def __init__(self, *, page_workers: int = 1, min_pages_per_worker: int = 16):
+        """Configure optional page-parallel extraction."""
+
+        for name, value in (
+            ("page_workers", page_workers),
+            ("min_pages_per_worker", min_pages_per_worker),
+        ):
+            if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+                raise ValueError(f"{name} must be a positive integer")
+        self.page_workers = page_workers
+        self.min_pages_per_worker = min_pages_per_worker
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_finalizer: weakref.finalize | None = None
+        self._pool_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Shut down the worker pool, if started; later loads start a new one."""
+
+        with self._pool_lock:
+            if self._pool_finalizer is not None:
+                self._pool_finalizer()
+            self._pool = None
+            self._pool_finalizer = None
+
     @staticmethod
     def _hash_text(text: str) -> str:
         return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
@@ -167,56 +255,107 @@ class UniversalPDFLoader:
         merge_threshold_factor: float = 1.5,
         font_size_tolerance: float = 0.2,
     ) -> tuple[list[dict[str, Any]], set[str]]:
-        if not page.chars:
-            return [], set()
+        paragraphs = self._group_paragraphs(
+            self._text_lines(page), merge_threshold_factor, font_size_tolerance
+        )
+        return paragraphs, self._assign_links(paragraphs, all_known_links)
 
-        lines_by_y: dict[float, list[dict[str, Any]]] = {}
-        for character in page.chars:
-            lines_by_y.setdefault(round(character["top"], 1), []).append(character)
+    @staticmethod
+    def _text_lines(page: Any) -> _TextLines:
+        characters = page.chars
+        if not characters:
+            return _TextLines(
+                [], [], np.empty(0), np.zeros(1, dtype=np.intp), np.empty(0)
+            )
+        # Built-in round rounds the exact binary value; np.round scales first and
+        # would move ties such as 100.35 into a different line.
+        tops = np.fromiter(
+            map(round, map(itemgetter("top"), characters), repeat(1)),
+            dtype=np.float64,
+            count=len(characters),
+        )
+        y_positions, line_ids = np.unique(tops, return_inverse=True)
+        if (np.diff(line_ids) < 0).any():
+            # Most pages list characters top to bottom and need no reordering.
+            order = np.argsort(line_ids, kind="stable")
+            characters = [characters[index] for index in order.tolist()]
+        bounds = np.zeros(len(y_positions) + 1, dtype=np.intp)
+        np.cumsum(np.bincount(line_ids), out=bounds[1:])
+        return _TextLines(
+            list(map(itemgetter("text"), characters)),
+            list(map(itemgetter("fontname"), characters)),
+            _character_values(characters, "size"),
+            bounds,
+            y_positions,
+        )
 
+    def _group_paragraphs(
+        self,
+        lines: _TextLines,
+        merge_threshold_factor: float = 1.5,
+        font_size_tolerance: float = 0.2,
+    ) -> list[dict[str, Any]]:
+        if not lines.texts:
+            return []
+        line_texts = [
+            "".join(lines.texts[start:stop]).strip()
+            for start, stop in pairwise(lines.bounds.tolist())
+        ]
+        # Empty lines neither start paragraphs nor count as the previous line.
+        kept = np.flatnonzero([bool(text) for text in line_texts])
+        if not kept.size:
+            return []
+        kept_y = lines.y_positions[kept]
+        kept_sizes = np.maximum.reduceat(lines.sizes, lines.bounds[:-1])[kept]
+        starts_paragraph = np.ones(len(kept), dtype=bool)
+        starts_paragraph[1:] = (
+            np.abs(np.diff(kept_y)) > kept_sizes[:-1] * merge_threshold_factor
+        ) | (np.abs(np.diff(kept_sizes)) > font_size_tolerance)
+
+        # Unique (line, font) pairs sort by line, then by font name.
+        names = sorted(set(lines.font_names))
+        font_ids = np.fromiter(
+            map(
+                {name: index for index, name in enumerate(names)}.__getitem__,
+                lines.font_names,
+            ),
+            dtype=np.intp,
+            count=len(lines.font_names),
+        )
+        line_ids = np.repeat(np.arange(len(line_texts)), np.diff(lines.bounds))
+        pairs = np.unique(line_ids * len(names) + font_ids)
+        pair_bounds = np.searchsorted(
+            pairs // len(names), np.arange(len(line_texts) + 1)
+        ).tolist()
+        pair_names = [names[index] for index in (pairs % len(names)).tolist()]
+        line_fonts = [pair_names[start:stop] for start, stop in pairwise(pair_bounds)]
+
+        kept_lines = kept.tolist()
+        paragraph_bounds = [*np.flatnonzero(starts_paragraph).tolist(), len(kept)]
         paragraphs: list[dict[str, Any]] = []
-        current: dict[str, Any] | None = None
-        previous_y: float | None = None
-        previous_font_size: float | None = None
-        for y_position in sorted(lines_by_y):
-            characters = lines_by_y[y_position]
-            text_line = "".join(character["text"] for character in characters).strip()
-            if not text_line:
-                continue
-            font_size = max(character["size"] for character in characters)
-            font_names = {character["fontname"] for character in characters}
-            starts_paragraph = current is None
-            if previous_y is not None and previous_font_size is not None:
-                vertical_gap = abs(y_position - previous_y)
-                font_difference = abs(font_size - previous_font_size)
-                starts_paragraph = (
-                    vertical_gap > previous_font_size * merge_threshold_factor
-                    or font_difference > font_size_tolerance
-                )
-
-            if starts_paragraph:
-                if current is not None:
-                    current["text_hash"] = self._hash_text(current["text"])
-                    paragraphs.append(current)
-                current = {
-                    "text": text_line,
-                    "font_size": font_size,
-                    "font_names": sorted(font_names),
-                    "text_hash": self._hash_text(text_line),
-                    "y_position": y_position,
+        for start, stop in pairwise(paragraph_bounds):
+            members = kept_lines[start:stop]
+            text = " ".join(line_texts[line] for line in members)
+            fonts = line_fonts[members[0]]
+            if len(members) > 1:
+                fonts = sorted({name for line in members for name in line_fonts[line]})
+            paragraphs.append(
+                {
+                    "text": text,
+                    "font_size": float(kept_sizes[start]),
+                    "font_names": fonts,
+                    "text_hash": self._hash_text(text),
+                    "y_position": float(kept_y[start]),
                     "links": [],
                 }
-            else:
-                assert current is not None
-                current["text"] += f" {text_line}"
-                current["font_names"] = sorted(set(current["font_names"]) | font_names)
-            previous_y = y_position
-            previous_font_size = font_size
-
-        if current is not None:
-            current["text_hash"] = self._hash_text(current["text"])
-            paragraphs.append(current)
+            )
+        return paragraphs
 
+    def _assign_links(
+        self, paragraphs: list[dict[str, Any]], all_known_links: set[str]
+    ) -> set[str]:
+        if not paragraphs:
+            return set()
         assigned_links: set[str] = set()
         for paragraph in paragraphs:
             for link in self._extract_text_links(paragraph["text"]):
@@ -234,7 +373,7 @@ class UniversalPDFLoader:
                         paragraph["links"].append(uri)
                         assigned_links.add(uri)
                     break
-        return paragraphs, assigned_links
+        return assigned_links
 
     @staticmethod
     def _table_to_text(table: list[list[str]]) -> str:
@@ -243,6 +382,120 @@ class UniversalPDFLoader:
             for row in table
         )
 
+    def _extract_page(self, page: Any, *, extract_tables: bool) -> _PageContent:
+        raw_text = page.extract_text() or ""
+        links = set(self._extract_text_links(raw_text))
+        links.update(self._extract_annotation_links(page))
+        tables: list[list[list[str]]] = []
+        if extract_tables:
+            for table in page.extract_tables():
+                cleaned = [
+                    [cell if cell is not None else "" for cell in row] for row in table
+                ]
+                if any(any(cell.strip() for cell in row) for row in cleaned):
+                    tables.append(cleaned)
+        paragraphs = self._group_paragraphs(self._text_lines(page))
+        _close_page(page)
+        return _PageContent(
+            raw_text=raw_text,
+            links=frozenset(links),
+            paragraphs=paragraphs,
+            tables=tables,
+        )
+
+    def _worker_count(self, page_count: int) -> int:
+        return max(1, min(self.page_workers, page_count // self.min_pages_per_worker))
+
+    def _extract_in_pool(
+        self,
+        source: bytes | str,
+        start: int,
+        stop: int,
+        workers: int,
+        extract_tables: bool,
+    ) -> list[_PageContent]:
+        pool = self._worker_pool()
+        bounds = [
+            start + (stop - start) * index // workers for index in range(workers + 1)
+        ]
+        futures = [
+            pool.submit(_extract_page_range, source, first, last, extract_tables)
+            for first, last in pairwise(bounds)
+        ]
+        try:
+            return [page for future in futures for page in future.result()]
+        except BrokenProcessPool:
+            self.close()
+            raise
+
+    def _worker_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # Spawned workers do not inherit the host's threads or locks.
+                pool = ProcessPoolExecutor(
+                    max_workers=self.page_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self._pool = pool
+                self._pool_finalizer = weakref.finalize(
+                    self, pool.shutdown, wait=True, cancel_futures=True
+                )
+            return self._pool
+
+    def _document_language(self, raw_texts: list[str]) -> str:
+        return self._safe_detect_language("\n".join(raw_texts[:5])[:10_000])
+
+    @staticmethod
+    def _document_metadata(
+        document_language: str,
+        pdf_metadata: dict[str, Any],
+        file_name: str,
+        file_path: str | None,
+        file_size: int,
+        file_hash: str,
+        num_pages: int,
+    ) -> dict[str, Any]:
+        return {
+            "document_language": document_language,
+            **pdf_metadata,
+            "file_name": os.path.basename(str(file_name)),
+            "file_path": file_path,
+            "file_size": file_size,
+            "file_hash": file_hash,
+            "num_pages": num_pages,
+        }
+
+    def _page_record(
+        self,
+        page_number: int,
+        page: _PageContent,
+        globally_assigned_links: set[str],
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        remaining_links = page.links - globally_assigned_links
+        paragraphs = page.paragraphs
+        assigned_links = self._assign_links(paragraphs, remaining_links)
+        globally_assigned_links.update(assigned_links)
+        unassigned_links = remaining_links - assigned_links
+        page_text = "\n".join(paragraph["text"] for paragraph in paragraphs)
+        page_data = {
+            "page": page_number,
+            "text": page_text,
+            "is_empty": not page_text.strip(),
+            "text_length": len(page_text),
+            "page_hash": hashlib.sha256(page_text.encode("utf-8")).hexdigest(),
+            "paragraphs": paragraphs,
+            "links": sorted(unassigned_links),
+        }
+        tables = [
+            {
+                "page": page_number,
+                "table": table,
+                "table_text": self._table_to_text(table),
+            }
+            for table in page.tables
+        ]
+        return page_data, tables
+
     def load_pdf(
         self,
         pdf_source: Any,
@@ -278,7 +531,9 @@ class UniversalPDFLoader:
         Notes
         -----
         PDF parser exceptions propagate to ``DocumentProcessor``, which translates
-        them into the project-owned UI-safe processing error.
+        them into the project-owned UI-safe processing error. Links found on a
+        page are assigned to the first matching paragraph of that page unless an
+        earlier page already assigned them; the remainder stay page-level links.
         """
 
         (
@@ -290,70 +545,228 @@ class UniversalPDFLoader:
         ) = self._prepare_pdf_source(pdf_source, file_name=file_name)
         pages_data: list[dict[str, Any]] = []
         tables_data: list[dict[str, Any]] = []
-        all_links: set[str] = set()
         globally_assigned_links: set[str] = set()
 
+        pages: list[_PageContent] | None = None
         with pdfplumber.open(pdf_input) as pdf:
             pdf_metadata = self._extract_pdf_metadata(pdf)
-            raw_page_texts: list[str] = []
-            page_links: list[set[str]] = []
-            for page in pdf.pages:
-                page_text = page.extract_text() or ""
-                raw_page_texts.append(page_text)
-                links = set(self._extract_text_links(page_text))
-                links.update(self._extract_annotation_links(page))
-                page_links.append(links)
-                all_links.update(links)
-
-            language_sample = "\n".join(raw_page_texts[:5])[:10_000]
-            document_language = self._safe_detect_language(language_sample)
-            for page_index, page in enumerate(pdf.pages):
-                remaining_links = page_links[page_index] - globally_assigned_links
-                paragraphs, assigned_links = self._extract_paragraphs_with_fonts(
-                    page, all_known_links=remaining_links
-                )
-                globally_assigned_links.update(assigned_links)
-                unassigned_links = remaining_links - assigned_links
-                page_text = "\n".join(paragraph["text"] for paragraph in paragraphs)
-                pages_data.append(
-                    {
-                        "page": page_index + 1,
-                        "text": page_text,
-                        "is_empty": not page_text.strip(),
-                        "text_length": len(page_text),
-                        "page_hash": hashlib.sha256(
-                            page_text.encode("utf-8")
-                        ).hexdigest(),
-                        "paragraphs": paragraphs,
-                        "links": sorted(unassigned_links),
-                    }
-                )
-                if extract_tables:
-                    for table in page.extract_tables():
-                        cleaned = [
-                            [cell if cell is not None else "" for cell in row]
-                            for row in table
-                        ]
-                        if any(any(cell.strip() for cell in row) for row in cleaned):
-                            tables_data.append(
-                                {
-                                    "page": page_index + 1,
-                                    "table": cleaned,
-                                    "table_text": self._table_to_text(cleaned),
-                                }
-                            )
+            page_count = len(pdf.pages)
+            workers = self._worker_count(page_count)
+            if workers == 1:
+                pages = [
+                    self._extract_page(page, extract_tables=extract_tables)
+                    for page in pdf.pages
+                ]
+        if pages is None:
+            source = (
+                pdf_input.getvalue() if isinstance(pdf_input, io.BytesIO) else pdf_input
+            )
+            pages = self._extract_in_pool(
+                source, 0, page_count, workers, extract_tables
+            )
+
+        all_links: set[str] = set().union(*(page.links for page in pages))
+        document_language = self._document_language(
+            [page.raw_text for page in pages[:5]]
+        )
+        for page_index, page in enumerate(pages):
+            page_data, tables = self._page_record(
+                page_index + 1, page, globally_assigned_links
+            )
+            pages_data.append(page_data)
+            tables_data.extend(tables)
 
         return {
             "metadata": {
-                "document_language": document_language,
-                **pdf_metadata,
-                "file_name": os.path.basename(str(resolved_file_name)),
-                "file_path": resolved_file_path,
-                "file_size": file_size,
-                "file_hash": file_hash,
-                "num_pages": len(pages_data),
+                **self._document_metadata(
+                    document_language,
+                    pdf_metadata,
+                    resolved_file_name,
+                    resolved_file_path,
+                    file_size,
+                    file_hash,
+                    len(pages_data),
+                ),
                 "all_links": sorted(all_links),
             },
             "pages": pages_data,
             "tables": tables_data,
         }
+
+    def count_pages(self, pdf_source: Any) -> int:
+        """Return the number of pages without extracting any of them.
+
+        Parameters
+        ----------
+        pdf_source
+            PDF bytes, a readable binary stream, or a filesystem path.
+
+        Returns
+        -------
+        int
+            Page count of the document.
+        """
+
+        pdf_input = self._prepare_pdf_source(pdf_source)[0]
+        with pdfplumber.open(pdf_input) as pdf:
+            return len(pdf.pages)
+
+    def load_metadata(
+        self, pdf_source: Any, file_name: str | None = None
+    ) -> dict[str, Any]:
+        """Load the document metadata of :meth:`load_pdf` from its first pages.
+
+        Parameters
+        ----------
+        pdf_source
+            PDF bytes, a readable binary stream, or a filesystem path.
+        file_name
+            Original upload name for in-memory sources.
+
+        Returns
+        -------
+        dict
+            The ``metadata`` mapping :meth:`load_pdf` returns, without
+            ``all_links``, which needs every page.
+
+        Notes
+        -----
+        Only the pages sampled for language detection are read.
+        """
+
+        (
+            pdf_input,
+            resolved_file_name,
+            resolved_file_path,
+            file_size,
+            file_hash,
+        ) = self._prepare_pdf_source(pdf_source, file_name=file_name)
+        with pdfplumber.open(pdf_input) as pdf:
+            pdf_metadata = self._extract_pdf_metadata(pdf)
+            raw_texts = []
+            for page in pdf.pages[:5]:
+                raw_texts.append(page.extract_text() or "")
+                _close_page(page)
+            return self._document_metadata(
+                self._document_language(raw_texts),
+                pdf_metadata,
+                resolved_file_name,
+                resolved_file_path,
+                file_size,
+                file_hash,
+                len(pdf.pages),
+            )
+
+    def iter_page_paragraphs(self, pdf_source: Any) -> Iterator[list[dict[str, Any]]]:
+        """Yield each page's paragraphs without text, link, or table extraction.
+
+        Parameters
+        ----------
+        pdf_source
+            PDF bytes, a readable binary stream, or a filesystem path.
+
+        Yields
+        ------
+        list of dict
+            The paragraphs :meth:`load_pdf` would return for the page, before
+            links are assigned.
+
+        Notes
+        -----
+        This is the cheap survey pass for document-wide statistics; one page is
+        parsed at a time and released before the next.
+        """
+
+        pdf_input = self._prepare_pdf_source(pdf_source)[0]
+        with pdfplumber.open(pdf_input) as pdf:
+            for page in pdf.pages:
+                paragraphs = self._group_paragraphs(self._text_lines(page))
+                _close_page(page)
+                yield paragraphs
+
+    def iter_pages(
+        self, pdf_source: Any, extract_tables: bool = True
+    ) -> Iterator[dict[str, Any]]:
+        """Yield the pages of :meth:`load_pdf` one at a time with their tables.
+
+        Parameters
+        ----------
+        pdf_source
+            PDF bytes, a readable binary stream, or a filesystem path.
+        extract_tables
+            Whether to retain non-empty tables from each page.
+
+        Yields
+        ------
+        dict
+            One entry of :meth:`load_pdf`'s ``pages`` with an added ``tables``
+            list holding that page's entries of the document ``tables``.
+
+        Notes
+        -----
+        Links are assigned across pages in page order, as :meth:`load_pdf` does.
+        With a worker pool, at most ``page_workers * min_pages_per_worker`` pages
+        are extracted ahead of the consumer.
+        """
+
+        globally_assigned_links: set[str] = set()
+        for page_index, page in enumerate(
+            self._iter_page_contents(pdf_source, extract_tables)
+        ):
+            page_data, tables = self._page_record(
+                page_index + 1, page, globally_assigned_links
+            )
+            page_data["tables"] = tables
+            yield page_data
+
+    def _iter_page_contents(
+        self, pdf_source: Any, extract_tables: bool
+    ) -> Iterator[_PageContent]:
+        pdf_input = self._prepare_pdf_source(pdf_source)[0]
+        with pdfplumber.open(pdf_input) as pdf:
+            page_count = len(pdf.pages)
+            workers = self._worker_count(page_count)
+            if workers == 1:
+                for page in pdf.pages:
+                    yield self._extract_page(page, extract_tables=extract_tables)
+                return
+        source = (
+            pdf_input.getvalue() if isinstance(pdf_input, io.BytesIO) else pdf_input
+        )
+        batch_size = workers * self.min_pages_per_worker
+        for start in range(0, page_count, batch_size):
+            yield from self._extract_in_pool(
+                source,
+                start,
+                min(start + batch_size, page_count),
+                workers,
+                extract_tables,
+            )
+
+
+def _close_page(page: Any) -> None:
+    close = getattr(page, "close", None)
+    if close is not None:
+        # Drops the parsed layout objects that pdfplumber caches per page.
+        close()
+
+
+def _character_values(
+    characters: list[dict[str, Any]], key: str
+) -> NDArray[np.float64]:
+    return np.fromiter(
+        map(itemgetter(key), characters), dtype=np.float64, count=len(characters)
+    )
+
+
+def _extract_page_range(
+    source: bytes | str, start: int, stop: int, extract_tables: bool
+) -> list[_PageContent]:
+    # Runs in a pool worker, which opens the PDF once for its page range.
+    pdf_input = io.BytesIO(source) if isinstance(source, bytes) else source
+    loader = UniversalPDFLoader()
+    with pdfplumber.open(pdf_input) as pdf:
+        return [
+            loader._extract_page(page, extract_tables=extract_tables)
+            for page in pdf.pages[start:stop]
+        ]
@@ -7,9 +7,14 @@ Normalize and enrich extracted PDF structure for deterministic chunking.
 Responsibilities:
   - Classify headings, captions, pseudo-tables, headers, and footers.
   - Enrich the stable document metadata consumed by chunking.
+  - Cluster repeated headers and footers without rescoring repeated texts or
+    pairs that cheap similarity bounds already reject.
+  - Classify pages one at a time once a survey has fixed document statistics.
 
 Design principles:
   - Apply deterministic classifiers in one documented mutation sequence.
+  - Keep every step after the survey local to one page, so whole documents and
+    streamed pages are classified identically.
   - Mutate only the caller-supplied loader mapping.
 
 Boundaries:
@@ -21,6 +26,7 @@ Boundaries:
 from __future__ import annotations
 
 from collections import Counter
+from collections.abc import Iterable
 from difflib import SequenceMatcher
 import math
 import re
@@ -29,6 +35,17 @@ from typing import Any
 __all__ = ["PdfPreprocessor"]
 
 
+# Paragraphs above or below these y positions may be page headers or footers.
+_HEADER_THRESHOLD = 100
+_FOOTER_THRESHOLD = 700
+_REMOVED_KEYS = (
+    "removed_headers_candidates",
+    "removed_footers_candidates",
+    "removed_headers_fallback",
+    "removed_footers_fallback",
+)
+
+
 class PdfPreprocessor:
     """Enrich the structured output produced by ``UniversalPDFLoader``.
 
@@ -41,6 +58,10 @@ class PdfPreprocessor:
     -----
     Classifiers run in a fixed order and mutate the supplied mapping so chunking
     remains deterministic without copying a potentially large PDF representation.
+    One survey of every paragraph fixes the document-wide font statistics, title,
+    heading sizes, and repeated headers and footers; every later step is local
+    to one page, which lets :meth:`from_page_paragraphs` and
+    :meth:`preprocess_page` process a document whose pages arrive one at a time.
     """
 
     def __init__(self, json_data: dict[str, Any]) -> None:
@@ -52,6 +73,42 @@ class PdfPreprocessor:
         self.font_stats: dict[float, int] = {}
         self.main_font_size: float | None = None
         self.header_footer_candidate_sizes: set[float] = set()
+        self._size_to_level: dict[float, int] = {}
+        self._header_paras_flat: set[str] = set()
+        self._footer_paras_flat: set[str] = set()
+        self._fallback_header_needed = False
+        self._fallback_footer_needed = False
+
+    @classmethod
+    def from_page_paragraphs(
+        cls,
+        metadata: dict[str, Any],
+        page_paragraphs: Iterable[list[dict[str, Any]]],
+    ) -> PdfPreprocessor:
+        """Survey a document from one pass over its pages' paragraphs.
+
+        Parameters
+        ----------
+        metadata
+            Caller-owned loader metadata to enrich in place.
+        page_paragraphs
+            Each page's loader paragraphs, in page order.
+
+        Returns
+        -------
+        PdfPreprocessor
+            Preprocessor whose :meth:`preprocess_page` classifies pages exactly
+            as :meth:`run_preprocessing` would.
+
+        Notes
+        -----
+        Only font counters, the title, candidate heading sizes, and the
+        paragraphs in each page's header and footer bands are retained.
+        """
+
+        preprocessor = cls({"metadata": metadata, "pages": []})
+        preprocessor._survey(page_paragraphs)
+        return preprocessor
 
     def run_preprocessing(self) -> tuple[dict[str, Any], dict[str, Any]]:
         """Run all structural classifiers in their required order.
@@ -62,46 +119,114 @@ class PdfPreprocessor:
             The enriched document and a summary of removed headers and footers.
         """
 
-        self._analyze_font_sizes()
-        self._extract_title()
-        removed_info = self._detect_and_remove_headers_footers()
-        self._detect_headings()
-        self._detect_table_and_image_captions()
-        self._detect_pseudo_tables()
+        pages = self.json_data.get("pages", [])
+        removed_info = self._survey(page.get("paragraphs", []) for page in pages)
+        headings: list[dict[str, Any]] = []
+        for page in pages:
+            self._preprocess_page(page, removed_info, headings)
+        self.json_data.setdefault("metadata", {})
+        self.json_data["metadata"]["headings"] = headings
         self.process_and_save_metadata()
         return self.json_data, removed_info
 
+    def preprocess_page(self, page: dict[str, Any]) -> dict[str, Any]:
+        """Classify one page of a document surveyed by :meth:`from_page_paragraphs`.
+
+        Parameters
+        ----------
+        page
+            Caller-owned loader page to enrich in place.
+
+        Returns
+        -------
+        dict
+            The same page with headers and footers removed and its paragraphs
+            classified.
+
+        Notes
+        -----
+        Document-level collections that :meth:`run_preprocessing` adds to the
+        metadata, such as headings, captions, and pseudo-tables, are not built.
+        """
+
+        self._preprocess_page(page, self._removal_summary(), [])
+        return page
+
     def _collect_paragraphs(self):
         paragraphs = []
         for page in self.json_data.get("pages", []):
             paragraphs.extend(page.get("paragraphs", []))
         return paragraphs
 
-    def _extract_title(self):
-        if not self.paragraphs:
-            return None
-        max_para = max(self.paragraphs, key=lambda para: para.get("font_size", 0))
-        title_candidate = max_para.get("text", "").strip()
-        if title_candidate:
-            self.title = title_candidate
-            self.json_data.setdefault("metadata", {})
-            self.json_data["metadata"]["document_title"] = self.title
-            return self.title
-        else:
-            return None
+    def _removal_summary(self) -> dict[str, list[str]]:
+        if self.main_font_size is None:
+            return {}
+        return {key: [] for key in _REMOVED_KEYS}
 
-    def _analyze_font_sizes(self):
+    def _survey(
+        self,
+        page_paragraphs: Iterable[list[dict[str, Any]]],
+        epsilon=0.1,
+        min_length=4,
+    ) -> dict[str, list[str]]:
         font_counter: Counter[float] = Counter()
         font_character_counter: Counter[float] = Counter()
-        for para in self.paragraphs:
-            size = para.get("font_size", None)
-            if size is not None:
-                rounded_size = round(size, 2)
-                font_counter[rounded_size] += 1
-                font_character_counter[rounded_size] += max(
-                    1, len(para.get("text", "").strip())
+        title_paragraph: dict[str, Any] | None = None
+        heading_candidate_sizes = set()
+        bands: list[tuple[list[dict[str, Any]], list[dict[str, Any]]]] = []
+
+        for paragraphs in page_paragraphs:
+            for para in paragraphs:
+                size = para.get("font_size", None)
+                if size is not None:
+                    rounded_size = round(size, 2)
+                    font_counter[rounded_size] += 1
+                    font_character_counter[rounded_size] += max(
+                        1, len(para.get("text", "").strip())
+                    )
+                # Keeps the first paragraph of the largest size, as max() would.
+                if title_paragraph is None or para.get(
+                    "font_size", 0
+                ) > title_paragraph.get("font_size", 0):
+                    title_paragraph = para
+                text = para.get("text", "").strip()
+                if len(text) >= min_length and not self._is_list_marker(text):
+                    heading_candidate_sizes.add(para.get("font_size", 0))
+            bands.append(
+                (
+                    [p for p in paragraphs if p["y_position"] < _HEADER_THRESHOLD],
+                    [p for p in paragraphs if p["y_position"] > _FOOTER_THRESHOLD],
                 )
+            )
 
+        self._set_font_statistics(font_counter, font_character_counter)
+        if title_paragraph is not None:
+            self._set_title(title_paragraph.get("text", "").strip())
+        if self.main_font_size is None:
+            return {}
+        heading_sizes = {
+            round(size, 2)
+            for size in heading_candidate_sizes
+            if size > self.main_font_size + epsilon
+        }
+        self._size_to_level = {
+            size: idx + 1
+            for idx, size in enumerate(sorted(heading_sizes, reverse=True))
+        }
+        self._recognize_headers_footers(bands)
+        return self._removal_summary()
+
+    def _set_title(self, title_candidate: str) -> None:
+        if title_candidate:
+            self.title = title_candidate
+            self.json_data.setdefault("metadata", {})
+            self.json_data["metadata"]["document_title"] = self.title
+
+    def _set_font_statistics(
+        self,
+        font_counter: Counter[float],
+        font_character_counter: Counter[float],
+    ) -> None:
         font_stats = dict(font_counter)
         main_font_size = None
         if font_character_counter:
@@ -139,117 +264,88 @@ class PdfPreprocessor:
             self.header_footer_candidate_sizes
         )
 
-    def _detect_headings(self, epsilon=0.1, min_length=4):
-        if self.main_font_size is None:
-
-            for page in self.json_data.get("pages", []):
-                for para in page.get("paragraphs", []):
-                    para["heading_level"] = 0
-                    para["is_type"] = "normal"
-            self.json_data.setdefault("metadata", {})
-            self.json_data["metadata"]["headings"] = []
-            return []
-
-        heading_sizes = set()
-
-        for para in self.paragraphs:
-            size = para.get("font_size", 0)
-            text = para.get("text", "").strip()
-
-            if size <= self.main_font_size + epsilon:
-                continue
-
-            if len(text) < min_length:
-                continue
-
-            if re.fullmatch(r"[\d]+[.)]?", text) or text in ["-", "•", "●"]:
-                continue
-
-            heading_sizes.add(round(size, 2))
-
-        sorted_sizes = sorted(heading_sizes, reverse=True)
+    @staticmethod
+    def _is_list_marker(text: str) -> bool:
+        return bool(re.fullmatch(r"[\d]+[.)]?", text)) or text in ["-", "•", "●"]
 
-        size_to_level = {size: idx + 1 for idx, size in enumerate(sorted_sizes)}
-
-        headings = []
-
-        for page in self.json_data.get("pages", []):
-            page_num = page.get("page", None)
+    def _preprocess_page(
+        self,
+        page: dict[str, Any],
+        removed_info: dict[str, list[str]],
+        headings: list[dict[str, Any]],
+    ) -> None:
+        if self.main_font_size is not None:
+            self._remove_headers_footers(page, removed_info)
+        self._detect_headings(page, headings)
+        self._detect_table_and_image_captions(page)
+        self._detect_pseudo_tables(page)
+
+    def _detect_headings(self, page, headings, epsilon=0.1, min_length=4):
+        if self.main_font_size is None:
             for para in page.get("paragraphs", []):
-                size = round(para.get("font_size", 0), 2)
-                text = para.get("text", "").strip()
+                para["heading_level"] = 0
+                para["is_type"] = "normal"
+            return
 
-                level = None
-
-                if size > self.main_font_size + epsilon:
-                    if len(text) >= min_length and not (
-                        re.fullmatch(r"[\d]+[.)]?", text) or text in ["-", "•", "●"]
-                    ):
-                        level = size_to_level.get(size, None)
-                        if level is None:
-                            level = 1
-                        para["heading_level"] = level
-                        para["is_type"] = "heading"
-
-                        heading = {
-                            "text": text,
-                            "level": level,
-                            "font_size": size,
-                            "page": page_num,
-                        }
-                        headings.append(heading)
-                        continue
-                    else:
-                        level = 0
-                        para["is_type"] = "normal"
-
-                elif abs(size - self.main_font_size) <= epsilon:
-                    level = 0
-                    para["is_type"] = "normal"
-
-                elif size < self.main_font_size - epsilon:
-                    level = -1
-                    para["is_type"] = "normal"
+        page_num = page.get("page", None)
+        for para in page.get("paragraphs", []):
+            size = round(para.get("font_size", 0), 2)
+            text = para.get("text", "").strip()
 
+            level = None
+
+            if size > self.main_font_size + epsilon:
+                if len(text) >= min_length and not self._is_list_marker(text):
+                    level = self._size_to_level.get(size, None)
+                    if level is None:
+                        level = 1
+                    para["heading_level"] = level
+                    para["is_type"] = "heading"
+
+                    heading = {
+                        "text": text,
+                        "level": level,
+                        "font_size": size,
+                        "page": page_num,
+                    }
+                    headings.append(heading)
+                    continue
                 else:
                     level = 0
                     para["is_type"] = "normal"
 
-                para["heading_level"] = level
+            elif abs(size - self.main_font_size) <= epsilon:
+                level = 0
+                para["is_type"] = "normal"
 
-        self.json_data.setdefault("metadata", {})
-        self.json_data["metadata"]["headings"] = headings
+            elif size < self.main_font_size - epsilon:
+                level = -1
+                para["is_type"] = "normal"
+
+            else:
+                level = 0
+                para["is_type"] = "normal"
 
-        return headings
+            para["heading_level"] = level
 
-    def _detect_and_remove_headers_footers(
+    def _recognize_headers_footers(
         self,
-        header_threshold=100,
-        footer_threshold=700,
+        bands,
         similarity_threshold=0.9,
         occurrence_ratio=0.5,
         merge_threshold_factor=2,
-        short_text_len=10,
     ):
-        if self.main_font_size is None:
-            return {}
-
         all_header_texts = []
         all_footer_texts = []
         header_text_map: dict[str, list[str]] = {}
         footer_text_map: dict[str, list[str]] = {}
 
-        for page in self.json_data.get("pages", []):
-            paras = page.get("paragraphs", [])
-
+        for header_band, footer_band in bands:
             header_candidates, _ = self._detect_candidates(
-                [p for p in paras if p["y_position"] < header_threshold],
-                merge_threshold_factor,
+                header_band, merge_threshold_factor
             )
             footer_candidates, _ = self._detect_candidates(
-                list(
-                    reversed([p for p in paras if p["y_position"] > footer_threshold])
-                ),
+                list(reversed(footer_band)),
                 merge_threshold_factor,
                 reverse=True,
             )
@@ -269,97 +365,104 @@ class PdfPreprocessor:
             if combined_footer:
                 footer_text_map.setdefault(combined_footer, []).extend(footer_texts)
 
+        # Flattening below repeats the clustering comparisons, so share results.
+        similar_pairs: dict[tuple[str, str], bool] = {}
         recognized_headers = self._cluster_repeated_texts(
-            all_header_texts, similarity_threshold, occurrence_ratio
+            all_header_texts, similarity_threshold, occurrence_ratio, similar_pairs
         )
         recognized_footers = self._cluster_repeated_texts(
-            all_footer_texts, similarity_threshold, occurrence_ratio
+            all_footer_texts, similarity_threshold, occurrence_ratio, similar_pairs
         )
 
-        removed_headers_candidates = []
-        removed_footers_candidates = []
-        removed_headers_fallback = []
-        removed_footers_fallback = []
-
+        header_matchers = [
+            SequenceMatcher(None, "", recognized) for recognized in recognized_headers
+        ]
         header_paras_flat = set()
         for combined_text, para_list in header_text_map.items():
             if any(
-                self._similarity(combined_text, recognized) >= similarity_threshold
-                for recognized in recognized_headers
+                self._is_similar(
+                    combined_text, matcher, similarity_threshold, similar_pairs
+                )
+                for matcher in header_matchers
             ):
                 header_paras_flat.update(para_list)
 
+        footer_matchers = [
+            SequenceMatcher(None, "", recognized) for recognized in recognized_footers
+        ]
         footer_paras_flat = set()
         for combined_text, para_list in footer_text_map.items():
             if any(
-                self._similarity(combined_text, recognized) >= similarity_threshold
-                for recognized in recognized_footers
+                self._is_similar(
+                    combined_text, matcher, similarity_threshold, similar_pairs
+                )
+                for matcher in footer_matchers
             ):
                 footer_paras_flat.update(para_list)
 
-        for page in self.json_data.get("pages", []):
-            new_paragraphs = []
-            paras = page.get("paragraphs", [])
-
-            for para in paras:
-                text = para.get("text", "").strip()
+        self._header_paras_flat = header_paras_flat
+        self._footer_paras_flat = footer_paras_flat
+        self._fallback_header_needed = len(recognized_headers) == 0
+        self._fallback_footer_needed = len(recognized_footers) == 0
 
-                if text in header_paras_flat:
-                    removed_headers_candidates.append(text)
-                    continue
-                if text in footer_paras_flat:
-                    removed_footers_candidates.append(text)
-                    continue
+        self.json_data["metadata"]["recognized_headers"] = recognized_headers
+        self.json_data["metadata"]["recognized_footers"] = recognized_footers
 
-                new_paragraphs.append(para)
+    def _remove_headers_footers(
+        self,
+        page,
+        removed_info,
+        header_threshold=_HEADER_THRESHOLD,
+        footer_threshold=_FOOTER_THRESHOLD,
+        short_text_len=10,
+    ):
+        new_paragraphs = []
+        for para in page.get("paragraphs", []):
+            text = para.get("text", "").strip()
 
-            page["paragraphs"] = new_paragraphs
+            if text in self._header_paras_flat:
+                removed_info["removed_headers_candidates"].append(text)
+                continue
+            if text in self._footer_paras_flat:
+                removed_info["removed_footers_candidates"].append(text)
+                continue
 
-        fallback_header_needed = len(recognized_headers) == 0
-        fallback_footer_needed = len(recognized_footers) == 0
+            new_paragraphs.append(para)
 
-        if fallback_header_needed or fallback_footer_needed:
-            for page in self.json_data.get("pages", []):
-                paras = page["paragraphs"]
-                remaining_paragraphs = []
-                for para in paras:
-                    text = para.get("text", "").strip()
-                    size = para.get("font_size", 0)
-                    y_pos = para.get("y_position", 0)
+        page["paragraphs"] = new_paragraphs
 
-                    if size == self.main_font_size:
-                        remaining_paragraphs.append(para)
-                        continue
+        if not (self._fallback_header_needed or self._fallback_footer_needed):
+            return
 
-                    if (
-                        fallback_header_needed
-                        and y_pos < header_threshold
-                        and len(text) <= short_text_len
-                    ):
-                        removed_headers_fallback.append(text)
-                        continue
+        remaining_paragraphs = []
+        for para in page["paragraphs"]:
+            text = para.get("text", "").strip()
+            size = para.get("font_size", 0)
+            y_pos = para.get("y_position", 0)
 
-                    if (
-                        fallback_footer_needed
-                        and y_pos > footer_threshold
-                        and len(text) <= short_text_len
-                    ):
-                        removed_footers_fallback.append(text)
-                        continue
+            if size == self.main_font_size:
+                remaining_paragraphs.append(para)
+                continue
 
-                    remaining_paragraphs.append(para)
+            if (
+                self._fallback_header_needed
+                and y_pos < header_threshold
+                and len(text) <= short_text_len
+            ):
+                removed_info["removed_headers_fallback"].append(text)
+                continue
 
-                page["paragraphs"] = remaining_paragraphs
+            if (
+                self._fallback_footer_needed
+                and y_pos > footer_threshold
+                and len(text) <= short_text_len
+            ):
+                removed_info["removed_footers_fallback"].append(text)
+                continue
 
-        self.json_data["metadata"]["recognized_headers"] = recognized_headers
-        self.json_data["metadata"]["recognized_footers"] = recognized_footers
+            remaining_paragraphs.append(para)
 
-        return {
-            "removed_headers_candidates": removed_headers_candidates,
-            "removed_footers_candidates": removed_footers_candidates,
-            "removed_headers_fallback": removed_headers_fallback,
-            "removed_footers_fallback": removed_footers_fallback,
-        }
+        page["paragraphs"] = remaining_paragraphs
 
     def _detect_candidates(self, paragraphs, merge_threshold_factor, reverse=False):
         candidates = []
@@ -396,26 +499,40 @@ class PdfPreprocessor:
         return candidates, remaining
 
     def _cluster_repeated_texts(
-        self, text_list, similarity_threshold, occurrence_ratio
+        self, text_list, similarity_threshold, occurrence_ratio, similar_pairs=None
     ):
+        if similar_pairs is None:
+            similar_pairs = {}
         clusters: list[str] = []
         cluster_counts: list[int] = []
+        cluster_matchers: list[SequenceMatcher] = []
+        # Clusters are only appended, so a repeated text always joins the
+        # cluster its first occurrence joined or founded.
+        cluster_of_text: dict[str, int] = {}
 
         for text in text_list:
             if not text:
                 continue
 
-            matched = False
-            for idx, cluster_text in enumerate(clusters):
-                sim = self._similarity(text, cluster_text)
-                if sim >= similarity_threshold:
-                    cluster_counts[idx] += 1
-                    matched = True
-                    break
-
-            if not matched:
+            idx = cluster_of_text.get(text)
+            if idx is None:
+                idx = next(
+                    (
+                        candidate
+                        for candidate, matcher in enumerate(cluster_matchers)
+                        if self._is_similar(
+                            text, matcher, similarity_threshold, similar_pairs
+                        )
+                    ),
+                    None,
+                )
+            if idx is None:
+                idx = len(clusters)
                 clusters.append(text)
-                cluster_counts.append(1)
+                cluster_counts.append(0)
+                cluster_matchers.append(SequenceMatcher(None, "", text))
+            cluster_of_text[text] = idx
+            cluster_counts[idx] += 1
 
         min_occurrences = max(2, math.ceil(len(text_list) * occurrence_ratio))
         recognized = [
@@ -429,6 +546,23 @@ class PdfPreprocessor:
     def _similarity(self, a, b):
         return SequenceMatcher(None, a, b).ratio()
 
+    @staticmethod
+    def _is_similar(text, matcher, similarity_threshold, similar_pairs):
+        # Equivalent to _similarity(text, matcher.b) >= similarity_threshold.
+        # The matcher caches its analysis of the cluster text, and the cheap
+        # upper bounds reject most pairs before the full ratio is computed.
+        key = (text, matcher.b)
+        similar = similar_pairs.get(key)
+        if similar is None:
+            matcher.set_seq1(text)
+            similar = (
+                matcher.real_quick_ratio() >= similarity_threshold
+                and matcher.quick_ratio() >= similarity_threshold
+                and matcher.ratio() >= similarity_threshold
+            )
+            similar_pairs[key] = similar
+        return similar
+
     def get_metadata(self) -> dict[str, Any]:
         """Return the current document metadata mapping.
 
@@ -440,93 +574,54 @@ class PdfPreprocessor:
 
         return self.json_data.get("metadata", {})
 
-    def _detect_table_and_image_captions(self, merge_threshold_factor=2):
-        for page in self.json_data.get("pages", []):
-            paras = page.get("paragraphs", [])
-            last_para = None
-
-            for para in paras:
-                if para["heading_level"] > 0:
-                    last_para = para
-                    continue
+    def _detect_table_and_image_captions(self, page, merge_threshold_factor=2):
+        last_para = None
 
-                if last_para:
-                    y_distance = abs(para["y_position"] - last_para["y_position"])
+        for para in page.get("paragraphs", []):
+            if para["heading_level"] > 0:
+                last_para = para
+                continue
 
-                    if (
-                        y_distance > (last_para["font_size"] * merge_threshold_factor)
-                        and para["heading_level"] < 0
-                    ):
-                        para["is_type"] = "caption"
-                    else:
-                        para["is_type"] = "normal"
+            if last_para:
+                y_distance = abs(para["y_position"] - last_para["y_position"])
 
+                if (
+                    y_distance > (last_para["font_size"] * merge_threshold_factor)
+                    and para["heading_level"] < 0
+                ):
+                    para["is_type"] = "caption"
                 else:
                     para["is_type"] = "normal"
 
-                last_para = para
-
-        return self.json_data
-
-    def _detect_pseudo_tables(self, look_ahead=3):
-        pseudo_tables_per_page = []
-
-        for page in self.json_data.get("pages", []):
-            paragraphs = page.get("paragraphs", [])
-            in_pseudo_table = False
-            non_matching_count = 0
-
-            for para in paragraphs:
-                text = para.get("text", "").strip()
-
-                if para.get("is_type") == "caption":
-                    continue
+            else:
+                para["is_type"] = "normal"
 
-                match = re.match(r".+\.\s*\.\s*\.\s*\.\s*.*", text)
+            last_para = para
 
-                if match:
+    def _detect_pseudo_tables(self, page, look_ahead=3):
+        in_pseudo_table = False
+        non_matching_count = 0
 
-                    para["text"] = re.sub(r"(\.)(\s*\.){2,}", "\t", text)
-                    para["is_type"] = "pseudo_table"
-                    in_pseudo_table = True
-                    non_matching_count = 0
+        for para in page.get("paragraphs", []):
+            text = para.get("text", "").strip()
 
-                elif in_pseudo_table:
-                    non_matching_count += 1
-                    if non_matching_count > look_ahead:
-                        break
-                    para["is_type"] = "pseudo_table"
+            if para.get("is_type") == "caption":
+                continue
 
-            if in_pseudo_table:
+            match = re.match(r".+\.\s*\.\s*\.\s*\.\s*.*", text)
 
-                unique_heading_levels = sorted(
-                    {
-                        para["heading_level"]
-                        for para in paragraphs
-                        if para.get("is_type") == "pseudo_table"
-                    }
-                )
-                unique_pages = sorted(
-                    {
-                        page["page"]
-                        for para in paragraphs
-                        if para.get("is_type") == "pseudo_table"
-                    }
-                )
+            if match:
 
-                pseudo_tables_per_page.append(
-                    {
-                        "pseudo_table": [
-                            para
-                            for para in paragraphs
-                            if para["is_type"] == "pseudo_table"
-                        ],
-                        "heading_levels": unique_heading_levels,
-                        "pages": unique_pages,
-                    }
-                )
+                para["text"] = re.sub(r"(\.)(\s*\.){2,}", "\t", text)
+                para["is_type"] = "pseudo_table"
+                in_pseudo_table = True
+                non_matching_count = 0
 
-        return pseudo_tables_per_page
+            elif in_pseudo_table:
+                non_matching_count += 1
+                if non_matching_count > look_ahead:
+                    break
+                para["is_type"] = "pseudo_table"
 
     def process_and_save_metadata(self) -> dict[str, Any]:
         """Consolidate detected tables and captions into document metadata.
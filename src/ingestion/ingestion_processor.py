@@ -6,6 +6,8 @@ Coordinate PDF ingestion from uploaded bytes without shared files.
 
 Responsibilities:
   - Run loading, preprocessing, chunking, embedding, and optional indexing.
+  - Stream long documents page by page after a survey pass, and embed and
+    index chunks in fixed-size windows as the chunker produces them.
   - Verify content-derived document identities across the pipeline.
   - Translate unexpected parser failures into UI-safe project errors.
 
@@ -22,8 +24,13 @@ Boundaries:
 from __future__ import annotations
 
 import hashlib
-from dataclasses import dataclass
-from typing import Any, Callable, Protocol
+import os
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Protocol, runtime_checkable
+
+import numpy as np
+from numpy.typing import NDArray
 
 from src import embeddings, vectorstore
 
@@ -32,12 +39,17 @@ from . import ingestion_loader as loader_module
 from . import ingestion_preprocessing as preprocessing
 
 __all__ = [
+    "PREPARATION_PIPELINE_VERSION",
     "DocumentProcessingError",
     "DocumentProcessor",
     "PreparedDocument",
     "ProcessingResult",
 ]
 
+# Bump whenever loading, preprocessing, or chunking changes prepared output, so
+# persisted preparations from older code are no longer served.
+PREPARATION_PIPELINE_VERSION = 1
+
 
 class DocumentProcessingError(RuntimeError):
     """Represent a document-processing failure safe for the UI boundary."""
@@ -59,6 +71,33 @@ class _PDFLoader(Protocol):
         ...
 
 
+@runtime_checkable
+class _PageStreamingPDFLoader(_PDFLoader, Protocol):
+    """Describe the page-at-a-time loading used for long documents."""
+
+    def count_pages(self, content: bytes, /) -> int:
+        """Return the page count without extracting pages."""
+
+        ...
+
+    def load_metadata(self, content: bytes, /, *, file_name: str) -> dict[str, Any]:
+        """Load the document metadata of ``load_pdf``."""
+
+        ...
+
+    def iter_page_paragraphs(self, content: bytes, /) -> Iterator[list[dict]]:
+        """Yield each page's paragraphs for the preprocessing survey."""
+
+        ...
+
+    def iter_pages(
+        self, content: bytes, /, *, extract_tables: bool = True
+    ) -> Iterator[dict[str, Any]]:
+        """Yield the pages of ``load_pdf`` one at a time with their tables."""
+
+        ...
+
+
 @dataclass(frozen=True)
 class ProcessingResult:
     """Summarize one successfully prepared immutable document result.
@@ -80,18 +119,99 @@ class ProcessingResult:
 
 @dataclass(frozen=True)
 class PreparedDocument:
-    """Hold an immutable prepared result and its canonical embedded chunks.
+    """Hold an immutable prepared result, its chunk records, and their vectors.
 
     Parameters
     ----------
     result
         Public processing summary for the document.
-    embedded_chunks
-        Ordered tuple ready for insertion into a compatible vector store.
+    records
+        Ordered canonical chunks without ``embedding`` values; stored as
+        read-only :mod:`vectorstore.records` views.
+    vectors
+        ``(len(records), dimension)`` matrix whose row ``i`` embeds
+        ``records[i]``; stored as a read-only C-contiguous ``float32`` array.
+
+    Raises
+    ------
+    ValueError
+        If ``vectors`` is not a two-dimensional matrix with one row per record.
+
+    Notes
+    -----
+    Vectors are kept as one matrix rather than per-chunk float lists, so a
+    cached preparation costs four bytes per vector component and is indexed
+    through ``VectorStore.add_vectors`` without conversion. Records are frozen
+    because one preparation is shared by every session that uploads its bytes.
     """
 
     result: ProcessingResult
-    embedded_chunks: tuple[dict[str, Any], ...]
+    records: tuple[dict[str, Any], ...]
+    vectors: NDArray[np.float32]
+
+    def __post_init__(self) -> None:
+        vectors = np.ascontiguousarray(self.vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(self.records):
+            raise ValueError("vectors must hold exactly one row per record")
+        # A view keeps the caller's array writable while this one is frozen.
+        vectors = vectors.view()
+        vectors.setflags(write=False)
+        object.__setattr__(self, "vectors", vectors)
+        object.__setattr__(
+            self,
+            "records",
+            tuple(vectorstore.records.freeze(record) for record in self.records),
+        )
+
+    def renamed(self, file_name: str) -> PreparedDocument:
+        """Return this preparation attributed to another upload's file name.
+
+        Parameters
+        ----------
+        file_name
+            Name under which the same bytes were uploaded again.
+
+        Returns
+        -------
+        PreparedDocument
+            ``self`` when the name is unchanged; otherwise a copy whose result
+            and records name ``file_name`` and which shares the same vectors.
+
+        Notes
+        -----
+        Every record carries the upload's base name in ``file_name``, and the
+        chunker falls back to it for ``document_title`` when the PDF has no
+        title; both are rewritten. Texts and vectors do not depend on the name.
+        """
+
+        if file_name == self.result.file_name:
+            return self
+        base_name = os.path.basename(file_name)
+        records = []
+        for record in self.records:
+            metadata = record["metadata"]
+            previous_name = metadata.get("file_name")
+            changes = {"file_name": base_name}
+            if (
+                isinstance(previous_name, str)
+                and metadata.get("document_title") == previous_name.strip()
+            ):
+                changes["document_title"] = base_name.strip() or "Untitled document"
+            records.append({**record, "metadata": {**metadata, **changes}})
+        return PreparedDocument(
+            result=replace(self.result, file_name=file_name),
+            records=tuple(records),
+            vectors=self.vectors,
+        )
+
+    @property
+    def embedded_chunks(self) -> tuple[dict[str, Any], ...]:
+        """Return canonical embedded chunks with list-valued embeddings."""
+
+        return tuple(
+            {**record, "embedding": vector}
+            for record, vector in zip(self.records, self.vectors.tolist(), strict=True)
+        )
 
 
 class DocumentProcessor:
@@ -109,24 +229,67 @@ class DocumentProcessor:
         Optional deterministic chunker.
     preprocessor_factory
         Factory binding one loader mapping to structural preprocessing.
+    embedding_window_size
+        Positive number of chunks built, embedded, and indexed at a time.
+    stream_min_pages
+        Page count from which documents are loaded and preprocessed one page at
+        a time, or ``None`` to always load whole documents.
+
+    Raises
+    ------
+    ValueError
+        If ``embedding_window_size`` or ``stream_min_pages`` is not a positive
+        integer.
+
+    Notes
+    -----
+    A document with at least ``stream_min_pages`` pages is read twice when the
+    loader and preprocessor support it: a survey of paragraphs only fixes the
+    font statistics, title, and repeated headers and footers, then each page is
+    extracted, classified, and chunked before the next is read. Windows of
+    ``embedding_window_size`` chunks are embedded as they fill, and
+    ``process_bytes`` indexes each window before the next is built, so working
+    memory is bounded by one page and one window rather than by the document.
+    Both passes parse every page, so the survey costs two thirds to nearly all
+    of a full load, and a page worker pool speeds up only the second pass;
+    shorter documents are therefore loaded whole.
+
+    ``prepare_bytes`` still returns every record and the full vector matrix,
+    because a prepared document is what the session cache shares.
     """
 
     def __init__(
         self,
         *,
-        faiss_store: vectorstore.faiss.FAISSStore,
+        faiss_store: vectorstore.contracts.VectorStore,
         embedding_provider: embeddings.contracts.EmbeddingProvider,
         loader: _PDFLoader | None = None,
         chunker_instance: chunker.PDFChunker | None = None,
         preprocessor_factory: Callable[[dict], Any] = preprocessing.PdfPreprocessor,
+        embedding_window_size: int = 256,
+        stream_min_pages: int | None = 100,
     ) -> None:
         """Create the ingestion coordinator from injectable domain components."""
 
+        if (
+            isinstance(embedding_window_size, bool)
+            or not isinstance(embedding_window_size, int)
+            or embedding_window_size <= 0
+        ):
+            raise ValueError("embedding_window_size must be a positive integer")
+        if stream_min_pages is not None and (
+            isinstance(stream_min_pages, bool)
+            or not isinstance(stream_min_pages, int)
+            or stream_min_pages <= 0
+        ):
+            raise ValueError("stream_min_pages must be a positive integer or None")
         self.loader = loader or loader_module.UniversalPDFLoader()
         self.chunker = chunker_instance or chunker.PDFChunker()
         self.embedding_provider = embedding_provider
         self.faiss_store = faiss_store
         self.preprocessor_factory = preprocessor_factory
+        self.embedding_window_size = embedding_window_size
+        self.stream_min_pages = stream_min_pages
 
     def process_upload(self, uploaded_file: Any) -> ProcessingResult:
         """Process a Streamlit-like upload object directly from memory.
@@ -163,7 +326,7 @@ class DocumentProcessor:
         return self.process_bytes(bytes(content), file_name=file_name)
 
     def process_bytes(self, content: bytes, *, file_name: str) -> ProcessingResult:
-        """Prepare bytes and immediately add their chunks to the target store.
+        """Prepare bytes and add their chunks to the target store window by window.
 
         Parameters
         ----------
@@ -181,13 +344,43 @@ class DocumentProcessor:
         ------
         DocumentProcessingError
             If document preparation fails.
+        embeddings.contracts.EmbeddingError
+            If embedding fails or returns unusable vectors.
         vectorstore.faiss.FAISSStoreError
             If the prepared chunks cannot be indexed or persisted.
+
+        Notes
+        -----
+        Each embedded window is added before the next is built. If a later
+        window fails, the windows already added are removed again. A
+        ``vectorstore.segments.SegmentStore`` keys immutable segments on whole
+        documents, so it receives the prepared document in one call.
         """
 
-        prepared = self.prepare_bytes(content, file_name=file_name)
-        self.faiss_store.add_embedded_chunks(prepared.embedded_chunks)
-        return prepared.result
+        if isinstance(self.faiss_store, vectorstore.segments.SegmentStore):
+            prepared = self.prepare_bytes(content, file_name=file_name)
+            self.faiss_store.add_vectors(prepared.vectors, prepared.records)
+            return prepared.result
+
+        document_id = self._document_id(content, file_name)
+        chunk_count = 0
+        try:
+            for records, vectors in self._embedded_windows(
+                content, file_name, document_id
+            ):
+                self.faiss_store.add_vectors(vectors, records)
+                chunk_count += len(records)
+        except BaseException:
+            if chunk_count:
+                self.faiss_store.remove_document(document_id)
+            raise
+        if not chunk_count:
+            raise DocumentProcessingError(
+                "The PDF did not contain any indexable text or tables."
+            )
+        return ProcessingResult(
+            document_id=document_id, file_name=file_name, chunk_count=chunk_count
+        )
 
     def prepare_bytes(self, content: bytes, *, file_name: str) -> PreparedDocument:
         """Prepare one document without mutating the target vector store.
@@ -202,7 +395,8 @@ class DocumentProcessor:
         Returns
         -------
         PreparedDocument
-            Immutable processing summary and ordered embedded chunks.
+            Immutable processing summary, ordered chunk records, and their
+            embedding matrix.
 
         Raises
         ------
@@ -212,30 +406,45 @@ class DocumentProcessor:
             If embedding fails or returns unusable vectors.
         """
 
+        document_id = self._document_id(content, file_name)
+        records: list[dict[str, Any]] = []
+        matrices: list[NDArray[np.float32]] = []
+        for window_records, window_vectors in self._embedded_windows(
+            content, file_name, document_id
+        ):
+            records.extend(window_records)
+            matrices.append(window_vectors)
+        if not records:
+            raise DocumentProcessingError(
+                "The PDF did not contain any indexable text or tables."
+            )
+
+        return PreparedDocument(
+            result=ProcessingResult(
+                document_id=document_id,
+                file_name=file_name,
+                chunk_count=len(records),
+            ),
+            records=tuple(records),
+            vectors=matrices[0] if len(matrices) == 1 else np.concatenate(matrices),
+        )
+
+    @staticmethod
+    def _document_id(content: bytes, file_name: str) -> str:
         if not isinstance(content, bytes) or not content:
             raise DocumentProcessingError("The uploaded PDF is empty.")
         if not isinstance(file_name, str) or not file_name.strip():
             raise DocumentProcessingError("The uploaded PDF needs a file name.")
+        return hashlib.sha256(content).hexdigest()
 
-        document_id = hashlib.sha256(content).hexdigest()
+    def _embedded_windows(
+        self, content: bytes, file_name: str, document_id: str
+    ) -> Iterator[tuple[list[dict[str, Any]], NDArray[np.float32]]]:
         try:
-            document = self.loader.load_pdf(
-                content, file_name=file_name, extract_tables=True
-            )
-            processed_document, _removed = self.preprocessor_factory(
-                document
-            ).run_preprocessing()
-            chunks = self.chunker.chunk_document(processed_document)
-            if not chunks:
-                raise DocumentProcessingError(
-                    "The PDF did not contain any indexable text or tables."
-                )
-            if any(chunk["metadata"]["document_id"] != document_id for chunk in chunks):
-                raise DocumentProcessingError(
-                    "The loader and chunker produced inconsistent document IDs."
-                )
-            embedded_chunks = embeddings.chunks.embed_chunks(
-                chunks, self.embedding_provider
+            yield from embeddings.chunks.iter_chunk_windows(
+                self._identified_chunks(self._chunks(content, file_name), document_id),
+                self.embedding_provider,
+                window_size=self.embedding_window_size,
             )
         except DocumentProcessingError:
             raise
@@ -246,11 +455,45 @@ class DocumentProcessor:
                 f"Could not process {file_name!r} as a PDF."
             ) from exc
 
-        return PreparedDocument(
-            result=ProcessingResult(
-                document_id=document_id,
-                file_name=file_name,
-                chunk_count=len(chunks),
-            ),
-            embedded_chunks=tuple(embedded_chunks),
+    def _chunks(self, content: bytes, file_name: str) -> Iterator[dict[str, Any]]:
+        if not self._streams(content):
+            return self.chunker.iter_chunks(
+                self._preprocessed_document(content, file_name)
+            )
+        metadata = self.loader.load_metadata(content, file_name=file_name)
+        preprocessor = self.preprocessor_factory.from_page_paragraphs(
+            metadata, self.loader.iter_page_paragraphs(content)
+        )
+        pages = map(
+            preprocessor.preprocess_page,
+            self.loader.iter_pages(content, extract_tables=True),
+        )
+        return self.chunker.iter_page_chunks(preprocessor.get_metadata(), pages)
+
+    def _streams(self, content: bytes) -> bool:
+        return (
+            self.stream_min_pages is not None
+            and isinstance(self.loader, _PageStreamingPDFLoader)
+            and hasattr(self.preprocessor_factory, "from_page_paragraphs")
+            and self.loader.count_pages(content) >= self.stream_min_pages
+        )
+
+    def _preprocessed_document(self, content: bytes, file_name: str) -> dict:
+        document = self.loader.load_pdf(
+            content, file_name=file_name, extract_tables=True
         )
+        processed_document, _removed = self.preprocessor_factory(
+            document
+        ).run_preprocessing()
+        return processed_document
+
+    @staticmethod
+    def _identified_chunks(
+        chunks: Iterable[dict[str, Any]], document_id: str
+    ) -> Iterator[dict[str, Any]]:
+        for chunk in chunks:
+            if chunk["metadata"]["document_id"] != document_id:
+                raise DocumentProcessingError(
+                    "The loader and chunker produced inconsistent document IDs."
+                )
+            yield chunk
@@ -1,11 +1,21 @@
 """FAISS vector storage and atomic persistence.
 
 Provides:
+- columns: memory-mapped string columns for snapshot records.
+- contracts: vector-store protocol shared by sessions and ingestion.
 - faiss: validated in-memory indexes and complete snapshots.
+- filters: metadata search filters and their inverted position lists.
+- records: read-only record views shared with search results.
+- segments: shared per-document segments and session overlay stores.
 """
 
 from __future__ import annotations
 
+from . import vectorstore_columns as columns
+from . import vectorstore_contracts as contracts
 from . import vectorstore_faiss as faiss
+from . import vectorstore_filters as filters
+from . import vectorstore_records as records
+from . import vectorstore_segments as segments
 
-__all__ = ["faiss"]
+__all__ = ["columns", "contracts", "faiss", "filters", "records", "segments"]
@@ -0,0 +1,222 @@
+"""
+===============================================================================
+vectorstore_columns.py
+===============================================================================
+Persist string columns as memory-mapped offsets and UTF-8 data files.
+
+Responsibilities:
+  - Write one column as a little-endian ``uint64`` offsets file and a data file.
+  - Open persisted columns without reading their data into memory.
+  - Reject structurally inconsistent offsets before any row is decoded.
+  - Check row framing bytes without decoding rows.
+
+Design principles:
+  - Keep rows addressable so a single value decodes without parsing its column.
+  - Validate offsets with vectorized NumPy checks instead of per-row Python work.
+
+Boundaries:
+  - Stores opaque strings; callers own record schemas and JSON encoding.
+  - Does not publish generations, select current snapshots, or fsync directories.
+===============================================================================
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from itertools import pairwise
+from pathlib import Path
+from typing import Any, overload
+
+import numpy as np
+
+__all__ = ["StringColumn", "write_string_column"]
+
+
+_OFFSET_DTYPE = np.dtype("<u8")
+
+
+def write_string_column(
+    directory: Path, name: str, values: Iterable[str]
+) -> dict[str, Any]:
+    """Write one string column and return its manifest description.
+
+    Parameters
+    ----------
+    directory
+        Existing generation directory that receives the column files.
+    name
+        Column name used as the stem of ``<name>.offsets`` and ``<name>.data``.
+    values
+        Strings in row order.
+
+    Returns
+    -------
+    dict
+        JSON-compatible description with file names, row count, and data size.
+    """
+
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=_OFFSET_DTYPE)
+    if encoded:
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    description = {
+        "offsets": f"{name}.offsets",
+        "data": f"{name}.data",
+        "count": len(encoded),
+        "size": int(offsets[-1]),
+    }
+    _write_synced(directory / description["offsets"], offsets.tobytes())
+    _write_synced(directory / description["data"], b"".join(encoded))
+    return description
+
+
+class StringColumn(Sequence[str]):
+    """Expose a persisted string column as a lazily decoded sequence.
+
+    Parameters
+    ----------
+    offsets
+        ``uint64`` row boundaries; row ``i`` spans ``offsets[i]:offsets[i + 1]``.
+    data
+        Concatenated UTF-8 row bytes.
+
+    Notes
+    -----
+    Use :meth:`open` for persisted columns. Decoding errors surface as
+    ``UnicodeDecodeError``, a ``ValueError`` subclass, when a row is read.
+    """
+
+    __slots__ = ("_data", "_offsets")
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray) -> None:
+        self._offsets = offsets
+        self._data = data
+
+    @classmethod
+    def open(cls, directory: Path, description: Mapping[str, Any]) -> StringColumn:
+        """Memory-map and structurally validate one described column.
+
+        Parameters
+        ----------
+        directory
+            Generation directory containing the column files.
+        description
+            Mapping produced by :func:`write_string_column`.
+
+        Returns
+        -------
+        StringColumn
+            Column whose rows decode on access.
+
+        Raises
+        ------
+        TypeError
+            If the description is not a mapping.
+        ValueError
+            If the description, file sizes, or offsets are inconsistent.
+        OSError
+            If a column file cannot be opened.
+        """
+
+        if not isinstance(description, Mapping):
+            raise TypeError("column description must be an object")
+        count = description.get("count")
+        size = description.get("size")
+        names = (description.get("offsets"), description.get("data"))
+        if (
+            not isinstance(count, int)
+            or not isinstance(size, int)
+            or count < 0
+            or size < 0
+            or not all(
+                isinstance(name, str) and Path(name).name == name for name in names
+            )
+        ):
+            raise ValueError("column description is invalid")
+
+        offsets_path = directory / str(names[0])
+        data_path = directory / str(names[1])
+        expected_offsets_size = (count + 1) * _OFFSET_DTYPE.itemsize
+        if offsets_path.stat().st_size != expected_offsets_size:
+            raise ValueError(f"column offsets {offsets_path.name} have the wrong size")
+        if data_path.stat().st_size != size:
+            raise ValueError(f"column data {data_path.name} has the wrong size")
+
+        offsets = np.memmap(offsets_path, dtype=_OFFSET_DTYPE, mode="r")
+        if offsets[0] != 0 or offsets[-1] != size or np.any(offsets[1:] < offsets[:-1]):
+            raise ValueError(f"column offsets {offsets_path.name} are not monotonic")
+        # NumPy cannot map empty files, and an empty column needs no mapping.
+        data = (
+            np.memmap(data_path, dtype=np.uint8, mode="r")
+            if size
+            else np.empty(0, dtype=np.uint8)
+        )
+        return cls(offsets, data)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(len(self))[index]]
+        position = range(len(self))[index]
+        start, stop = int(self._offsets[position]), int(self._offsets[position + 1])
+        return str(memoryview(self._data[start:stop]), "utf-8")
+
+    def rows_are_enclosed(self, opening: bytes, closing: bytes) -> bool:
+        """Return whether every row starts and ends with the given bytes.
+
+        Parameters
+        ----------
+        opening
+            Single byte every row must start with.
+        closing
+            Single byte every row must end with.
+
+        Returns
+        -------
+        bool
+            ``True`` if every row is at least two bytes long and enclosed by
+            ``opening`` and ``closing``.
+
+        Raises
+        ------
+        ValueError
+            If ``opening`` or ``closing`` is not a single byte.
+
+        Notes
+        -----
+        Only two bytes per row are read, with vectorized NumPy indexing, so a
+        framed encoding such as JSON objects is checked without decoding rows.
+        """
+
+        if len(opening) != 1 or len(closing) != 1:
+            raise ValueError("opening and closing must be single bytes")
+        starts = self._offsets[:-1].astype(np.int64)
+        stops = self._offsets[1:].astype(np.int64)
+        if np.any(stops - starts < 2):
+            return False
+        return bool(
+            np.all(self._data[starts] == opening[0])
+            and np.all(self._data[stops - 1] == closing[0])
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        data = memoryview(self._data)
+        bounds = self._offsets.tolist()
+        for start, stop in pairwise(bounds):
+            yield str(data[start:stop], "utf-8")
+
+
+def _write_synced(path: Path, payload: bytes) -> None:
+    with path.open("wb") as column_file:
+        column_file.write(payload)
+        column_file.flush()
+        os.fsync(column_file.fileno())
@@ -0,0 +1,108 @@
+"""
+===============================================================================
+vectorstore_contracts.py
+===============================================================================
+Define the vector-store behavior shared by session stores and FAISS stores.
+
+Responsibilities:
+  - Specify document-level mutation, nearest-neighbour search, and lookup.
+  - Let application and ingestion code accept any conforming store.
+
+Design principles:
+  - Describe documents by their canonical ``metadata["document_id"]``.
+  - Return read-only record views that callers copy before modifying.
+
+Boundaries:
+  - Contains no index, persistence, or sharing implementation.
+  - Does not prescribe locking; implementations document their guarantees.
+===============================================================================
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, Protocol
+
+import numpy as np
+from numpy.typing import NDArray
+
+from . import vectorstore_filters as filters_module
+
+__all__ = ["VectorStore"]
+
+
+class VectorStore(Protocol):
+    """Abstract the store operations used by ingestion, sessions, and retrieval.
+
+    Implementations must validate chunks against the shared chunk schema, keep
+    chunk identifiers unique, order search results from closest to farthest,
+    and leave their state unchanged when a mutation fails.
+    """
+
+    embedding_model: str
+    dimension: int
+
+    @property
+    def records(self) -> tuple[dict[str, Any], ...]:
+        """Return read-only record views in store order."""
+
+        ...
+
+    @property
+    def record_count(self) -> int:
+        """Return the number of indexed records."""
+
+        ...
+
+    def add_embedded_chunks(self, embedded_chunks: Iterable[Mapping[str, Any]]) -> int:
+        """Index canonical embedded chunks and return how many were added."""
+
+        ...
+
+    def add_vectors(
+        self,
+        vectors: NDArray[np.float32] | Sequence[Sequence[float]],
+        records: Sequence[Mapping[str, Any]],
+    ) -> int:
+        """Index an embedding matrix and its row-ordered chunk records."""
+
+        ...
+
+    def remove_document(self, document_id: str) -> int:
+        """Remove one document's chunks and return how many were removed."""
+
+        ...
+
+    def replace_document(
+        self, document_id: str, embedded_chunks: Iterable[Mapping[str, Any]]
+    ) -> int:
+        """Replace one document's chunks and return how many were indexed."""
+
+        ...
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        k: int = 3,
+        *,
+        filter: filters_module.SearchFilter | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return up to ``k`` nearest records with distance and score."""
+
+        ...
+
+    def search_batch(
+        self,
+        query_matrix: Any,
+        k: int = 3,
+        *,
+        filter: filters_module.SearchFilter | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Return up to ``k`` nearest records for every query row."""
+
+        ...
+
+    def get_record(self, chunk_id: str) -> dict[str, Any] | None:
+        """Return one read-only record by chunk identifier, if stored."""
+
+        ...
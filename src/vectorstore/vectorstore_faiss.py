@@ -6,30 +6,41 @@ Store validated vectors in FAISS with complete versioned snapshots.
 
 Responsibilities:
   - Validate and index canonical embedded chunks in positional order.
-  - Search defensively and persist complete snapshot generations.
+  - Search defensively and persist columnar base and delta snapshot generations.
   - Reject corrupt, dimensionally incompatible, or model-incompatible state.
 
 Design principles:
   - Validate candidate state before atomic current-pointer replacement.
-  - Keep record order aligned exactly with FAISS vector positions.
+  - Keep record slots aligned exactly with FAISS vector positions.
+  - Append batches in place and truncate the contiguous tail on failure.
+  - Tombstone removed slots and compact once they outnumber live records.
+  - Freeze records once on ingestion and share read-only views with results.
+  - Memory-map persisted indexes and check every persisted record before
+    activation unless lazy decoding is explicitly requested.
+  - Persist appends as deltas and compact the chain into a new base periodically.
+  - Never remove the generation chain named by ``CURRENT`` or in-flight writes.
 
 Boundaries:
-  - Owns vector records and snapshots, not embedding or query creation.
+  - Owns vector records, snapshots, and their retention, not embedding or query
+    creation.
   - Does not share stores across application sessions unless explicitly injected.
 ===============================================================================
 """
 
 from __future__ import annotations
 
-import copy
 import json
+import logging
 import os
 import shutil
 import tempfile
+import time
 import uuid
 from collections import Counter
+from collections.abc import Callable, Set
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable, Mapping, Protocol, Sequence, cast
+from typing import Any, Iterable, Literal, Mapping, Protocol, Sequence, cast
 
 import faiss
 import numpy as np
@@ -37,29 +48,66 @@ from numpy.typing import NDArray
 
 from src import ingestion
 
+from . import vectorstore_columns as columns_module
+from . import vectorstore_filters as filters_module
+from . import vectorstore_records as records_module
+
 __all__ = [
+    "SUPPORTED_INDEX_TYPES",
+    "SUPPORTED_METRICS",
     "CorruptSnapshotError",
     "DimensionMismatchError",
     "DuplicateChunkIDError",
+    "FAISSIndexSpec",
     "FAISSStore",
     "FAISSStoreError",
     "IncompatibleSnapshotError",
     "InvalidVectorRecordError",
+    "SnapshotCollection",
     "SnapshotNotFoundError",
+    "SnapshotRetention",
+    "VectorMetric",
+    "collect_snapshot_garbage",
 ]
 
+_LOGGER = logging.getLogger(__name__)
+
 
-SNAPSHOT_SCHEMA_VERSION = 1
+SNAPSHOT_SCHEMA_VERSION = 3
+_COLUMNAR_SNAPSHOT_SCHEMA_VERSIONS = frozenset({2, SNAPSHOT_SCHEMA_VERSION})
+_LEGACY_SNAPSHOT_SCHEMA_VERSION = 1
 INDEX_FILENAME = "index.faiss"
 MANIFEST_FILENAME = "manifest.json"
+VECTORS_FILENAME = "vectors.npy"
 CURRENT_FILENAME = "CURRENT"
+_RECORD_COLUMNS = ("chunk_id", "document_id", "text", "metadata")
+SUPPORTED_INDEX_TYPES = frozenset({"Flat", "IVFFlat", "HNSWFlat", "IVFPQ"})
+
+# Vector similarity metrics; inner product ranks unit vectors by cosine similarity.
+VectorMetric = Literal["l2", "inner_product"]
+SUPPORTED_METRICS = frozenset({"l2", "inner_product"})
+_FAISS_METRICS = {
+    "l2": faiss.METRIC_L2,
+    "inner_product": faiss.METRIC_INNER_PRODUCT,
+}
+_INDEX_CLASSES = {
+    "Flat": faiss.IndexFlat,
+    "IVFFlat": faiss.IndexIVFFlat,
+    "HNSWFlat": faiss.IndexHNSWFlat,
+    "IVFPQ": faiss.IndexIVFPQ,
+}
 
 
 class _FaissSearchIndex(Protocol):
     """Describe the two-argument Python FAISS search wrapper."""
 
     def search(
-        self, query: NDArray[np.float32], result_count: int, /
+        self,
+        query: NDArray[np.float32],
+        result_count: int,
+        /,
+        *,
+        params: faiss.SearchParameters | None = None,
     ) -> tuple[NDArray[np.float32], NDArray[np.int64]]:
         """Return distance and position matrices for a query batch."""
 
@@ -94,6 +142,298 @@ class InvalidVectorRecordError(FAISSStoreError):
     """Indicate that an embedded chunk or query vector is unusable."""
 
 
+@dataclass(frozen=True)
+class FAISSIndexSpec:
+    """Describe the FAISS index family and parameters used by one store.
+
+    Parameters
+    ----------
+    index_type
+        ``Flat``, ``IVFFlat``, ``HNSWFlat``, or ``IVFPQ``.
+    nlist
+        Positive number of inverted lists for IVF index types.
+    nprobe
+        Positive number of inverted lists scanned per IVF query.
+    hnsw_m
+        Positive number of graph neighbours per HNSW node.
+    ef_construction
+        Positive HNSW candidate-list size used while adding vectors.
+    ef_search
+        Positive HNSW candidate-list size used while searching.
+    pq_m
+        Positive number of product-quantizer subspaces; must divide the dimension.
+    pq_bits
+        Positive bits per product-quantizer code.
+    training_threshold
+        Optional vector count at which IVF indexes are trained. Defaults to the
+        FAISS recommendation of 39 training points per centroid.
+
+    Raises
+    ------
+    ValueError
+        If the index type is unsupported or a parameter is not a positive integer.
+
+    Notes
+    -----
+    Trained index types keep vectors in an exact flat staging index until the
+    training threshold is reached, then train once on every staged vector.
+    The index type and its structural parameters must match a persisted snapshot.
+    ``nprobe``, ``ef_search``, and the training threshold may change between runs.
+    """
+
+    index_type: str = "Flat"
+    nlist: int = 1024
+    nprobe: int = 16
+    hnsw_m: int = 32
+    ef_construction: int = 40
+    ef_search: int = 64
+    pq_m: int = 16
+    pq_bits: int = 8
+    training_threshold: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.index_type not in SUPPORTED_INDEX_TYPES:
+            raise ValueError(
+                "index_type must be one of "
+                f"{', '.join(sorted(SUPPORTED_INDEX_TYPES))}"
+            )
+        for name in (
+            "nlist",
+            "nprobe",
+            "hnsw_m",
+            "ef_construction",
+            "ef_search",
+            "pq_m",
+            "pq_bits",
+        ):
+            value = getattr(self, name)
+            if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+                raise ValueError(f"{name} must be a positive integer")
+        threshold = self.training_threshold
+        if threshold is not None and (
+            isinstance(threshold, bool) or not isinstance(threshold, int)
+        ):
+            raise ValueError("training_threshold must be an integer")
+        if threshold is not None and threshold < self.nlist:
+            raise ValueError("training_threshold must be at least nlist")
+
+    @property
+    def requires_training(self) -> bool:
+        """Return whether the index type must be trained before use."""
+
+        return self.index_type in {"IVFFlat", "IVFPQ"}
+
+    @property
+    def minimum_training_vectors(self) -> int:
+        """Return the staged vector count that triggers index training."""
+
+        if self.training_threshold is not None:
+            return self.training_threshold
+        minimum = 39 * self.nlist
+        if self.index_type == "IVFPQ":
+            minimum = max(minimum, 39 * 2**self.pq_bits)
+        return minimum
+
+    def structural_parameters(self) -> dict[str, Any]:
+        """Return the persisted parameters that determine index compatibility."""
+
+        if self.index_type == "IVFFlat":
+            return {"nlist": self.nlist}
+        if self.index_type == "IVFPQ":
+            return {"nlist": self.nlist, "pq_m": self.pq_m, "pq_bits": self.pq_bits}
+        if self.index_type == "HNSWFlat":
+            return {"hnsw_m": self.hnsw_m, "ef_construction": self.ef_construction}
+        return {}
+
+    def factory_string(self) -> str:
+        """Return the ``faiss.index_factory`` description for this index type."""
+
+        if self.index_type == "IVFFlat":
+            return f"IVF{self.nlist},Flat"
+        if self.index_type == "IVFPQ":
+            return f"IVF{self.nlist},PQ{self.pq_m}x{self.pq_bits}"
+        if self.index_type == "HNSWFlat":
+            return f"HNSW{self.hnsw_m},Flat"
+        return "Flat"
+
+    def validate_dimension(self, dimension: int) -> None:
+        """Reject dimensions that the configured quantizer cannot split.
+
+        Raises
+        ------
+        ValueError
+            If product quantization cannot divide ``dimension`` evenly.
+        """
+
+        if self.index_type == "IVFPQ" and dimension % self.pq_m:
+            raise ValueError("pq_m must divide the vector dimension")
+
+
+@dataclass(frozen=True)
+class SnapshotRetention:
+    """Describe which superseded snapshot generations a persistent store keeps.
+
+    Parameters
+    ----------
+    keep_generations
+        Number of most recent superseded base generations, with their deltas,
+        kept beside the current chain for manual rollback.
+    max_age_seconds
+        Optional age after which superseded generations are removed even when
+        ``keep_generations`` would keep them.
+    pending_grace_seconds
+        Minimum age before unreferenced generations, ``.pending-*`` directories,
+        and temporary pointers are treated as abandoned rather than in flight.
+
+    Raises
+    ------
+    ValueError
+        If a count or duration is negative or not numeric.
+    """
+
+    keep_generations: int = 1
+    max_age_seconds: float | None = None
+    pending_grace_seconds: float = 3600.0
+
+    def __post_init__(self) -> None:
+        if (
+            isinstance(self.keep_generations, bool)
+            or not isinstance(self.keep_generations, int)
+            or self.keep_generations < 0
+        ):
+            raise ValueError("keep_generations must be a non-negative integer")
+        for name in ("max_age_seconds", "pending_grace_seconds"):
+            value = getattr(self, name)
+            if value is None and name == "max_age_seconds":
+                continue
+            if (
+                isinstance(value, bool)
+                or not isinstance(value, (int, float))
+                or not value >= 0
+            ):
+                raise ValueError(f"{name} must be a non-negative number")
+
+
+@dataclass(frozen=True)
+class SnapshotCollection:
+    """Summarize one snapshot garbage-collection sweep.
+
+    Parameters
+    ----------
+    removed
+        Paths relative to the snapshot directory that were removed, or that would
+        be removed by a dry run.
+    retained
+        Superseded or in-flight generations kept by the retention policy.
+    dry_run
+        Whether the sweep only reported what it would remove.
+    """
+
+    removed: tuple[str, ...]
+    retained: tuple[str, ...]
+    dry_run: bool
+
+
+def collect_snapshot_garbage(
+    snapshot_directory: str | Path,
+    retention: SnapshotRetention | None = None,
+    *,
+    dry_run: bool = False,
+    now: float | None = None,
+) -> SnapshotCollection:
+    """Remove abandoned writes and superseded generations from a store directory.
+
+    Parameters
+    ----------
+    snapshot_directory
+        Persistent store directory containing ``CURRENT`` and ``snapshots``.
+    retention
+        Policy for superseded generations; defaults to :class:`SnapshotRetention`.
+    dry_run
+        Report removable paths without deleting them.
+    now
+        Optional POSIX timestamp used to compute ages; defaults to the clock.
+
+    Returns
+    -------
+    SnapshotCollection
+        Removed and retained paths relative to ``snapshot_directory``.
+
+    Raises
+    ------
+    SnapshotNotFoundError
+        If the directory has no ``CURRENT`` pointer; nothing is removed.
+    CorruptSnapshotError
+        If the pointer cannot be read or names invalid generations.
+    FAISSStoreError
+        If the directory cannot be scanned or a path cannot be removed.
+
+    Notes
+    -----
+    The chain named by ``CURRENT`` is never removed. Paths younger than
+    ``pending_grace_seconds`` may belong to a publication in progress and are
+    kept. Deltas follow their base: they are kept only with a retained base.
+    """
+
+    root = Path(snapshot_directory)
+    policy = retention or SnapshotRetention()
+    current = set(_read_current_pointer(root))
+    timestamp = time.time() if now is None else now
+    removable: list[Path] = []
+    retained: list[Path] = []
+
+    def age(path: Path) -> float:
+        return timestamp - path.lstat().st_mtime
+
+    try:
+        for path in sorted([*root.glob(".pending-*"), *root.glob(".CURRENT-*")]):
+            if age(path) >= policy.pending_grace_seconds:
+                removable.append(path)
+
+        snapshots_directory = root / "snapshots"
+        superseded = [
+            path
+            for path in (
+                snapshots_directory.iterdir() if snapshots_directory.is_dir() else ()
+            )
+            if path.is_dir()
+            and path.name not in current
+            and path.name.startswith(("snapshot-", "delta-"))
+        ]
+        superseded.sort(key=age)
+        settled = [
+            path for path in superseded if age(path) >= policy.pending_grace_seconds
+        ]
+        retained.extend(path for path in superseded if path not in settled)
+        newest_bases = [path for path in settled if path.name.startswith("snapshot-")][
+            : policy.keep_generations
+        ]
+        kept_bases = {
+            path.name
+            for path in newest_bases
+            if policy.max_age_seconds is None or age(path) <= policy.max_age_seconds
+        }
+        for path in settled:
+            base_name = (
+                path.name if path.name.startswith("snapshot-") else _delta_base(path)
+            )
+            (retained if base_name in kept_bases else removable).append(path)
+
+        if not dry_run:
+            for path in removable:
+                _remove_path(path)
+    except OSError as exc:
+        raise FAISSStoreError(
+            f"Could not collect snapshot garbage in {root}: {exc}"
+        ) from exc
+
+    return SnapshotCollection(
+        removed=tuple(path.relative_to(root).as_posix() for path in removable),
+        retained=tuple(path.relative_to(root).as_posix() for path in retained),
+        dry_run=dry_run,
+    )
+
+
 class FAISSStore:
     """Store vectors and records in an unambiguous positional mapping.
 
@@ -105,12 +445,50 @@ class FAISSStore:
         Positive fixed vector dimension for the FAISS index.
     embedding_model
         Non-empty model identifier stored and validated with each snapshot.
+    index_spec
+        Optional FAISS index family and parameters; defaults to exact flat search.
+    metric
+        ``l2`` for squared Euclidean distance or ``inner_product`` for dot-product
+        similarity, which equals cosine similarity for normalized embeddings.
+    max_delta_generations
+        Maximum number of delta generations chained to one base before an append
+        compacts the chain into a new base; ``0`` writes a base for every append.
+    retention
+        Policy applied after every successful publication and by
+        :meth:`collect_garbage`; defaults to :class:`SnapshotRetention`.
+    lazy_records
+        Decode persisted records on first access instead of at load. Loading is
+        then proportional to the identifier columns, but a corrupt record raises
+        ``CorruptSnapshotError`` only when a search or lookup reaches it.
 
     Notes
     -----
     A persistent store selects immutable generations through an atomically replaced
-    ``CURRENT`` pointer. Each manifest contains every record needed to interpret
-    FAISS positions. An omitted directory creates a session-local in-memory store.
+    ``CURRENT`` pointer. Each generation stores chunk identifiers, texts, and
+    compact JSON metadata as offset-addressed columns beside a small manifest with
+    the index and metric descriptions needed to check compatibility. Loading
+    memory-maps the index and columns and decodes and checks every record before
+    the snapshot becomes active, unless ``lazy_records`` defers decoding to first
+    access; the mapped index is copied into memory before the first append.
+    Schema-1 generations with inline manifest records still load. An omitted
+    directory creates a session-local in-memory store.
+
+    Appends to a persistent store publish a delta generation holding only the new
+    vectors and records, and ``CURRENT`` lists the base followed by its deltas.
+    Appends that train an index, explicit saves, and :meth:`compact` publish a
+    complete base generation instead. :meth:`remove_document` and
+    :meth:`replace_document` tombstone the removed slots, so their cost scales
+    with the removed chunks rather than the store; schema-3 deltas list the
+    tombstoned positions. Once tombstones would outnumber live records, or a
+    base generation is due anyway, the index and records are compacted and the
+    surviving positions renumbered densely. After each publication, superseded
+    generations outside the retention policy are removed; a failed sweep is
+    logged and never undoes the publication. Columnar generations also store a
+    ``document_id`` column, which rebuilds the per-document position index on
+    load without decoding records.
+    Search results carry a ``distance`` where lower is closer and a ``score`` where
+    higher is closer: ``-distance`` for ``l2`` and the raw inner product, with
+    ``distance = 1 - score``, for ``inner_product``.
     """
 
     def __init__(
@@ -119,6 +497,11 @@ class FAISSStore:
         *,
         dimension: int = 1536,
         embedding_model: str = "not-configured",
+        index_spec: FAISSIndexSpec | None = None,
+        metric: VectorMetric = "l2",
+        max_delta_generations: int = 8,
+        retention: SnapshotRetention | None = None,
+        lazy_records: bool = False,
     ) -> None:
         """Create an empty store or load a validated current snapshot."""
 
@@ -126,15 +509,32 @@ class FAISSStore:
             raise ValueError("dimension must be a positive integer")
         if not isinstance(embedding_model, str) or not embedding_model.strip():
             raise ValueError("embedding_model must be a non-empty string")
+        if metric not in SUPPORTED_METRICS:
+            raise ValueError("metric must be 'l2' or 'inner_product'")
+        if not isinstance(max_delta_generations, int) or max_delta_generations < 0:
+            raise ValueError("max_delta_generations must be a non-negative integer")
+        resolved_spec = index_spec or FAISSIndexSpec()
+        resolved_spec.validate_dimension(dimension)
 
         self.snapshot_directory = (
             Path(snapshot_directory) if snapshot_directory is not None else None
         )
         self.dimension = dimension
         self.embedding_model = embedding_model
-        self.index = faiss.IndexFlatL2(dimension)
-        self._records: list[dict[str, Any]] = []
-        self._records_by_id: dict[str, dict[str, Any]] = {}
+        self.index_spec = resolved_spec
+        self.metric: VectorMetric = metric
+        self.max_delta_generations = max_delta_generations
+        self.retention = retention or SnapshotRetention()
+        self.lazy_records = lazy_records
+        self.index = self._new_index()
+        self._index_is_mapped = False
+        self._records = records_module.RecordList()
+        self._positions_by_id: dict[str, int] = {}
+        self._positions_by_document: dict[str, list[int]] = {}
+        # Tombstoned positions whose vectors and records await compaction.
+        self._dead: set[int] = set()
+        self._field_index: filters_module.FieldIndex | None = None
+        self._current_generations: tuple[str, ...] = ()
 
         if self.snapshot_directory is not None:
             current_path = self.snapshot_directory / CURRENT_FILENAME
@@ -151,15 +551,21 @@ class FAISSStore:
 
     @property
     def records(self) -> tuple[dict[str, Any], ...]:
-        """Return defensive copies of records in their FAISS position order."""
-
-        return tuple(copy.deepcopy(record) for record in self._records)
+        """Return read-only live record views in their FAISS position order."""
+
+        if not self._dead:
+            return tuple(self._records)
+        return tuple(
+            self._records[position]
+            for position in range(len(self._records))
+            if position not in self._dead
+        )
 
     @property
     def record_count(self) -> int:
-        """Return the number of indexed vector records."""
+        """Return the number of live indexed vector records."""
 
-        return len(self._records)
+        return len(self._records) - len(self._dead)
 
     def add_embedded_chunks(self, embedded_chunks: Iterable[Mapping[str, Any]]) -> int:
         """Validate and atomically add embedded chunks to the active store.
@@ -187,41 +593,233 @@ class FAISSStore:
 
         Notes
         -----
-        Candidate index and record state replace active memory only after complete
-        validation and, when configured, successful snapshot publication.
+        Only the new batch is validated. Its vectors and records are appended in
+        place and truncated again if indexing or snapshot publication fails, so a
+        failed call leaves the active store exactly as it was. A persistent store
+        publishes the batch as a delta generation unless the chain must compact.
         """
 
         vectors, new_records = self._normalise_embedded_chunks(embedded_chunks)
+        return self._append(vectors, new_records)
+
+    def add_vectors(
+        self,
+        vectors: NDArray[np.float32] | Sequence[Sequence[float]],
+        records: Sequence[Mapping[str, Any]],
+    ) -> int:
+        """Validate and atomically add a prepared embedding matrix and its records.
+
+        Parameters
+        ----------
+        vectors
+            Finite numeric ``(n, dimension)`` matrix whose row ``i`` embeds
+            ``records[i]``. A C-contiguous ``float32`` array is used without
+            copying.
+        records
+            Canonical chunks without embeddings, in row order.
+
+        Returns
+        -------
+        int
+            Number of newly indexed chunks.
+
+        Raises
+        ------
+        InvalidVectorRecordError
+            If a record violates the shared chunk schema or the matrix contains
+            non-numeric or non-finite values.
+        DimensionMismatchError
+            If the matrix shape does not match the records and dimension.
+        DuplicateChunkIDError
+            If a new identity is duplicated within the batch or active store.
+        FAISSStoreError
+            If configured snapshot persistence cannot complete safely.
+
+        Notes
+        -----
+        This is the bulk ingestion path: records are checked one by one, but the
+        matrix is validated for shape and finiteness in one vectorized pass.
+        Atomicity and publication match :meth:`add_embedded_chunks`.
+        """
+
+        new_records = self._normalise_records(records)
+        matrix = self._validated_matrix(
+            vectors, [record["chunk_id"] for record in new_records]
+        )
+        return self._append(matrix, new_records)
+
+    def _append(
+        self,
+        vectors: NDArray[np.float32],
+        new_records: Sequence[records_module.ReadOnlyDict],
+    ) -> int:
         if not new_records:
             return 0
 
-        existing_ids = set(self._records_by_id)
         new_ids = [record["chunk_id"] for record in new_records]
         new_id_counts = Counter(new_ids)
         duplicate_ids = sorted(
             chunk_id
             for chunk_id, count in new_id_counts.items()
-            if count > 1 or chunk_id in existing_ids
+            if count > 1 or chunk_id in self._positions_by_id
         )
         if duplicate_ids:
             raise DuplicateChunkIDError(
                 f"Chunk IDs must be unique; duplicates: {duplicate_ids}"
             )
+        self._apply([], vectors, new_records)
+        return len(new_records)
 
-        candidate_index = faiss.clone_index(self.index)
-        candidate_index.add(vectors)
-        candidate_records = [*self._records, *new_records]
-        self._validate_index_and_records(candidate_index, candidate_records)
+    def _apply(
+        self,
+        removed: Sequence[int],
+        vectors: NDArray[np.float32],
+        new_records: Sequence[records_module.ReadOnlyDict],
+    ) -> None:
+        if self._should_compact(len(removed), len(new_records)):
+            self._replace_positions(removed, vectors, new_records)
+            return
+
+        # Read the removed records before any mutation so a corrupt row fails early.
+        removed_records = [self._records[position] for position in removed]
+        start = len(self._records)
+        active_index = self.index
+        try:
+            if new_records:
+                self._ensure_writable_index()
+                active_index = self.index
+                self.index.add(vectors)
+                self._records.extend(new_records)
+                self.index = self._trained_index(self.index)
+            if self.index.ntotal != len(self._records):
+                raise CorruptSnapshotError(
+                    f"FAISS index contains {self.index.ntotal} vectors but the store "
+                    f"contains {len(self._records)} records after an update."
+                )
+            if self.snapshot_directory is not None:
+                self._publish_append(active_index, vectors, new_records, start, removed)
+        except BaseException:
+            self.index = active_index
+            self._truncate_tail(start)
+            raise
 
-        if self.snapshot_directory is not None:
-            self._write_atomic_snapshot(candidate_index, candidate_records)
+        # Removals always cover whole documents, so their entries go entirely.
+        self._dead.update(removed)
+        for record in removed_records:
+            self._positions_by_id.pop(record["chunk_id"], None)
+            self._positions_by_document.pop(record["metadata"]["document_id"], None)
+        self._index_new_positions(new_records, start)
+
+    def remove_document(self, document_id: str) -> int:
+        """Remove every chunk that belongs to one source document.
 
-        self.index = candidate_index
-        self._set_records(candidate_records)
+        Parameters
+        ----------
+        document_id
+            ``metadata["document_id"]`` shared by the document's chunks.
+
+        Returns
+        -------
+        int
+            Number of removed chunks; ``0`` when the document is not stored.
+
+        Raises
+        ------
+        FAISSStoreError
+            If configured snapshot persistence cannot complete safely.
+
+        Notes
+        -----
+        Removal uses the store's per-document position index instead of scanning
+        records and tombstones the document's slots, leaving every other vector
+        and record where it is. A persistent store publishes a delta listing the
+        tombstoned positions. Once tombstones would outnumber live records, the
+        store compacts instead: remaining records keep their relative order and
+        move down to stay dense, and a persistent store publishes a complete base
+        generation. A failed call leaves the active store unchanged.
+        """
+
+        removed = self._positions_by_document.get(document_id)
+        if not removed:
+            return 0
+        self._apply(removed, np.empty((0, self.dimension), np.float32), [])
+        return len(removed)
+
+    def replace_document(
+        self, document_id: str, embedded_chunks: Iterable[Mapping[str, Any]]
+    ) -> int:
+        """Atomically replace every chunk of one source document.
+
+        Parameters
+        ----------
+        document_id
+            ``metadata["document_id"]`` of the document being replaced.
+        embedded_chunks
+            Canonical embedded chunks that all belong to ``document_id``.
+
+        Returns
+        -------
+        int
+            Number of newly indexed chunks.
+
+        Raises
+        ------
+        InvalidVectorRecordError
+            If a chunk is invalid or belongs to another document.
+        DimensionMismatchError
+            If an embedding does not match the configured dimension.
+        DuplicateChunkIDError
+            If a new identity is duplicated within the batch or held by a chunk
+            that is not being replaced.
+        FAISSStoreError
+            If configured snapshot persistence cannot complete safely.
+
+        Notes
+        -----
+        The previous chunks are removed and the new chunks appended in one
+        publication, so readers never observe the document half replaced. An
+        unknown ``document_id`` makes this an append.
+        """
+
+        vectors, new_records = self._normalise_embedded_chunks(embedded_chunks)
+        foreign = sorted(
+            {
+                record["metadata"]["document_id"]
+                for record in new_records
+                if record["metadata"]["document_id"] != document_id
+            }
+        )
+        if foreign:
+            raise InvalidVectorRecordError(
+                f"Replacement chunks for document {document_id!r} belong to other "
+                f"documents: {foreign}"
+            )
+        removed = self._positions_by_document.get(document_id, [])
+        replaced_ids = {self._records[position]["chunk_id"] for position in removed}
+        new_id_counts = Counter(record["chunk_id"] for record in new_records)
+        duplicate_ids = sorted(
+            chunk_id
+            for chunk_id, count in new_id_counts.items()
+            if count > 1
+            or (chunk_id in self._positions_by_id and chunk_id not in replaced_ids)
+        )
+        if duplicate_ids:
+            raise DuplicateChunkIDError(
+                f"Chunk IDs must be unique; duplicates: {duplicate_ids}"
+            )
+        if not removed and not new_records:
+            return 0
+        self._apply(removed, vectors, new_records)
         return len(new_records)
 
-    def search(self, query_embedding: Sequence[float], k: int = 3) -> list[dict]:
-        """Return up to ``k`` nearest records with source metadata and distance.
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        k: int = 3,
+        *,
+        filter: filters_module.SearchFilter | None = None,
+    ) -> list[dict]:
+        """Return up to ``k`` nearest records with metadata, distance, and score.
 
         Parameters
         ----------
@@ -229,26 +827,39 @@ class FAISSStore:
             Finite numeric query vector matching the store dimension.
         k
             Non-negative maximum number of nearest records.
+        filter
+            Optional metadata predicates; only matching records are returned.
 
         Returns
         -------
         list of dict
-            Defensive record copies ordered by ascending squared L2 distance.
+            New result mappings ordered from the closest to the farthest match.
+            Their text and read-only metadata are shared with the store.
 
         Raises
         ------
         ValueError
             If ``k`` is not a non-negative integer.
+        TypeError
+            If ``filter`` is not a :class:`~vectorstore_filters.SearchFilter`.
         DimensionMismatchError
             If the query vector has the wrong shape or dimension.
         InvalidVectorRecordError
             If the query contains non-numeric or non-finite values.
         CorruptSnapshotError
             If FAISS returns a position without a corresponding record.
+
+        Notes
+        -----
+        A filter is resolved through per-field inverted position lists into a
+        FAISS ID selector, so FAISS skips non-matching vectors during the search
+        instead of over-fetching. Approximate indexes may return fewer than
+        ``k`` matches when the filter is very selective.
         """
 
         if not isinstance(k, int) or k < 0:
             raise ValueError("k must be a non-negative integer")
+        self._check_filter(filter)
 
         try:
             query = np.asarray(query_embedding, dtype=np.float32)
@@ -267,25 +878,74 @@ class FAISSStore:
                 "Query embedding contains non-finite values."
             )
 
-        if k == 0 or self.index.ntotal == 0:
-            return []
+        return self._search_matrix(query.reshape(1, -1), k, filter)[0]
 
-        result_count = min(k, self.index.ntotal)
-        search_index = cast(_FaissSearchIndex, self.index)
-        distances, positions = search_index.search(query.reshape(1, -1), result_count)
-        results: list[dict[str, Any]] = []
-        for distance, position in zip(distances[0], positions[0], strict=True):
-            if position < 0 or position >= len(self._records):
-                raise CorruptSnapshotError(
-                    f"FAISS returned invalid record position {position}."
-                )
-            record = copy.deepcopy(self._records[position])
-            record["distance"] = float(distance)
-            results.append(record)
-        return results
+    def search_batch(
+        self,
+        query_matrix: NDArray[np.float32] | Sequence[Sequence[float]],
+        k: int = 3,
+        *,
+        filter: filters_module.SearchFilter | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Return up to ``k`` nearest records for every query in one FAISS call.
+
+        Parameters
+        ----------
+        query_matrix
+            Finite numeric ``(n, dimension)`` matrix with one query per row.
+        k
+            Non-negative maximum number of nearest records per query.
+        filter
+            Optional metadata predicates applied to every query.
+
+        Returns
+        -------
+        list of list of dict
+            One result list per query row, each ordered like :meth:`search`.
+
+        Raises
+        ------
+        ValueError
+            If ``k`` is not a non-negative integer.
+        TypeError
+            If ``filter`` is not a :class:`~vectorstore_filters.SearchFilter`.
+        DimensionMismatchError
+            If the matrix is not two-dimensional or has the wrong row width.
+        InvalidVectorRecordError
+            If the matrix contains non-numeric or non-finite values.
+        CorruptSnapshotError
+            If FAISS returns a position without a corresponding record.
+
+        Notes
+        -----
+        Shape and finiteness are validated once for the whole matrix, and a
+        filter is resolved once for the batch, so the per-query cost is the
+        FAISS search and result assembly only.
+        """
+
+        if not isinstance(k, int) or k < 0:
+            raise ValueError("k must be a non-negative integer")
+        self._check_filter(filter)
+
+        try:
+            queries = np.asarray(query_matrix, dtype=np.float32)
+        except (TypeError, ValueError) as exc:
+            raise InvalidVectorRecordError(
+                "Query embeddings must contain numeric values."
+            ) from exc
+        if queries.ndim != 2 or queries.shape[1] != self.dimension:
+            raise DimensionMismatchError(
+                f"Query matrix shape {tuple(queries.shape)!r} does not match "
+                f"(n, {self.dimension})."
+            )
+        if not np.isfinite(queries).all():
+            raise InvalidVectorRecordError(
+                "Query embeddings contain non-finite values."
+            )
+        return self._search_matrix(queries, k, filter)
 
     def get_record(self, chunk_id: str) -> dict[str, Any] | None:
-        """Return a defensive copy of one record by chunk identifier.
+        """Return the read-only view of one record by chunk identifier.
 
         Parameters
         ----------
@@ -295,11 +955,12 @@ class FAISSStore:
         Returns
         -------
         dict or None
-            Matching record copy, or ``None`` when the identifier is unknown.
+            Matching read-only record, or ``None`` when the identifier is unknown.
+            ``copy.deepcopy`` of the view returns an ordinary mutable record.
         """
 
-        record = self._records_by_id.get(chunk_id)
-        return copy.deepcopy(record) if record is not None else None
+        position = self._positions_by_id.get(chunk_id)
+        return None if position is None else self._records[position]
 
     def save_snapshot(self) -> None:
         """Persist current memory as one complete atomically selected generation.
@@ -316,11 +977,67 @@ class FAISSStore:
             raise FAISSStoreError(
                 "Cannot save an in-memory store without a snapshot_directory."
             )
+        if self._dead:
+            # Compaction validates and publishes the dense base itself.
+            self._replace_positions([], np.empty((0, self.dimension), np.float32), [])
+            return
         self._validate_index_and_records(self.index, self._records)
         self._write_atomic_snapshot(self.index, self._records)
 
+    def compact(self) -> bool:
+        """Merge the current base and delta chain into one new base generation.
+
+        Returns
+        -------
+        bool
+            ``True`` when a new base was published, or ``False`` when ``CURRENT``
+            already names a single base generation without tombstones.
+
+        Raises
+        ------
+        FAISSStoreError
+            If the store has no snapshot directory or publication fails.
+        """
+
+        if self.snapshot_directory is None:
+            raise FAISSStoreError(
+                "Cannot compact an in-memory store without a snapshot_directory."
+            )
+        if len(self._current_generations) == 1 and not self._dead:
+            return False
+        self.save_snapshot()
+        return True
+
+    def collect_garbage(self, *, dry_run: bool = False) -> SnapshotCollection:
+        """Apply the store's retention policy to its snapshot directory.
+
+        Parameters
+        ----------
+        dry_run
+            Report removable paths without deleting them.
+
+        Returns
+        -------
+        SnapshotCollection
+            Removed and retained paths relative to the snapshot directory.
+
+        Raises
+        ------
+        FAISSStoreError
+            If the store has no snapshot directory or the sweep fails.
+        """
+
+        if self.snapshot_directory is None:
+            raise FAISSStoreError(
+                "Cannot collect garbage for an in-memory store without a "
+                "snapshot_directory."
+            )
+        return collect_snapshot_garbage(
+            self.snapshot_directory, self.retention, dry_run=dry_run
+        )
+
     def load_snapshot(self) -> None:
-        """Load and validate the generation referenced by ``CURRENT``.
+        """Load and validate the generation chain referenced by ``CURRENT``.
 
         Raises
         ------
@@ -335,7 +1052,16 @@ class FAISSStore:
 
         Notes
         -----
-        Active memory changes only after the complete generation is validated.
+        Active memory changes only after the manifest, index, and record columns
+        of the base and every delta are validated. Loading checks column offsets,
+        unique non-empty chunk identifiers, non-empty document identifiers, and
+        that every metadata row is enclosed in JSON object braces, then parses
+        every record and checks it against the shared chunk schema. With
+        ``lazy_records`` the structural checks alone run at load, and each
+        record is parsed and checked when first decoded, raising
+        ``CorruptSnapshotError`` then. Replaying deltas that add vectors copies
+        the mapped index into memory, so :meth:`compact` restores memory-mapped
+        loads; positions tombstoned by deltas stay tombstoned.
         """
 
         if self.snapshot_directory is None:
@@ -343,35 +1069,12 @@ class FAISSStore:
                 "Cannot load a snapshot without a snapshot_directory."
             )
 
-        current_path = self.snapshot_directory / CURRENT_FILENAME
-        try:
-            generation_name = current_path.read_text(encoding="utf-8").strip()
-        except FileNotFoundError as exc:
-            raise SnapshotNotFoundError(
-                f"No snapshot pointer found at {current_path}."
-            ) from exc
-        except OSError as exc:
-            raise CorruptSnapshotError(
-                f"Could not read snapshot pointer {current_path}: {exc}"
-            ) from exc
-
-        if (
-            not generation_name.startswith("snapshot-")
-            or Path(generation_name).name != generation_name
-        ):
-            raise CorruptSnapshotError(
-                f"Invalid snapshot generation name: {generation_name!r}."
-            )
-
-        generation_directory = self.snapshot_directory / "snapshots" / generation_name
-        index, records, manifest = self._read_generation(generation_directory)
+        generations = self._read_current_pointer()
+        snapshots_directory = self.snapshot_directory / "snapshots"
+        index, records, identities, manifest = self._read_generation(
+            snapshots_directory / generations[0]
+        )
 
-        schema_version = manifest.get("schema_version")
-        if schema_version != SNAPSHOT_SCHEMA_VERSION:
-            raise IncompatibleSnapshotError(
-                f"Unsupported snapshot schema {schema_version!r}; expected "
-                f"{SNAPSHOT_SCHEMA_VERSION}."
-            )
         snapshot_dimension = manifest.get("embedding_dimension")
         if snapshot_dimension != self.dimension:
             raise DimensionMismatchError(
@@ -384,17 +1087,76 @@ class FAISSStore:
                 f"Snapshot embedding model {snapshot_model!r} does not match "
                 f"configured model {self.embedding_model!r}."
             )
+        # Manifests written before the metric was configurable use squared L2.
+        snapshot_metric = manifest.get("metric", "l2")
+        if snapshot_metric != self.metric:
+            raise IncompatibleSnapshotError(
+                f"Snapshot metric {snapshot_metric!r} does not match configured "
+                f"metric {self.metric!r}."
+            )
 
-        self._validate_index_and_records(index, records)
+        self._check_index_description(index, manifest)
+        if identities is None:
+            self._validate_index_and_records(index, records)
+            chunk_ids = [record["chunk_id"] for record in records]
+            document_ids = [record["metadata"]["document_id"] for record in records]
+            records = records_module.RecordList(
+                records_module.freeze(record) for record in records
+            )
+        else:
+            chunk_ids, document_ids = identities
+            self._validate_index_and_chunk_ids(index, chunk_ids)
+        assert isinstance(records, records_module.RecordList)
+
+        index_is_mapped = True
+        dead: set[int] = set()
+        for delta_name in generations[1:]:
+            vectors, (delta_ids, delta_documents), load_row, removed = self._read_delta(
+                snapshots_directory / delta_name, generations[0], len(chunk_ids)
+            )
+            if not dead.isdisjoint(removed):
+                raise CorruptSnapshotError(
+                    f"Snapshot delta {delta_name} removes an already removed record."
+                )
+            dead.update(removed)
+            if len(delta_ids):
+                if index_is_mapped:
+                    index = self._writable_copy(index)
+                    index_is_mapped = False
+                index.add(np.array(vectors))
+            records.extend_rows(len(delta_ids), load_row)
+            chunk_ids.extend(delta_ids)
+            document_ids.extend(delta_documents)
+        if len(generations) > 1:
+            self._validate_index_and_chunk_ids(index, chunk_ids, dead)
+
+        if not self.lazy_records:
+            records.load_all()
+
+        self._configure_index(index)
         self.index = index
-        self._set_records(records)
+        self._index_is_mapped = index_is_mapped
+        self._set_records(records, chunk_ids, document_ids, dead)
+        self._current_generations = generations
 
     def _normalise_embedded_chunks(
         self, embedded_chunks: Iterable[Mapping[str, Any]]
-    ) -> tuple[np.ndarray, list[dict[str, Any]]]:
-        vectors: list[np.ndarray] = []
-        records: list[dict[str, Any]] = []
-        for position, chunk in enumerate(embedded_chunks):
+    ) -> tuple[NDArray[np.float32], list[records_module.ReadOnlyDict]]:
+        chunks = list(embedded_chunks)
+        records = self._normalise_records(chunks)
+        return (
+            self._validated_matrix(
+                [chunk.get("embedding") for chunk in chunks],
+                [record["chunk_id"] for record in records],
+            ),
+            records,
+        )
+
+    def _normalise_records(
+        self, chunks: Iterable[Mapping[str, Any]]
+    ) -> list[records_module.ReadOnlyDict]:
+        records: list[records_module.ReadOnlyDict] = []
+        for position, chunk in enumerate(chunks):
             if not isinstance(chunk, Mapping):
                 raise InvalidVectorRecordError(
                     f"Embedded chunk at position {position} must be a mapping."
@@ -410,7 +1172,6 @@ class FAISSStore:
             chunk_id = chunk.get("chunk_id")
             text = chunk.get("text")
             metadata = chunk.get("metadata")
-            embedding = chunk.get("embedding")
             if not isinstance(chunk_id, str) or not chunk_id:
                 raise InvalidVectorRecordError(
                     f"Embedded chunk at position {position} has an invalid chunk_id."
@@ -423,83 +1184,509 @@ class FAISSStore:
                 raise InvalidVectorRecordError(
                     f"Embedded chunk {chunk_id!r} metadata must be a dictionary."
                 )
-
-            try:
-                vector = np.asarray(embedding, dtype=np.float32)
-            except (TypeError, ValueError) as exc:
-                raise InvalidVectorRecordError(
-                    f"Embedding for chunk {chunk_id!r} must contain numeric values."
-                ) from exc
-            if vector.ndim != 1 or vector.shape[0] != self.dimension:
-                actual = vector.shape[0] if vector.ndim == 1 else tuple(vector.shape)
-                raise DimensionMismatchError(
-                    f"Embedding for chunk {chunk_id!r} has dimension {actual!r}; "
-                    f"expected {self.dimension}."
+            records.append(
+                records_module.ReadOnlyDict(
+                    chunk_id=chunk_id,
+                    text=text,
+                    metadata=records_module.freeze(metadata),
                 )
-            if not np.isfinite(vector).all():
-                raise InvalidVectorRecordError(
-                    f"Embedding for chunk {chunk_id!r} contains non-finite values."
+            )
+        return records
+
+    def _validated_matrix(
+        self, vectors: Any, chunk_ids: Sequence[str]
+    ) -> NDArray[np.float32]:
+        expected_shape = (len(chunk_ids), self.dimension)
+        try:
+            matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+        except (TypeError, ValueError):
+            # Ragged or non-numeric rows cannot form a matrix.
+            matrix = None
+        if matrix is not None and not chunk_ids and not matrix.size:
+            return np.empty(expected_shape, dtype=np.float32)
+        if matrix is None or matrix.shape != expected_shape:
+            # Diagnose row by row only on failure so errors name the chunk.
+            for chunk_id, vector in zip(chunk_ids, vectors, strict=False):
+                self._validate_vector(chunk_id, vector)
+            actual = None if matrix is None else tuple(matrix.shape)
+            raise DimensionMismatchError(
+                f"Embedding matrix shape {actual!r} does not match {expected_shape}."
+            )
+        finite_rows = np.isfinite(matrix).all(axis=1)
+        if not finite_rows.all():
+            chunk_id = chunk_ids[int(np.argmin(finite_rows))]
+            raise InvalidVectorRecordError(
+                f"Embedding for chunk {chunk_id!r} contains non-finite values."
+            )
+        return matrix
+
+    def _validate_vector(self, chunk_id: str, embedding: Any) -> None:
+        try:
+            vector = np.asarray(embedding, dtype=np.float32)
+        except (TypeError, ValueError) as exc:
+            raise InvalidVectorRecordError(
+                f"Embedding for chunk {chunk_id!r} must contain numeric values."
+            ) from exc
+        if vector.ndim != 1 or vector.shape[0] != self.dimension:
+            actual = vector.shape[0] if vector.ndim == 1 else tuple(vector.shape)
+            raise DimensionMismatchError(
+                f"Embedding for chunk {chunk_id!r} has dimension {actual!r}; "
+                f"expected {self.dimension}."
+            )
+
+    @staticmethod
+    def _check_filter(search_filter: Any) -> None:
+        if search_filter is not None and not isinstance(
+            search_filter, filters_module.SearchFilter
+        ):
+            raise TypeError("filter must be a SearchFilter")
+
+    def _search_matrix(
+        self,
+        queries: NDArray[np.float32],
+        k: int,
+        search_filter: filters_module.SearchFilter | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        if k == 0 or not self.record_count or not len(queries):
+            return [[] for _ in range(len(queries))]
+
+        result_count = min(k, self.record_count)
+        params: faiss.SearchParameters | None = None
+        if search_filter is not None:
+            selected = self._filter_mask(search_filter)
+            result_count = min(result_count, int(np.count_nonzero(selected)))
+            if not result_count:
+                return [[] for _ in range(len(queries))]
+            # The selector reads the packed bitmap, which must outlive the search.
+            bitmap = np.packbits(selected, bitorder="little")
+            params = self._search_parameters(
+                faiss.IDSelectorBitmap(len(selected), faiss.swig_ptr(bitmap))
+            )
+        elif self._dead:
+            # Excluding tombstones costs their count, not the store size; the
+            # array and inner selector must outlive the search.
+            dead = np.fromiter(self._dead, dtype=np.int64, count=len(self._dead))
+            dead_selector = faiss.IDSelectorBatch(len(dead), faiss.swig_ptr(dead))
+            params = self._search_parameters(faiss.IDSelectorNot(dead_selector))
+        search_index = cast(_FaissSearchIndex, self.index)
+        queries = np.ascontiguousarray(queries)
+        if params is None:
+            distances, positions = search_index.search(queries, result_count)
+        else:
+            distances, positions = search_index.search(
+                queries, result_count, params=params
+            )
+        batch_results: list[list[dict[str, Any]]] = []
+        for distance_row, position_row in zip(distances, positions, strict=True):
+            results: list[dict[str, Any]] = []
+            for distance, position in zip(distance_row, position_row, strict=True):
+                if position == -1:
+                    # Approximate indexes pad with -1 when fewer neighbours are found.
+                    continue
+                if (
+                    position < 0
+                    or position >= len(self._records)
+                    or position in self._dead
+                ):
+                    raise CorruptSnapshotError(
+                        f"FAISS returned invalid record position {position}."
+                    )
+                # Share the stored text and read-only metadata with the result.
+                distance_value, score = self._distance_and_score(float(distance))
+                results.append(
+                    {
+                        **self._records[position],
+                        "distance": distance_value,
+                        "score": score,
+                    }
                 )
+            batch_results.append(results)
+        return batch_results
+
+    def _filter_mask(
+        self, search_filter: filters_module.SearchFilter
+    ) -> NDArray[np.bool_]:
+        if self._field_index is None:
+            # Built on the first filtered search so loads stay lazy, then kept
+            # current by appends.
+            self._field_index = filters_module.FieldIndex.build(self._records)
+        selected = self._field_index.mask(
+            search_filter, self._positions_by_document, len(self._records)
+        )
+        if self._dead:
+            selected[list(self._dead)] = False
+        return selected
+
+    def _search_parameters(self, selector: faiss.IDSelector) -> faiss.SearchParameters:
+        # Per-call parameters replace the index defaults, so carry them over.
+        if faiss.try_extract_index_ivf(self.index) is not None:
+            return faiss.SearchParametersIVF(
+                sel=selector, nprobe=self.index_spec.nprobe
+            )
+        if isinstance(self.index, faiss.IndexHNSW):
+            return faiss.SearchParametersHNSW(
+                sel=selector, efSearch=self.index_spec.ef_search
+            )
+        return faiss.SearchParameters(sel=selector)
+
+    def _truncate_tail(self, start: int) -> None:
+        # Appended vectors and records always form one contiguous tail, and the
+        # position indexes only learn about it once the update has succeeded.
+        del self._records[start:]
+        if self.index.ntotal > start:
+            self.index = self._truncated_index(self.index, start)
+
+    def _should_compact(self, removed_count: int, added_count: int) -> bool:
+        dead_count = len(self._dead) + removed_count
+        if not dead_count:
+            return False
+        total = len(self._records) + added_count
+        if dead_count > total - dead_count:
+            return True
+        # Training and base generations copy every vector, so drop tombstones then.
+        if (
+            self._is_staging_index(self.index)
+            and total >= self.index_spec.minimum_training_vectors
+        ):
+            return True
+        return self.snapshot_directory is not None and (
+            not self._current_generations
+            or len(self._current_generations) > self.max_delta_generations
+        )
 
-            vectors.append(vector)
-            records.append(
-                {
-                    "chunk_id": chunk_id,
-                    "text": text,
-                    "metadata": copy.deepcopy(metadata),
-                }
+    def _replace_positions(
+        self,
+        removed: Sequence[int],
+        vectors: NDArray[np.float32],
+        new_records: Sequence[records_module.ReadOnlyDict],
+    ) -> None:
+        # Build the candidate beside the active state and commit it only after
+        # publication, so any failure leaves the store exactly as it was.
+        removed_positions = np.asarray(
+            sorted(self._dead.union(removed)), dtype=np.int64
+        )
+        index = self._index_without(self.index, removed_positions)
+        records = self._records.without(removed_positions.tolist())
+        index.add(vectors)
+        records.extend(new_records)
+        index = self._trained_index(index)
+        if index.ntotal != len(records):
+            raise CorruptSnapshotError(
+                f"FAISS index contains {index.ntotal} vectors but the store "
+                f"contains {len(records)} records after a removal."
             )
+        if self.snapshot_directory is not None:
+            # Deltas can only append, so removals always publish a new base.
+            self._write_atomic_snapshot(index, records)
 
-        if not vectors:
-            return np.empty((0, self.dimension), dtype=np.float32), []
-        return np.vstack(vectors).astype(np.float32, copy=False), records
+        self.index = index
+        self._index_is_mapped = False
+        self._records = records
+        self._dead = set()
+        self._shift_positions(removed_positions)
+        self._index_new_positions(new_records, len(records) - len(new_records))
+
+    def _ensure_writable_index(self) -> None:
+        if not self._index_is_mapped:
+            return
+        self.index = self._writable_copy(self.index)
+        self._index_is_mapped = False
+
+    def _writable_copy(self, index: faiss.Index) -> faiss.Index:
+        # FAISS aborts the process when mapped storage is resized, so copy it once.
+        copied = faiss.deserialize_index(faiss.serialize_index(index))
+        self._configure_index(copied)
+        return copied
+
+    def _publish_append(
+        self,
+        previous_index: faiss.Index,
+        vectors: NDArray[np.float32],
+        records: Sequence[Mapping[str, Any]],
+        start: int,
+        removed: Sequence[int],
+    ) -> None:
+        # A delta replays by adding vectors, so index training requires a new base;
+        # tombstones compact before either would publish one.
+        if (
+            not self._current_generations
+            or len(self._current_generations) > self.max_delta_generations
+            or previous_index is not self.index
+        ):
+            self._write_atomic_snapshot(self.index, self._records)
+        else:
+            self._write_delta_generation(vectors, records, start, removed)
+
+    def _new_index(self) -> faiss.Index:
+        if self.index_spec.index_type == "Flat" or self.index_spec.requires_training:
+            # Trained index types stage vectors exactly until training can run.
+            if self.metric == "inner_product":
+                return faiss.IndexFlatIP(self.dimension)
+            return faiss.IndexFlatL2(self.dimension)
+        index = faiss.index_factory(
+            self.dimension,
+            self.index_spec.factory_string(),
+            _FAISS_METRICS[self.metric],
+        )
+        self._configure_index(index)
+        return index
+
+    def _configure_index(self, index: faiss.Index) -> None:
+        ivf_index = faiss.try_extract_index_ivf(index)
+        if ivf_index is not None:
+            ivf_index.nprobe = self.index_spec.nprobe
+        if isinstance(index, faiss.IndexHNSW):
+            index.hnsw.efConstruction = self.index_spec.ef_construction
+            index.hnsw.efSearch = self.index_spec.ef_search
+
+    def _is_staging_index(self, index: faiss.Index) -> bool:
+        return (
+            self.index_spec.requires_training
+            and faiss.try_extract_index_ivf(index) is None
+        )
+
+    def _trained_index(self, index: faiss.Index) -> faiss.Index:
+        if (
+            not self._is_staging_index(index)
+            or index.ntotal < self.index_spec.minimum_training_vectors
+        ):
+            return index
+        vectors = index.reconstruct_n(0, index.ntotal)
+        trained = faiss.index_factory(
+            self.dimension,
+            self.index_spec.factory_string(),
+            _FAISS_METRICS[self.metric],
+        )
+        trained.train(vectors)
+        trained.add(vectors)
+        self._configure_index(trained)
+        return trained
+
+    def _index_without(
+        self, index: faiss.Index, removed: NDArray[np.int64]
+    ) -> faiss.Index:
+        if isinstance(index, faiss.IndexHNSW):
+            # HNSW graphs cannot remove vectors, so rebuild from the kept vectors.
+            keep = np.ones(index.ntotal, dtype=bool)
+            keep[removed] = False
+            rebuilt = self._new_index()
+            if keep.any():
+                rebuilt.add(index.reconstruct_n(0, index.ntotal)[keep])
+            return rebuilt
+        # Work on a copy so the active index serves searches until the commit.
+        copied = self._writable_copy(index)
+        copied.remove_ids(faiss.IDSelectorBatch(len(removed), faiss.swig_ptr(removed)))
+        ivf_index = faiss.try_extract_index_ivf(copied)
+        if ivf_index is not None:
+            # IVF lists keep their original ids, which are record positions, so
+            # shift every survivor down by the number of removed positions below it.
+            inverted_lists = ivf_index.invlists
+            for list_number in range(ivf_index.nlist):
+                size = inverted_lists.list_size(list_number)
+                if size:
+                    ids = faiss.rev_swig_ptr(inverted_lists.get_ids(list_number), size)
+                    ids -= np.searchsorted(removed, ids)
+        return copied
+
+    def _truncated_index(self, index: faiss.Index, count: int) -> faiss.Index:
+        if isinstance(index, faiss.IndexHNSW):
+            # HNSW graphs cannot remove vectors, so rebuild from the kept prefix.
+            rebuilt = self._new_index()
+            if count:
+                rebuilt.add(index.reconstruct_n(0, count))
+            return rebuilt
+        index.remove_ids(faiss.IDSelectorRange(count, index.ntotal))
+        return index
+
+    def _index_description(self, index: faiss.Index) -> dict[str, Any]:
+        return {
+            "type": self.index_spec.index_type,
+            "parameters": self.index_spec.structural_parameters(),
+            "trained": not self._is_staging_index(index),
+        }
 
-    def _set_records(self, records: Sequence[Mapping[str, Any]]) -> None:
-        self._records = [copy.deepcopy(dict(record)) for record in records]
-        self._records_by_id = {record["chunk_id"]: record for record in self._records}
+    def _distance_and_score(self, value: float) -> tuple[float, float]:
+        if self.metric == "inner_product":
+            return 1.0 - value, value
+        return value, -value
+
+    def _check_index_description(
+        self, index: faiss.Index, manifest: Mapping[str, Any]
+    ) -> None:
+        # Manifests written before index types were configurable describe flat indexes.
+        description = manifest.get(
+            "index", {"type": "Flat", "parameters": {}, "trained": True}
+        )
+        if not isinstance(description, dict):
+            raise CorruptSnapshotError("Snapshot index description must be an object.")
+        snapshot_type = description.get("type")
+        snapshot_parameters = description.get("parameters")
+        expected_parameters = self.index_spec.structural_parameters()
+        if (
+            snapshot_type != self.index_spec.index_type
+            or snapshot_parameters != expected_parameters
+        ):
+            raise IncompatibleSnapshotError(
+                f"Snapshot index {snapshot_type!r} with parameters "
+                f"{snapshot_parameters!r} does not match configured index "
+                f"{self.index_spec.index_type!r} with parameters "
+                f"{expected_parameters!r}."
+            )
+        trained = description.get("trained")
+        if not isinstance(trained, bool):
+            raise CorruptSnapshotError("Snapshot index training state is invalid.")
+        if not trained and not self.index_spec.requires_training:
+            raise CorruptSnapshotError(
+                f"Snapshot index {snapshot_type!r} cannot be untrained."
+            )
+        expected_class = (
+            faiss.IndexFlat
+            if not trained
+            else _INDEX_CLASSES[self.index_spec.index_type]
+        )
+        if not isinstance(index, expected_class):
+            raise CorruptSnapshotError(
+                "Snapshot index structure does not match its manifest description."
+            )
+        if index.metric_type != _FAISS_METRICS[self.metric]:
+            raise CorruptSnapshotError(
+                "Snapshot index metric does not match its manifest description."
+            )
+
+    def _set_records(
+        self,
+        records: records_module.RecordList,
+        chunk_ids: Sequence[str],
+        document_ids: Sequence[str],
+        dead: set[int],
+    ) -> None:
+        self._records = records
+        self._dead = dead
+        self._positions_by_id = {
+            chunk_id: position
+            for position, chunk_id in enumerate(chunk_ids)
+            if position not in dead
+        }
+        self._positions_by_document = {}
+        self._field_index = None
+        for position, document_id in enumerate(document_ids):
+            if position not in dead:
+                self._positions_by_document.setdefault(document_id, []).append(position)
+
+    def _index_new_positions(
+        self, records: Sequence[Mapping[str, Any]], start: int
+    ) -> None:
+        for offset, record in enumerate(records):
+            self._positions_by_id[record["chunk_id"]] = start + offset
+            self._positions_by_document.setdefault(
+                record["metadata"]["document_id"], []
+            ).append(start + offset)
+        if self._field_index is not None:
+            self._field_index.extend(records, start)
+
+    def _shift_positions(self, removed: NDArray[np.int64]) -> None:
+        # Positions stay dense, so survivors move down past each removed position.
+        removed_set = set(removed.tolist())
+        chunk_ids = [
+            chunk_id
+            for chunk_id, position in self._positions_by_id.items()
+            if position not in removed_set
+        ]
+        positions = np.fromiter(
+            (self._positions_by_id[chunk_id] for chunk_id in chunk_ids),
+            dtype=np.int64,
+            count=len(chunk_ids),
+        )
+        positions -= np.searchsorted(removed, positions)
+        self._positions_by_id = dict(zip(chunk_ids, positions.tolist(), strict=True))
+        shifted_documents: dict[str, list[int]] = {}
+        for document_id, document_positions in self._positions_by_document.items():
+            kept = np.asarray(
+                [
+                    position
+                    for position in document_positions
+                    if position not in removed_set
+                ],
+                dtype=np.int64,
+            )
+            if len(kept):
+                shifted_documents[document_id] = (
+                    kept - np.searchsorted(removed, kept)
+                ).tolist()
+        self._positions_by_document = shifted_documents
+        self._field_index = None
 
     def _validate_index_and_records(
         self, index: faiss.Index, records: Sequence[Mapping[str, Any]]
     ) -> None:
+        self._validate_index_size(index, len(records))
+        ids = [
+            self._validate_record(position, record)
+            for position, record in enumerate(records)
+        ]
+        self._check_duplicate_ids(ids)
+
+    def _validate_index_and_chunk_ids(
+        self,
+        index: faiss.Index,
+        chunk_ids: Sequence[Any],
+        dead: Set[int] = frozenset(),
+    ) -> None:
+        self._validate_index_size(index, len(chunk_ids))
+        for position, chunk_id in enumerate(chunk_ids):
+            self._validate_chunk_id(position, chunk_id)
+        # A replaced document may reuse the identifiers of its tombstoned chunks.
+        self._check_duplicate_ids(
+            chunk_id
+            for position, chunk_id in enumerate(chunk_ids)
+            if position not in dead
+        )
+
+    def _validate_index_size(self, index: faiss.Index, record_count: int) -> None:
         if index.d != self.dimension:
             raise DimensionMismatchError(
                 f"FAISS index dimension {index.d} does not match configured dimension "
                 f"{self.dimension}."
             )
-        if index.ntotal != len(records):
+        if index.ntotal != record_count:
             raise CorruptSnapshotError(
                 f"FAISS index contains {index.ntotal} vectors but snapshot contains "
-                f"{len(records)} records."
+                f"{record_count} records."
             )
 
-        ids: list[str] = []
-        for position, record in enumerate(records):
-            if not isinstance(record, Mapping):
-                raise CorruptSnapshotError(
-                    f"Snapshot record at position {position} is not an object."
-                )
-            chunk_id = record.get("chunk_id")
-            if not isinstance(chunk_id, str) or not chunk_id:
-                raise CorruptSnapshotError(
-                    f"Snapshot record at position {position} has an invalid chunk_id."
-                )
-            if not isinstance(record.get("text"), str):
-                raise CorruptSnapshotError(
-                    f"Snapshot record {chunk_id!r} has invalid text."
-                )
-            if not isinstance(record.get("metadata"), dict):
-                raise CorruptSnapshotError(
-                    f"Snapshot record {chunk_id!r} metadata is not a dictionary."
-                )
-            try:
-                ingestion.chunker.PDFChunker.validate_chunk(record)
-            except ingestion.chunker.InvalidChunkError as exc:
-                raise CorruptSnapshotError(
-                    f"Snapshot record {chunk_id!r} violates the shared chunk "
-                    f"schema: {exc}"
-                ) from exc
-            ids.append(chunk_id)
+    @staticmethod
+    def _validate_chunk_id(position: int, chunk_id: Any) -> str:
+        if not isinstance(chunk_id, str) or not chunk_id:
+            raise CorruptSnapshotError(
+                f"Snapshot record at position {position} has an invalid chunk_id."
+            )
+        return chunk_id
 
+    def _validate_record(self, position: int, record: Any) -> str:
+        if not isinstance(record, Mapping):
+            raise CorruptSnapshotError(
+                f"Snapshot record at position {position} is not an object."
+            )
+        chunk_id = self._validate_chunk_id(position, record.get("chunk_id"))
+        if not isinstance(record.get("text"), str):
+            raise CorruptSnapshotError(
+                f"Snapshot record {chunk_id!r} has invalid text."
+            )
+        if not isinstance(record.get("metadata"), dict):
+            raise CorruptSnapshotError(
+                f"Snapshot record {chunk_id!r} metadata is not a dictionary."
+            )
+        try:
+            ingestion.chunker.PDFChunker.validate_chunk(record)
+        except ingestion.chunker.InvalidChunkError as exc:
+            raise CorruptSnapshotError(
+                f"Snapshot record {chunk_id!r} violates the shared chunk "
+                f"schema: {exc}"
+            ) from exc
+        return chunk_id
+
+    @staticmethod
+    def _check_duplicate_ids(ids: Iterable[str]) -> None:
         duplicates = sorted(
             chunk_id for chunk_id, count in Counter(ids).items() if count > 1
         )
@@ -508,17 +1695,165 @@ class FAISSStore:
                 f"Snapshot contains duplicate chunk IDs: {duplicates}"
             )
 
-    def _manifest(self, records: Sequence[Mapping[str, Any]]) -> dict[str, Any]:
+    def _manifest(
+        self, index: faiss.Index, record_count: int, columns: Mapping[str, Any]
+    ) -> dict[str, Any]:
         return {
             "schema_version": SNAPSHOT_SCHEMA_VERSION,
+            "kind": "base",
             "embedding_dimension": self.dimension,
             "embedding_model": self.embedding_model,
+            "metric": self.metric,
             "index_filename": INDEX_FILENAME,
-            "records": [copy.deepcopy(dict(record)) for record in records],
+            "index": self._index_description(index),
+            "record_count": record_count,
+            "columns": dict(columns),
+        }
+
+    def _delta_manifest(
+        self,
+        base_name: str,
+        start: int,
+        record_count: int,
+        columns: Mapping[str, Any],
+        removed: Sequence[int],
+    ) -> dict[str, Any]:
+        return {
+            "schema_version": SNAPSHOT_SCHEMA_VERSION,
+            "kind": "delta",
+            "base": base_name,
+            "start": start,
+            "removed": list(removed),
+            "embedding_dimension": self.dimension,
+            "embedding_model": self.embedding_model,
+            "metric": self.metric,
+            "vectors_filename": VECTORS_FILENAME,
+            "record_count": record_count,
+            "columns": dict(columns),
         }
 
+    @staticmethod
+    def _write_record_columns(
+        directory: Path, records: Sequence[Mapping[str, Any]]
+    ) -> dict[str, Any]:
+        return {
+            "chunk_id": columns_module.write_string_column(
+                directory, "chunk_id", (record["chunk_id"] for record in records)
+            ),
+            "document_id": columns_module.write_string_column(
+                directory,
+                "document_id",
+                (record["metadata"]["document_id"] for record in records),
+            ),
+            "text": columns_module.write_string_column(
+                directory, "text", (record["text"] for record in records)
+            ),
+            "metadata": columns_module.write_string_column(
+                directory,
+                "metadata",
+                (
+                    json.dumps(
+                        record["metadata"], ensure_ascii=False, separators=(",", ":")
+                    )
+                    for record in records
+                ),
+            ),
+        }
+
+    @staticmethod
+    def _write_manifest(directory: Path, manifest: Mapping[str, Any]) -> None:
+        with (directory / MANIFEST_FILENAME).open("w", encoding="utf-8") as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _column_row_loader(
+        self,
+        chunk_ids: Sequence[str],
+        document_ids: Sequence[str],
+        texts: columns_module.StringColumn,
+        metadata: columns_module.StringColumn,
+    ) -> Callable[[int], records_module.ReadOnlyDict]:
+        def load_row(position: int) -> records_module.ReadOnlyDict:
+            try:
+                record = {
+                    "chunk_id": chunk_ids[position],
+                    "text": texts[position],
+                    "metadata": json.loads(metadata[position]),
+                }
+            except ValueError as exc:
+                raise CorruptSnapshotError(
+                    f"Could not decode snapshot record at position {position}: {exc}"
+                ) from exc
+            chunk_id = self._validate_record(position, record)
+            if record["metadata"]["document_id"] != document_ids[position]:
+                raise CorruptSnapshotError(
+                    f"Snapshot record {chunk_id!r} does not match its document_id "
+                    "column."
+                )
+            return cast(records_module.ReadOnlyDict, records_module.freeze(record))
+
+        return load_row
+
     def _write_atomic_snapshot(
         self, index: faiss.Index, records: Sequence[Mapping[str, Any]]
+    ) -> None:
+        def write(directory: Path) -> None:
+            with (directory / INDEX_FILENAME).open("wb") as index_file:
+                index_file.write(faiss.serialize_index(index))
+                index_file.flush()
+                os.fsync(index_file.fileno())
+            columns = self._write_record_columns(directory, records)
+            self._write_manifest(
+                directory, self._manifest(index, len(records), columns)
+            )
+
+        def verify(directory: Path) -> None:
+            candidate_index, candidate_records, _, _ = self._read_generation(directory)
+            self._validate_index_and_records(candidate_index, candidate_records)
+
+        self._publish_generation("snapshot", write, verify, ())
+
+    def _write_delta_generation(
+        self,
+        vectors: NDArray[np.float32],
+        records: Sequence[Mapping[str, Any]],
+        start: int,
+        removed: Sequence[int],
+    ) -> None:
+        chain = self._current_generations
+        base_name = chain[0]
+
+        def write(directory: Path) -> None:
+            with (directory / VECTORS_FILENAME).open("wb") as vectors_file:
+                np.save(vectors_file, vectors, allow_pickle=False)
+                vectors_file.flush()
+                os.fsync(vectors_file.fileno())
+            columns = self._write_record_columns(directory, records)
+            self._write_manifest(
+                directory,
+                self._delta_manifest(base_name, start, len(records), columns, removed),
+            )
+
+        def verify(directory: Path) -> None:
+            _, (chunk_ids, _), load_row, persisted_removed = self._read_delta(
+                directory, base_name, start
+            )
+            if persisted_removed != list(removed):
+                raise CorruptSnapshotError(
+                    f"Snapshot delta {directory} lost its removed positions."
+                )
+            for position in range(len(chunk_ids)):
+                load_row(position)
+
+        self._publish_generation("delta", write, verify, chain)
+
+    def _publish_generation(
+        self,
+        prefix: str,
+        write: Callable[[Path], None],
+        verify: Callable[[Path], None],
+        chain: Sequence[str],
     ) -> None:
         assert self.snapshot_directory is not None
         root = self.snapshot_directory
@@ -526,35 +1861,17 @@ class FAISSStore:
         root.mkdir(parents=True, exist_ok=True)
         snapshots_directory.mkdir(exist_ok=True)
 
-        generation_name = f"snapshot-{uuid.uuid4().hex}"
+        generation_name = f"{prefix}-{uuid.uuid4().hex}"
         pending_directory = root / f".pending-{uuid.uuid4().hex}"
         pending_directory.mkdir()
         generation_directory = snapshots_directory / generation_name
         pointer_temporary: Path | None = None
+        generations = (*chain, generation_name)
 
         try:
-            index_path = pending_directory / INDEX_FILENAME
-            serialised_index = faiss.serialize_index(index)
-            with index_path.open("wb") as index_file:
-                index_file.write(np.asarray(serialised_index, dtype=np.uint8).tobytes())
-                index_file.flush()
-                os.fsync(index_file.fileno())
-            manifest_path = pending_directory / MANIFEST_FILENAME
-            with manifest_path.open("w", encoding="utf-8") as manifest_file:
-                json.dump(
-                    self._manifest(records),
-                    manifest_file,
-                    ensure_ascii=False,
-                    indent=2,
-                )
-                manifest_file.flush()
-                os.fsync(manifest_file.fileno())
-
+            write(pending_directory)
             # Verify exactly what will become visible before moving the generation.
-            candidate_index, candidate_records, _ = self._read_generation(
-                pending_directory
-            )
-            self._validate_index_and_records(candidate_index, candidate_records)
+            verify(pending_directory)
 
             os.replace(pending_directory, generation_directory)
 
@@ -563,11 +1880,12 @@ class FAISSStore:
             )
             pointer_temporary = Path(temporary_name)
             with os.fdopen(file_descriptor, "w", encoding="utf-8") as pointer_file:
-                pointer_file.write(generation_name)
+                pointer_file.write("\n".join(generations))
                 pointer_file.flush()
                 os.fsync(pointer_file.fileno())
             os.replace(pointer_temporary, root / CURRENT_FILENAME)
             pointer_temporary = None
+            self._current_generations = generations
         except FAISSStoreError:
             raise
         except (OSError, ValueError, TypeError, RuntimeError) as exc:
@@ -578,9 +1896,29 @@ class FAISSStore:
             if pointer_temporary is not None and pointer_temporary.exists():
                 pointer_temporary.unlink(missing_ok=True)
 
-    def _read_generation(
-        self, generation_directory: Path
-    ) -> tuple[faiss.Index, list[dict[str, Any]], dict[str, Any]]:
+        # The publication is complete; a failed sweep must not roll it back.
+        try:
+            self.collect_garbage()
+        except FAISSStoreError as exc:
+            _LOGGER.warning("Snapshot garbage collection failed: %s", exc)
+
+    def _read_current_pointer(self) -> tuple[str, ...]:
+        assert self.snapshot_directory is not None
+        return _read_current_pointer(self.snapshot_directory)
+
+    @staticmethod
+    def _read_manifest(generation_directory: Path) -> Any:
+        with (generation_directory / MANIFEST_FILENAME).open(
+            "r", encoding="utf-8"
+        ) as manifest_file:
+            return json.load(manifest_file)
+
+    def _read_generation(self, generation_directory: Path) -> tuple[
+        faiss.Index,
+        Sequence[Mapping[str, Any]],
+        tuple[list[str], list[str]] | None,
+        dict[str, Any],
+    ]:
         index_path = generation_directory / INDEX_FILENAME
         manifest_path = generation_directory / MANIFEST_FILENAME
         if not index_path.is_file() or not manifest_path.is_file():
@@ -590,12 +1928,10 @@ class FAISSStore:
             )
 
         try:
-            with manifest_path.open("r", encoding="utf-8") as manifest_file:
-                manifest = json.load(manifest_file)
-            serialised_index = np.frombuffer(index_path.read_bytes(), dtype=np.uint8)
-            if not serialised_index.size:
+            manifest = self._read_manifest(generation_directory)
+            if not index_path.stat().st_size:
                 raise ValueError("FAISS index file is empty")
-            index = faiss.deserialize_index(serialised_index.copy())
+            index = faiss.read_index(str(index_path), faiss.IO_FLAG_MMAP_IFC)
         except (
             OSError,
             ValueError,
@@ -613,7 +1949,203 @@ class FAISSStore:
             raise CorruptSnapshotError(
                 f"Snapshot index filename must be {INDEX_FILENAME!r}."
             )
-        records = manifest.get("records")
-        if not isinstance(records, list):
-            raise CorruptSnapshotError("Snapshot records must be a JSON array.")
-        return index, records, manifest
+        schema_version = manifest.get("schema_version")
+        if schema_version == _LEGACY_SNAPSHOT_SCHEMA_VERSION:
+            # Schema 1 stores every record inline and is validated eagerly.
+            records = manifest.get("records")
+            if not isinstance(records, list):
+                raise CorruptSnapshotError("Snapshot records must be a JSON array.")
+            return index, records, None, manifest
+        if schema_version not in _COLUMNAR_SNAPSHOT_SCHEMA_VERSIONS:
+            raise IncompatibleSnapshotError(
+                f"Unsupported snapshot schema {schema_version!r}; expected "
+                f"{SNAPSHOT_SCHEMA_VERSION}, 2, or {_LEGACY_SNAPSHOT_SCHEMA_VERSION}."
+            )
+        if manifest.get("kind", "base") != "base":
+            raise CorruptSnapshotError(
+                f"Snapshot generation {generation_directory} is not a base generation."
+            )
+
+        identities, load_row = self._read_record_columns(generation_directory, manifest)
+        records = records_module.RecordList.from_rows(len(identities[0]), load_row)
+        return index, records, identities, manifest
+
+    def _read_delta(
+        self, generation_directory: Path, base_name: str, start: int
+    ) -> tuple[
+        NDArray[np.float32],
+        tuple[list[str], list[str]],
+        Callable[[int], records_module.ReadOnlyDict],
+        list[int],
+    ]:
+        vectors_path = generation_directory / VECTORS_FILENAME
+        if (
+            not vectors_path.is_file()
+            or not (generation_directory / MANIFEST_FILENAME).is_file()
+        ):
+            raise CorruptSnapshotError(
+                f"Snapshot delta {generation_directory} is incomplete; both "
+                f"{VECTORS_FILENAME} and {MANIFEST_FILENAME} are required."
+            )
+        try:
+            manifest = self._read_manifest(generation_directory)
+            vectors = np.load(vectors_path, mmap_mode="r", allow_pickle=False)
+        except (OSError, ValueError, TypeError) as exc:
+            raise CorruptSnapshotError(
+                f"Could not read snapshot delta {generation_directory}: {exc}"
+            ) from exc
+        if not isinstance(manifest, dict):
+            raise CorruptSnapshotError("Snapshot manifest must be a JSON object.")
+
+        schema_version = manifest.get("schema_version")
+        if schema_version not in _COLUMNAR_SNAPSHOT_SCHEMA_VERSIONS:
+            raise IncompatibleSnapshotError(
+                f"Unsupported snapshot delta schema {schema_version!r}; expected "
+                f"{SNAPSHOT_SCHEMA_VERSION} or 2."
+            )
+        expected = {
+            "kind": "delta",
+            "base": base_name,
+            "start": start,
+            "embedding_dimension": self.dimension,
+            "embedding_model": self.embedding_model,
+            "metric": self.metric,
+            "vectors_filename": VECTORS_FILENAME,
+        }
+        mismatched = sorted(
+            key for key, value in expected.items() if manifest.get(key) != value
+        )
+        if mismatched:
+            raise CorruptSnapshotError(
+                f"Snapshot delta {generation_directory} does not continue its chain; "
+                f"mismatched fields: {mismatched}"
+            )
+        # Schema-2 deltas predate tombstones and only append.
+        removed = manifest.get("removed", [] if schema_version == 2 else None)
+        if (
+            not isinstance(removed, list)
+            or any(type(position) is not int for position in removed)
+            or any(not 0 <= position < start for position in removed)
+            or any(first >= second for first, second in zip(removed, removed[1:]))
+        ):
+            raise CorruptSnapshotError(
+                f"Snapshot delta {generation_directory} must list strictly "
+                f"increasing removed positions below {start}."
+            )
+
+        identities, load_row = self._read_record_columns(generation_directory, manifest)
+        chunk_ids = identities[0]
+        if vectors.dtype != np.float32 or vectors.shape != (
+            len(chunk_ids),
+            self.dimension,
+        ):
+            raise CorruptSnapshotError(
+                f"Snapshot delta vectors have shape {vectors.shape} and dtype "
+                f"{vectors.dtype}; expected ({len(chunk_ids)}, {self.dimension}) "
+                "float32."
+            )
+        return vectors, identities, load_row, removed
+
+    def _read_record_columns(
+        self, generation_directory: Path, manifest: Mapping[str, Any]
+    ) -> tuple[
+        tuple[list[str], list[str]], Callable[[int], records_module.ReadOnlyDict]
+    ]:
+        record_count = manifest.get("record_count")
+        descriptions = manifest.get("columns")
+        if not isinstance(record_count, int) or not isinstance(descriptions, dict):
+            raise CorruptSnapshotError(
+                "Snapshot manifest must describe its record count and columns."
+            )
+        try:
+            chunk_id_column, document_id_column, texts, metadata = (
+                columns_module.StringColumn.open(
+                    generation_directory, descriptions.get(name)
+                )
+                for name in _RECORD_COLUMNS
+            )
+            # Identities are read eagerly to build the position indexes.
+            chunk_ids = list(chunk_id_column)
+            document_ids = list(document_id_column)
+        except (OSError, ValueError, TypeError) as exc:
+            raise CorruptSnapshotError(
+                f"Could not read snapshot columns in {generation_directory}: {exc}"
+            ) from exc
+        if (
+            not len(chunk_ids)
+            == len(document_ids)
+            == len(texts)
+            == len(metadata)
+            == record_count
+        ):
+            raise CorruptSnapshotError(
+                f"Snapshot columns do not all contain {record_count} records."
+            )
+        for position, document_id in enumerate(document_ids):
+            if not document_id:
+                raise CorruptSnapshotError(
+                    f"Snapshot record at position {position} has an empty "
+                    "document_id."
+                )
+        # Every metadata row is a JSON object, so framing is checked undecoded.
+        if not metadata.rows_are_enclosed(b"{", b"}"):
+            raise CorruptSnapshotError(
+                f"Snapshot metadata column in {generation_directory} contains a "
+                "row that is not a JSON object."
+            )
+        return (chunk_ids, document_ids), self._column_row_loader(
+            chunk_ids, document_ids, texts, metadata
+        )
+
+
+def _read_current_pointer(snapshot_directory: Path) -> tuple[str, ...]:
+    current_path = snapshot_directory / CURRENT_FILENAME
+    try:
+        pointer = current_path.read_text(encoding="utf-8")
+    except FileNotFoundError as exc:
+        raise SnapshotNotFoundError(
+            f"No snapshot pointer found at {current_path}."
+        ) from exc
+    except OSError as exc:
+        raise CorruptSnapshotError(
+            f"Could not read snapshot pointer {current_path}: {exc}"
+        ) from exc
+
+    # The first line names a base generation; later lines name its deltas.
+    generations = tuple(line.strip() for line in pointer.strip().splitlines())
+    for position, generation_name in enumerate(generations):
+        prefix = "snapshot-" if position == 0 else "delta-"
+        if (
+            not generation_name.startswith(prefix)
+            or Path(generation_name).name != generation_name
+        ):
+            raise CorruptSnapshotError(
+                f"Invalid snapshot generation name: {generation_name!r}."
+            )
+    if not generations:
+        raise CorruptSnapshotError(f"Snapshot pointer {current_path} is empty.")
+    return generations
+
+
+def _delta_base(delta_directory: Path) -> str | None:
+    try:
+        with (delta_directory / MANIFEST_FILENAME).open(
+            "r", encoding="utf-8"
+        ) as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        # An unreadable delta cannot be replayed and is always collectable.
+        return None
+    base = manifest.get("base") if isinstance(manifest, dict) else None
+    return base if isinstance(base, str) else None
+
+
+def _remove_path(path: Path) -> None:
+    try:
+        if path.is_dir() and not path.is_symlink():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    except FileNotFoundError:
+        # A concurrent sweep already removed it.
+        return
@@ -0,0 +1,200 @@
+"""
+===============================================================================
+vectorstore_filters.py
+===============================================================================
+Describe metadata-filtered searches and resolve them to record positions.
+
+Responsibilities:
+  - Validate immutable search filters over document, page, source type, and
+    document language.
+  - Keep per-field inverted position lists for the filterable metadata.
+  - Combine filter predicates into one boolean position mask.
+
+Design principles:
+  - Index records once and resolve each filter in time proportional to its
+    matching positions instead of rescanning stored records.
+  - Treat a record without a filtered field as not matching that predicate.
+
+Boundaries:
+  - Does not call FAISS, own vectors, or decide how a mask is searched.
+  - Document positions are owned by the store and passed in per call.
+===============================================================================
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+__all__ = ["FieldIndex", "SearchFilter"]
+
+
+@dataclass(frozen=True)
+class SearchFilter:
+    """Restrict a search to records whose metadata satisfies every predicate.
+
+    Parameters
+    ----------
+    document_ids
+        Optional ``metadata["document_id"]`` values, any of which may match.
+    page_range
+        Optional inclusive ``(first, last)`` range of ``metadata["page_number"]``.
+    source_types
+        Optional ``metadata["source_type"]`` values, such as ``"table"``.
+    document_languages
+        Optional ``metadata["document_language"]`` codes, such as ``"en"``.
+
+    Raises
+    ------
+    TypeError
+        If a value collection is a single string or is not iterable.
+    ValueError
+        If a value collection is empty or holds a non-string or empty value, or
+        if the page range is not an ordered pair of non-negative integers.
+
+    Notes
+    -----
+    Omitted predicates match every record. Value collections are stored as
+    ``frozenset`` instances so filters are hashable.
+    """
+
+    document_ids: Collection[str] | None = None
+    page_range: tuple[int, int] | None = None
+    source_types: Collection[str] | None = None
+    document_languages: Collection[str] | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("document_ids", "source_types", "document_languages"):
+            values = getattr(self, name)
+            if values is None:
+                continue
+            if isinstance(values, str) or not isinstance(values, Iterable):
+                raise TypeError(f"{name} must be a collection of strings")
+            frozen = frozenset(values)
+            if not frozen or not all(
+                isinstance(value, str) and value for value in frozen
+            ):
+                raise ValueError(f"{name} must contain non-empty strings")
+            object.__setattr__(self, name, frozen)
+        if self.page_range is not None:
+            page_range = tuple(self.page_range)
+            if (
+                len(page_range) != 2
+                or not all(type(page) is int and page >= 0 for page in page_range)
+                or page_range[0] > page_range[1]
+            ):
+                raise ValueError(
+                    "page_range must be an ordered pair of non-negative integers"
+                )
+            object.__setattr__(self, "page_range", page_range)
+
+
+class FieldIndex:
+    """Map filterable metadata values to ascending record positions.
+
+    Notes
+    -----
+    Positions are appended in increasing order, so each list stays sorted and
+    can be handed to NumPy fancy indexing without copying or sorting.
+    """
+
+    __slots__ = ("_languages", "_pages", "_source_types")
+
+    def __init__(self) -> None:
+        self._pages: dict[int, list[int]] = {}
+        self._source_types: dict[str, list[int]] = {}
+        self._languages: dict[str, list[int]] = {}
+
+    @classmethod
+    def build(cls, records: Iterable[Mapping[str, Any]]) -> FieldIndex:
+        """Index every record in position order."""
+
+        index = cls()
+        index.extend(records, 0)
+        return index
+
+    def extend(self, records: Iterable[Mapping[str, Any]], start: int) -> None:
+        """Index records appended at consecutive positions from ``start``."""
+
+        for position, record in enumerate(records, start):
+            metadata = record["metadata"]
+            page = metadata.get("page_number")
+            if type(page) is int:
+                self._pages.setdefault(page, []).append(position)
+            self._source_types.setdefault(metadata["source_type"], []).append(position)
+            language = metadata.get("document_language")
+            if isinstance(language, str):
+                self._languages.setdefault(language, []).append(position)
+
+    def mask(
+        self,
+        search_filter: SearchFilter,
+        document_positions: Mapping[str, Sequence[int]],
+        count: int,
+    ) -> NDArray[np.bool_]:
+        """Return which of ``count`` positions satisfy ``search_filter``.
+
+        Parameters
+        ----------
+        search_filter
+            Predicates that every selected record must satisfy.
+        document_positions
+            Store-owned positions of each document's records.
+        count
+            Number of stored records.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask of length ``count``.
+        """
+
+        selected = np.ones(count, dtype=bool)
+        if search_filter.document_ids is not None:
+            self._restrict(
+                selected,
+                (
+                    document_positions.get(document_id, ())
+                    for document_id in search_filter.document_ids
+                ),
+            )
+        if search_filter.page_range is not None:
+            first, last = search_filter.page_range
+            self._restrict(
+                selected,
+                (
+                    positions
+                    for page, positions in self._pages.items()
+                    if first <= page <= last
+                ),
+            )
+        if search_filter.source_types is not None:
+            self._restrict(
+                selected,
+                (
+                    self._source_types.get(source_type, ())
+                    for source_type in search_filter.source_types
+                ),
+            )
+        if search_filter.document_languages is not None:
+            self._restrict(
+                selected,
+                (
+                    self._languages.get(language, ())
+                    for language in search_filter.document_languages
+                ),
+            )
+        return selected
+
+    @staticmethod
+    def _restrict(
+        selected: NDArray[np.bool_], position_lists: Iterable[Sequence[int]]
+    ) -> None:
+        matching = np.zeros(len(selected), dtype=bool)
+        for positions in position_lists:
+            matching[np.asarray(positions, dtype=np.int64)] = True
+        selected &= matching
@@ -0,0 +1,223 @@
+"""
+===============================================================================
+vectorstore_records.py
+===============================================================================
+Represent stored vector records as immutable, JSON-compatible views.
+
+Responsibilities:
+  - Freeze record text and nested metadata once when a store takes ownership.
+  - Return plain mutable copies whenever a frozen view is copied or pickled.
+  - Hold records in position order, materialising persisted rows on first use.
+
+Design principles:
+  - Subclass ``dict`` and ``list`` so views compare, serialize, and type-check
+    exactly like the canonical chunk schema.
+  - Share frozen values between search results instead of deep-copying them.
+
+Boundaries:
+  - Guards against accidental mutation, not deliberate bypass through C-level
+    ``dict`` or ``list`` methods.
+  - Does not validate the chunk schema or own vector data.
+===============================================================================
+"""
+
+from __future__ import annotations
+
+import copy
+from bisect import bisect_right
+from collections.abc import Callable, Iterable, Iterator, Mapping, MutableSequence
+from typing import Any, NoReturn, overload
+
+__all__ = ["ReadOnlyDict", "ReadOnlyList", "RecordList", "freeze"]
+
+
+def _read_only(*_args: Any, **_kwargs: Any) -> NoReturn:
+    raise TypeError("Stored vector records are read-only; copy them to modify.")
+
+
+class ReadOnlyDict(dict):
+    """Expose a dictionary whose mutating methods raise ``TypeError``.
+
+    Notes
+    -----
+    ``copy.copy``, ``copy.deepcopy``, and pickling produce plain ``dict`` values,
+    so callers that need to modify a record can obtain an ordinary copy.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> dict[Any, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[Any, Any]:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (dict, (dict(self),))
+
+
+class ReadOnlyList(list):
+    """Expose a list whose mutating methods raise ``TypeError``.
+
+    Notes
+    -----
+    ``copy.copy``, ``copy.deepcopy``, and pickling produce plain ``list`` values.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (list, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only copy of a JSON-like value.
+
+    Parameters
+    ----------
+    value
+        Mapping, list, tuple, or scalar value, possibly nested.
+
+    Returns
+    -------
+    Any
+        Nested :class:`ReadOnlyDict` and :class:`ReadOnlyList` views, tuples of
+        frozen items, or a private deep copy of any other object.
+
+    Notes
+    -----
+    Already frozen values are returned unchanged, so freezing a stored record a
+    second time costs no copy.
+    """
+
+    if isinstance(value, (ReadOnlyDict, ReadOnlyList)):
+        return value
+    if isinstance(value, Mapping):
+        return ReadOnlyDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return ReadOnlyList(freeze(item) for item in value)
+    if isinstance(value, tuple):
+        return tuple(freeze(item) for item in value)
+    if value is None or isinstance(value, (str, int, float, bool, bytes)):
+        return value
+    return copy.deepcopy(value)
+
+
+class RecordList(MutableSequence[ReadOnlyDict]):
+    """Hold stored records in FAISS position order.
+
+    Parameters
+    ----------
+    records
+        Already frozen records to hold in order.
+
+    Notes
+    -----
+    :meth:`from_rows` and :meth:`extend_rows` reserve positions for persisted rows
+    that a loader decodes on first access and then caches, so opening a large
+    snapshot does not decode records that are never read.
+    """
+
+    __slots__ = ("_items", "_next_row", "_row_loaders", "_row_starts")
+
+    def __init__(self, records: Iterable[ReadOnlyDict] = ()) -> None:
+        # Integer items are persisted row numbers that have not been decoded yet.
+        self._items: list[ReadOnlyDict | int] = list(records)
+        self._next_row = 0
+        self._row_starts: list[int] = []
+        self._row_loaders: list[Callable[[int], ReadOnlyDict]] = []
+
+    @classmethod
+    def from_rows(
+        cls, count: int, load_row: Callable[[int], ReadOnlyDict]
+    ) -> RecordList:
+        """Reserve ``count`` positions whose records ``load_row`` decodes lazily."""
+
+        records = cls()
+        records.extend_rows(count, load_row)
+        return records
+
+    def extend_rows(self, count: int, load_row: Callable[[int], ReadOnlyDict]) -> None:
+        """Append ``count`` lazy rows that ``load_row`` decodes from zero upward."""
+
+        first = self._next_row
+        self._items.extend(range(first, first + count))
+        self._row_starts.append(first)
+        self._row_loaders.append(load_row)
+        self._next_row = first + count
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @overload
+    def __getitem__(self, index: int) -> ReadOnlyDict: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ReadOnlyDict]: ...
+
+    def __getitem__(self, index: int | slice) -> ReadOnlyDict | list[ReadOnlyDict]:
+        if isinstance(index, slice):
+            return [self._resolve(position) for position in range(len(self))[index]]
+        return self._resolve(range(len(self))[index])
+
+    @overload
+    def __setitem__(self, index: int, value: ReadOnlyDict) -> None: ...
+
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[ReadOnlyDict]) -> None: ...
+
+    def __setitem__(self, index: int | slice, value: Any) -> None:
+        self._items[index] = value
+
+    def __delitem__(self, index: int | slice) -> None:
+        del self._items[index]
+
+    def __iter__(self) -> Iterator[ReadOnlyDict]:
+        for position in range(len(self._items)):
+            yield self._resolve(position)
+
+    def without(self, positions: Iterable[int]) -> RecordList:
+        """Return a copy without ascending ``positions``, keeping lazy rows lazy."""
+
+        records = RecordList()
+        records._next_row = self._next_row
+        records._row_starts = list(self._row_starts)
+        records._row_loaders = list(self._row_loaders)
+        previous = 0
+        for position in positions:
+            records._items.extend(self._items[previous:position])
+            previous = position + 1
+        records._items.extend(self._items[previous:])
+        return records
+
+    def load_all(self) -> None:
+        """Decode every lazy row now, raising whatever its loader raises."""
+
+        for position in range(len(self._items)):
+            self._resolve(position)
+
+    def insert(self, index: int, value: ReadOnlyDict) -> None:
+        self._items.insert(index, value)
+
+    def extend(self, values: Iterable[ReadOnlyDict]) -> None:
+        self._items.extend(values)
+
+    def _resolve(self, position: int) -> ReadOnlyDict:
+        item = self._items[position]
+        if isinstance(item, int):
+            segment = bisect_right(self._row_starts, item) - 1
+            item = self._row_loaders[segment](item - self._row_starts[segment])
+            self._items[position] = item
+        return item
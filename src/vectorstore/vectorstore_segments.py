@@ -0,0 +1,635 @@
+"""
+===============================================================================
+vectorstore_segments.py
+===============================================================================
+Share immutable per-document FAISS segments between session-owned stores.
+
+Responsibilities:
+  - Cache one indexed segment per document identifier and vector content.
+  - Present a session's documents as one store that references shared segments.
+  - Merge per-segment nearest neighbours into one globally ordered result list,
+    or search one combined index when the index family needs training.
+
+Design principles:
+  - Never mutate a published segment; sessions change only their own references.
+  - Hold segments weakly so a document no session references is released.
+
+Boundaries:
+  - Segments are in-memory stores; persistence stays in ``vectorstore_faiss``.
+===============================================================================
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import threading
+import weakref
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from itertools import chain
+from operator import itemgetter
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from . import vectorstore_faiss as faiss_module
+from . import vectorstore_filters as filters_module
+
+__all__ = ["SegmentCache", "SegmentStore"]
+
+
+class SegmentCache:
+    """Share indexed document segments across the stores of one process.
+
+    Parameters
+    ----------
+    dimension
+        Positive embedding dimension of every cached segment.
+    embedding_model
+        Non-empty model identifier recorded by every cached segment.
+    index_spec
+        Optional FAISS index family and parameters for each segment.
+    metric
+        ``l2`` or ``inner_product`` distance used by every segment.
+
+    Raises
+    ------
+    ValueError
+        If the store configuration is invalid.
+
+    Notes
+    -----
+    Segments are keyed by the SHA-256 ``document_id`` that ingestion derives from
+    uploaded bytes together with a SHA-256 digest of the complete records and
+    the prepared ``float32`` matrix. Every session holding the same document
+    under the same name references one index and one set of read-only records,
+    while a copy uploaded under another file name, or embedded differently,
+    gets its own segment and never sees another upload's metadata or vectors.
+    The cache is thread-safe and keeps a segment only while some store
+    references it.
+    """
+
+    def __init__(
+        self,
+        *,
+        dimension: int,
+        embedding_model: str,
+        index_spec: faiss_module.FAISSIndexSpec | None = None,
+        metric: faiss_module.VectorMetric = "l2",
+    ) -> None:
+        """Validate the shared configuration and create an empty cache."""
+
+        self.dimension = dimension
+        self.embedding_model = embedding_model
+        self.index_spec = index_spec
+        self.metric: faiss_module.VectorMetric = metric
+        # An empty store validates configuration now and queries for empty views.
+        self._empty_segment = self._new_store()
+        self._segments: weakref.WeakValueDictionary[
+            tuple[str, str], faiss_module.FAISSStore
+        ] = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of segments currently referenced by any store."""
+
+        with self._lock:
+            return len(self._segments)
+
+    @property
+    def empty_segment(self) -> faiss_module.FAISSStore:
+        """Return the shared read-only segment that holds no records.
+
+        Searching it validates a query exactly like a populated segment and
+        returns no hits, which serves stores that reference no documents.
+        """
+
+        return self._empty_segment
+
+    def segment(
+        self, document_id: str, embedded_chunks: Sequence[Mapping[str, Any]]
+    ) -> faiss_module.FAISSStore:
+        """Return the shared segment for one document, indexing it if needed.
+
+        Parameters
+        ----------
+        document_id
+            Content-derived identifier shared by every chunk.
+        embedded_chunks
+            Canonical embedded chunks of exactly this document.
+
+        Returns
+        -------
+        FAISSStore
+            Read-only segment; callers must not mutate it.
+
+        Raises
+        ------
+        InvalidVectorRecordError
+            If a chunk is invalid or belongs to another document.
+        DimensionMismatchError
+            If an embedding does not match the configured dimension.
+        DuplicateChunkIDError
+            If chunk identifiers repeat within the document.
+
+        Notes
+        -----
+        A cached segment is reused only when its records, including metadata
+        such as ``file_name``, and its vectors equal the supplied ones;
+        otherwise the chunks get their own segment.
+        """
+
+        return self._shared_segment(
+            self._content_key(
+                document_id,
+                embedded_chunks,
+                [
+                    chunk.get("embedding") if isinstance(chunk, Mapping) else None
+                    for chunk in embedded_chunks
+                ],
+            ),
+            lambda segment: segment.replace_document(document_id, embedded_chunks),
+        )
+
+    def vector_segment(
+        self,
+        document_id: str,
+        vectors: NDArray[np.float32] | Sequence[Sequence[float]],
+        records: Sequence[Mapping[str, Any]],
+    ) -> faiss_module.FAISSStore:
+        """Return the shared segment for one document prepared as a matrix.
+
+        Parameters
+        ----------
+        document_id
+            Content-derived identifier shared by every record.
+        vectors
+            Embedding matrix whose row ``i`` embeds ``records[i]``.
+        records
+            Canonical chunks of exactly this document, without embeddings.
+
+        Returns
+        -------
+        FAISSStore
+            Read-only segment; callers must not mutate it.
+
+        Raises
+        ------
+        InvalidVectorRecordError
+            If a record or vector is invalid or a record belongs to another
+            document.
+        DimensionMismatchError
+            If the matrix shape does not match the records and dimension.
+        DuplicateChunkIDError
+            If chunk identifiers repeat within the document.
+
+        Notes
+        -----
+        Reuse follows :meth:`segment`; a cached segment is returned after
+        hashing ``vectors`` but without indexing them.
+        """
+
+        def build(segment: faiss_module.FAISSStore) -> None:
+            segment.add_vectors(vectors, records)
+            foreign = sorted(
+                {record["metadata"]["document_id"] for record in segment.records}
+                - {document_id}
+            )
+            if foreign:
+                raise faiss_module.InvalidVectorRecordError(
+                    f"Records for document {document_id!r} belong to other "
+                    f"documents: {foreign}"
+                )
+
+        return self._shared_segment(
+            self._content_key(document_id, records, vectors), build
+        )
+
+    def _shared_segment(
+        self,
+        key: tuple[str, str] | None,
+        build: Callable[[faiss_module.FAISSStore], object],
+    ) -> faiss_module.FAISSStore:
+        if key is not None:
+            with self._lock:
+                cached = self._segments.get(key)
+            if cached is not None:
+                return cached
+
+        segment = self._new_store()
+        build(segment)
+        if key is None:
+            return segment
+        with self._lock:
+            # Another session may have indexed the same content concurrently.
+            return self._segments.setdefault(key, segment)
+
+    def _new_store(self) -> faiss_module.FAISSStore:
+        return faiss_module.FAISSStore(
+            dimension=self.dimension,
+            embedding_model=self.embedding_model,
+            index_spec=self.index_spec,
+            metric=self.metric,
+        )
+
+    @staticmethod
+    def _content_key(
+        document_id: str, chunks: Sequence[Any], vectors: Any
+    ) -> tuple[str, str] | None:
+        if not all(isinstance(chunk, Mapping) for chunk in chunks):
+            # Building such chunks fails validation, so there is nothing to share.
+            return None
+        try:
+            # Records are hashed whole: equal bytes uploaded under other names
+            # carry another file_name and must not share its citations.
+            records = json.dumps(
+                [
+                    [chunk.get("chunk_id"), chunk.get("text"), chunk.get("metadata")]
+                    for chunk in chunks
+                ],
+                ensure_ascii=False,
+                sort_keys=True,
+            )
+            matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+        except (TypeError, ValueError):
+            return None
+        digest = hashlib.sha256(records.encode("utf-8"))
+        digest.update(repr(matrix.shape).encode("ascii"))
+        digest.update(matrix.tobytes())
+        return document_id, digest.hexdigest()
+
+
+class SegmentStore:
+    """Expose one session's documents as a store over shared segments.
+
+    Parameters
+    ----------
+    cache
+        Process-wide cache that owns the document segments.
+
+    Notes
+    -----
+    The store keeps only references to segments, so a document uploaded by many
+    sessions is indexed and held once. Mutations rebind this store's references
+    and never change a segment, which keeps sessions isolated. Records keep the
+    order in which their documents were added.
+
+    Search runs one FAISS call per referenced segment, or per filtered
+    document, and merges results by distance, so its cost grows with the
+    number of documents a session holds; the application bounds that number
+    through ``MAX_UPLOAD_FILES``. IVF index families train only once a store
+    reaches ``minimum_training_vectors``, which a single document rarely does.
+    When the index family needs training and the referenced segments together
+    reach that threshold, the store instead builds one combined index from the
+    segment vectors on the first search after a change and searches it once.
+    That index is private to the session and costs one copy of its vectors.
+    """
+
+    def __init__(self, cache: SegmentCache) -> None:
+        """Create an empty session view over ``cache``."""
+
+        self.cache = cache
+        self.dimension = cache.dimension
+        self.embedding_model = cache.embedding_model
+        self.metric: faiss_module.VectorMetric = cache.metric
+        self._segments: dict[str, faiss_module.FAISSStore] = {}
+        self._combined: faiss_module.FAISSStore | None = None
+
+    @property
+    def records(self) -> tuple[dict[str, Any], ...]:
+        """Return read-only record views in document order."""
+
+        return tuple(
+            chain.from_iterable(segment.records for segment in self._segments.values())
+        )
+
+    @property
+    def record_count(self) -> int:
+        """Return the number of records across referenced segments."""
+
+        return sum(segment.record_count for segment in self._segments.values())
+
+    @property
+    def document_ids(self) -> tuple[str, ...]:
+        """Return the referenced document identifiers in insertion order."""
+
+        return tuple(self._segments)
+
+    def add_embedded_chunks(self, embedded_chunks: Iterable[Mapping[str, Any]]) -> int:
+        """Reference the segments of complete new documents.
+
+        Parameters
+        ----------
+        embedded_chunks
+            Canonical embedded chunks, grouped into documents by
+            ``metadata["document_id"]``.
+
+        Returns
+        -------
+        int
+            Number of newly referenced chunks.
+
+        Raises
+        ------
+        InvalidVectorRecordError
+            If a chunk is invalid or its document is already stored.
+        DimensionMismatchError
+            If an embedding does not match the configured dimension.
+        DuplicateChunkIDError
+            If a chunk identifier repeats or is already stored.
+
+        Notes
+        -----
+        Every document is resolved to a segment before any reference changes, so
+        a failed call leaves the store unchanged.
+        """
+
+        chunks = list(embedded_chunks)
+        documents = self._new_document_positions(chunks)
+        return self._reference(
+            {
+                document_id: self.cache.segment(
+                    document_id, [chunks[position] for position in positions]
+                )
+                for document_id, positions in documents.items()
+            }
+        )
+
+    def add_vectors(
+        self,
+        vectors: NDArray[np.float32] | Sequence[Sequence[float]],
+        records: Sequence[Mapping[str, Any]],
+    ) -> int:
+        """Reference the segments of complete new documents prepared as a matrix.
+
+        Parameters
+        ----------
+        vectors
+            Embedding matrix whose row ``i`` embeds ``records[i]``.
+        records
+            Canonical chunks without embeddings, grouped into documents by
+            ``metadata["document_id"]``.
+
+        Returns
+        -------
+        int
+            Number of newly referenced chunks.
+
+        Raises
+        ------
+        InvalidVectorRecordError
+            If a record or vector is invalid or its document is already stored.
+        DimensionMismatchError
+            If the matrix shape does not match the records and dimension.
+        DuplicateChunkIDError
+            If a chunk identifier repeats or is already stored.
+
+        Notes
+        -----
+        A single-document batch, the common ingestion case, reaches its segment
+        without copying the matrix. Atomicity matches :meth:`add_embedded_chunks`.
+        """
+
+        records = list(records)
+        if len(vectors) != len(records):
+            raise faiss_module.DimensionMismatchError(
+                f"Embedding matrix has {len(vectors)} rows for {len(records)} records."
+            )
+        documents = self._new_document_positions(records)
+        segments: dict[str, faiss_module.FAISSStore] = {}
+        for document_id, positions in documents.items():
+            if len(documents) == 1:
+                rows, document_records = vectors, records
+            else:
+                rows = (
+                    vectors[positions]
+                    if isinstance(vectors, np.ndarray)
+                    else [vectors[position] for position in positions]
+                )
+                document_records = [records[position] for position in positions]
+            segments[document_id] = self.cache.vector_segment(
+                document_id, rows, document_records
+            )
+        return self._reference(segments)
+
+    def remove_document(self, document_id: str) -> int:
+        """Drop this store's reference to one document.
+
+        Returns
+        -------
+        int
+            Number of chunks no longer visible; ``0`` for unknown documents.
+        """
+
+        segment = self._segments.pop(document_id, None)
+        if segment is None:
+            return 0
+        self._combined = None
+        return segment.record_count
+
+    def replace_document(
+        self, document_id: str, embedded_chunks: Iterable[Mapping[str, Any]]
+    ) -> int:
+        """Reference a new segment for one document, replacing any previous one.
+
+        Parameters
+        ----------
+        document_id
+            ``metadata["document_id"]`` of the document being replaced.
+        embedded_chunks
+            Canonical embedded chunks that all belong to ``document_id``.
+
+        Returns
+        -------
+        int
+            Number of newly referenced chunks.
+
+        Raises
+        ------
+        InvalidVectorRecordError
+            If a chunk is invalid or belongs to another document.
+        DimensionMismatchError
+            If an embedding does not match the configured dimension.
+        DuplicateChunkIDError
+            If a chunk identifier repeats or belongs to another stored document.
+
+        Notes
+        -----
+        Like :meth:`FAISSStore.replace_document`, the replacement moves to the end
+        of the record order, and an empty chunk sequence removes the document.
+        """
+
+        chunks = list(embedded_chunks)
+        if not chunks:
+            return self.remove_document(document_id)
+        segment = self.cache.segment(document_id, chunks)
+        self._check_unique(
+            segment,
+            (
+                other
+                for other_id, other in self._segments.items()
+                if other_id != document_id
+            ),
+        )
+        self._segments.pop(document_id, None)
+        self._segments[document_id] = segment
+        self._combined = None
+        return segment.record_count
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        k: int = 3,
+        *,
+        filter: filters_module.SearchFilter | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return up to ``k`` nearest records across referenced segments.
+
+        Notes
+        -----
+        Validation, errors, and result mappings match :meth:`FAISSStore.search`.
+        """
+
+        return self._search_segments(
+            lambda segment: [segment.search(query_embedding, k, filter=filter)],
+            k,
+            filter,
+        )[0]
+
+    def search_batch(
+        self,
+        query_matrix: Any,
+        k: int = 3,
+        *,
+        filter: filters_module.SearchFilter | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Return up to ``k`` nearest records for every query row.
+
+        Notes
+        -----
+        Each searched segment answers the whole batch in one FAISS call;
+        validation and errors match :meth:`FAISSStore.search_batch`.
+        """
+
+        return self._search_segments(
+            lambda segment: segment.search_batch(query_matrix, k, filter=filter),
+            k,
+            filter,
+        )
+
+    def get_record(self, chunk_id: str) -> dict[str, Any] | None:
+        """Return the read-only view of one record by chunk identifier."""
+
+        for segment in self._segments.values():
+            record = segment.get_record(chunk_id)
+            if record is not None:
+                return record
+        return None
+
+    def _search_segments(
+        self,
+        search: Callable[[faiss_module.FAISSStore], list[list[dict[str, Any]]]],
+        k: int,
+        search_filter: filters_module.SearchFilter | None,
+    ) -> list[list[dict[str, Any]]]:
+        combined = self._combined_segment()
+        if combined is not None:
+            # The combined store applies the document filter itself.
+            return search(combined)
+        segments = [
+            segment
+            for document_id, segment in self._segments.items()
+            if search_filter is None
+            or search_filter.document_ids is None
+            or document_id in search_filter.document_ids
+        ]
+        if not segments:
+            # The empty segment applies the same validation and returns no hits.
+            return search(self.cache.empty_segment)
+        batches = [search(segment) for segment in segments]
+        if len(batches) == 1:
+            return batches[0]
+        # nsmallest is stable, so ties keep the store's document order.
+        return [
+            heapq.nsmallest(k, chain.from_iterable(rows), key=itemgetter("distance"))
+            for rows in zip(*batches, strict=True)
+        ]
+
+    def _combined_segment(self) -> faiss_module.FAISSStore | None:
+        index_spec = self.cache.index_spec or faiss_module.FAISSIndexSpec()
+        if (
+            len(self._segments) < 2
+            or not index_spec.requires_training
+            or self.record_count < index_spec.minimum_training_vectors
+        ):
+            return None
+        if self._combined is None:
+            combined = faiss_module.FAISSStore(
+                dimension=self.dimension,
+                embedding_model=self.embedding_model,
+                index_spec=index_spec,
+                metric=self.metric,
+            )
+            # Staged and IVFFlat segments reconstruct exactly; PQ codes do not.
+            combined.add_vectors(
+                np.concatenate(
+                    [
+                        segment.index.reconstruct_n(0, segment.index.ntotal)
+                        for segment in self._segments.values()
+                    ]
+                ),
+                self.records,
+            )
+            self._combined = combined
+        return self._combined
+
+    def _reference(self, segments: dict[str, faiss_module.FAISSStore]) -> int:
+        checked = list(self._segments.values())
+        for segment in segments.values():
+            self._check_unique(segment, checked)
+            checked.append(segment)
+        self._segments.update(segments)
+        if segments:
+            self._combined = None
+        return sum(segment.record_count for segment in segments.values())
+
+    def _new_document_positions(
+        self, chunks: Sequence[Mapping[str, Any]]
+    ) -> dict[str, list[int]]:
+        documents: dict[str, list[int]] = {}
+        for position, chunk in enumerate(chunks):
+            metadata = chunk.get("metadata") if isinstance(chunk, Mapping) else None
+            document_id = (
+                metadata.get("document_id") if isinstance(metadata, Mapping) else None
+            )
+            if not isinstance(document_id, str) or not document_id:
+                raise faiss_module.InvalidVectorRecordError(
+                    f"Embedded chunk at position {position} has no document_id."
+                )
+            documents.setdefault(document_id, []).append(position)
+        existing = sorted(
+            document_id for document_id in documents if document_id in self._segments
+        )
+        if existing:
+            raise faiss_module.InvalidVectorRecordError(
+                f"Documents are already stored; replace them instead: {existing}"
+            )
+        return documents
+
+    @staticmethod
+    def _check_unique(
+        segment: faiss_module.FAISSStore,
+        others: Iterable[faiss_module.FAISSStore],
+    ) -> None:
+        others = list(others)
+        duplicate_ids = sorted(
+            record["chunk_id"]
+            for record in segment.records
+            if any(other.get_record(record["chunk_id"]) for other in others)
+        )
+        if duplicate_ids:
+            raise faiss_module.DuplicateChunkIDError(
+                f"Chunk IDs must be unique; duplicates: {duplicate_ids}"
+            )
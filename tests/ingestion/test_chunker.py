@@ -109,6 +109,41 @@ def test_source_order_and_structure_types_are_stable():
     assert chunks[-1]["text"] == "A | B\n1 | 2"
 
 
+def test_chunk_iterator_validates_eagerly_and_matches_chunk_document():
+    document = document_with_paragraphs("First", "Second", "Third")
+    chunker = PDFChunker(max_chunk_length=100, overlap_length=10)
+
+    assert list(chunker.iter_chunks(document)) == chunker.chunk_document(document)
+    with pytest.raises(ingestion.chunker.InvalidDocumentError):
+        chunker.iter_chunks({"metadata": {}, "pages": None})
+
+
+
+def test_page_chunks_with_page_tables_match_the_assembled_document():
+    document = document_with_paragraphs("First", "Second")
+    second_page = copy.deepcopy(document["pages"][0])
+    second_page["page"] = 2
+    document["pages"].append(second_page)
+    tables = [
+        {"page": 1, "table": [["A"]], "table_text": "A"},
+        {"page": 2, "table": [["B"]], "table_text": "B"},
+        {"page": 2, "table": [["C"]], "table_text": "C"},
+    ]
+    document["metadata"]["tables"] = tables
+    pages = [
+        {**page, "tables": [table for table in tables if table["page"] == number]}
+        for number, page in enumerate(document["pages"], start=1)
+    ]
+    chunker = PDFChunker(max_chunk_length=100, overlap_length=10)
+
+    streamed = list(chunker.iter_page_chunks(document["metadata"], iter(pages)))
+
+    assert streamed == chunker.chunk_document(document)
+    assert [chunk["metadata"].get("table_index") for chunk in streamed[-2:]] == [1, 2]
+    del document["metadata"]["file_hash"]
+    with pytest.raises(ingestion.chunker.InvalidDocumentError, match="file_hash"):
+        chunker.iter_page_chunks(document["metadata"], pages)
+
 def test_invalid_chunk_fails_early():
     with pytest.raises(InvalidChunkError, match="metadata must be a dictionary"):
         PDFChunker.validate_chunk(
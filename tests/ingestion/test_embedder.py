@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+
 import numpy as np
 import pytest
 
@@ -161,3 +163,444 @@ def test_empty_document_input_avoids_model_loading():
         model_factory=lambda _model_id: pytest.fail("model should remain unloaded"),
     )
     assert provider.embed_documents([]) == []
+    assert provider.embed_documents_array([]).shape == (0, 3)
+
+
+def test_chunk_matrix_matches_list_embeddings_without_boxing():
+    provider = embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider(
+        model_id="test-model",
+        dimension=3,
+        model_factory=lambda _model_id: FakeSentenceTransformer(),
+    )
+    chunks = valid_chunks()
+
+    records, vectors = embeddings.chunks.embed_chunks_array(chunks, provider)
+    embedded = embeddings.chunks.embed_chunks(chunks, provider)
+
+    assert vectors.dtype == np.float32 and vectors.flags.c_contiguous
+    assert vectors.tolist() == [chunk["embedding"] for chunk in embedded]
+    assert records == [
+        {key: value for key, value in chunk.items() if key != "embedding"}
+        for chunk in embedded
+    ]
+
+    class ListProvider:
+        model_id = "list-model"
+        dimension = 3
+
+        def embed_documents(self, texts):
+            return [[1.0, 2.0, 3.0] for _text in texts]
+
+    _records, list_vectors = embeddings.chunks.embed_chunks_array(
+        chunks, ListProvider()
+    )
+    assert list_vectors.dtype == np.float32
+    assert list_vectors.shape == (len(chunks), 3)
+
+
+def test_prepared_documents_hold_one_read_only_matrix():
+    records = ({"chunk_id": "c1", "text": "one", "metadata": {}},)
+    vectors = np.array([[1.0, 0.0]], dtype=np.float32)
+
+    prepared = ingestion.processor.PreparedDocument(
+        result=ingestion.processor.ProcessingResult("doc", "doc.pdf", 1),
+        records=records,
+        vectors=vectors,
+    )
+
+    assert not prepared.vectors.flags.writeable
+    assert vectors.flags.writeable
+    assert prepared.embedded_chunks[0]["embedding"] == [1.0, 0.0]
+    with pytest.raises(ValueError, match="one row per record"):
+        ingestion.processor.PreparedDocument(
+            result=prepared.result, records=records * 2, vectors=vectors
+        )
+
+
+class CountingProvider:
+    model_id = "counting-model"
+    dimension = 2
+
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    def embed_documents_array(self, texts):
+        self.batches.append(list(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts], dtype=np.float32)
+
+    def embed_documents(self, texts):
+        return self.embed_documents_array(texts).tolist()
+
+    def embed_query(self, text):
+        return [0.0, 1.0]
+
+
+def test_chunk_windows_match_whole_document_embedding():
+    document = {
+        "metadata": {"document_title": "Windows", "file_hash": "c" * 64, "tables": []},
+        "pages": [
+            {
+                "page": 1,
+                "paragraphs": [
+                    {"text": "x" * (index + 1), "heading_level": 0, "is_type": "normal"}
+                    for index in range(5)
+                ],
+            }
+        ],
+    }
+    chunker = ingestion.chunker.PDFChunker(max_chunk_length=100, overlap_length=10)
+    provider = CountingProvider()
+
+    records, vectors = embeddings.chunks.embed_chunk_windows(
+        chunker.iter_chunks(document), provider, window_size=2
+    )
+    expected_records, expected_vectors = embeddings.chunks.embed_chunks_array(
+        chunker.chunk_document(document), CountingProvider()
+    )
+
+    assert [len(batch) for batch in provider.batches] == [2, 2, 1]
+    assert records == expected_records
+    np.testing.assert_array_equal(vectors, expected_vectors)
+    empty_records, empty_vectors = embeddings.chunks.embed_chunk_windows(
+        iter(()), provider
+    )
+    assert (empty_records, empty_vectors.shape) == ([], (0, 2))
+    with pytest.raises(ValueError, match="window_size"):
+        embeddings.chunks.embed_chunk_windows([], provider, window_size=0)
+
+
+def test_embedding_cache_computes_only_misses_and_evicts_least_recent():
+    inner = CountingProvider()
+    cached = embeddings.cache.CachedEmbeddingProvider(
+        inner, prefix_mode="none", max_entries=2
+    )
+
+    first = cached.embed_documents_array(["a", "bb", "a"])
+    second = cached.embed_documents_array(["bb", "ccc"])
+    cached.embed_documents_array(["a"])
+
+    assert first.tolist() == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert second.tolist() == [[2.0, 1.0], [3.0, 1.0]]
+    assert inner.batches == [["a", "bb"], ["ccc"], ["a"]]
+    assert cached.embed_documents([]) == []
+    for invalid in (None, b"bytes", " "):
+        with pytest.raises(ValueError, match="non-empty string"):
+            cached.embed_documents_array(["a", invalid])
+    assert inner.batches == [["a", "bb"], ["ccc"], ["a"]]
+    with pytest.raises(ValueError, match="max_entries"):
+        embeddings.cache.CachedEmbeddingProvider(
+            inner, prefix_mode="none", max_entries=0
+        )
+
+
+def test_embedding_cache_persists_vectors_per_model_and_prefix_mode(
+    workspace_tmp_path,
+):
+    path = workspace_tmp_path / "cache" / "embeddings.sqlite3"
+    writer = embeddings.cache.CachedEmbeddingProvider(
+        CountingProvider(), prefix_mode="e5", path=path
+    )
+    expected = writer.embed_documents_array(["alpha", "beta"])
+    writer.close()
+
+    reader_inner = CountingProvider()
+    reader = embeddings.cache.CachedEmbeddingProvider(
+        reader_inner, prefix_mode="e5", path=path
+    )
+    other_mode_inner = CountingProvider()
+    other_mode = embeddings.cache.CachedEmbeddingProvider(
+        other_mode_inner, prefix_mode="none", path=path
+    )
+
+    np.testing.assert_array_equal(
+        reader.embed_documents_array(["beta", "alpha"]), expected[::-1]
+    )
+    other_mode.embed_documents_array(["alpha"])
+    assert reader_inner.batches == []
+    assert other_mode_inner.batches == [["alpha"]]
+    reader.close()
+    other_mode.close()
+
+
+def test_unusable_embedding_cache_file_falls_back_to_memory(workspace_tmp_path):
+    blocker = workspace_tmp_path / "not-a-directory"
+    blocker.write_text("occupied")
+    inner = CountingProvider()
+    cached = embeddings.cache.CachedEmbeddingProvider(
+        inner, prefix_mode="none", path=blocker / "embeddings.sqlite3"
+    )
+
+    cached.embed_documents_array(["alpha"])
+    cached.embed_documents_array(["alpha"])
+
+    assert inner.batches == [["alpha"]]
+
+
+class LengthEncodingModel(FakeSentenceTransformer):
+    def encode(self, texts, **kwargs):
+        self.calls.append({"texts": list(texts), **kwargs})
+        return np.asarray([[float(len(text)), 0.0, 1.0] for text in texts])
+
+
+def padded_tokens(texts):
+    return len(texts) * max(len(text) // 4 + 2 for text in texts)
+
+
+def test_token_budget_batching_restores_order_within_the_budget():
+    texts = [
+        ("heading " if index % 3 else "paragraph " * 80) + str(index)
+        for index in range(48)
+    ]
+    fixed_model = LengthEncodingModel()
+    budget_model = LengthEncodingModel()
+    fixed = embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider(
+        model_id="test-model",
+        dimension=3,
+        batch_size=16,
+        use_e5_prefixes=False,
+        model_factory=lambda _model_id: fixed_model,
+    )
+    budgeted = embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider(
+        model_id="test-model",
+        dimension=3,
+        batch_size=16,
+        use_e5_prefixes=False,
+        model_factory=lambda _model_id: budget_model,
+        max_batch_tokens=2048,
+    )
+
+    expected = fixed.embed_documents_array(texts)
+    actual = budgeted.embed_documents_array(texts)
+
+    np.testing.assert_array_equal(actual, expected)
+    batches = [call["texts"] for call in budget_model.calls]
+    assert all(padded_tokens(batch) <= 2048 for batch in batches)
+    assert len(batches[0]) == 32
+    assert sum(map(padded_tokens, batches)) < padded_tokens(texts) / 2
+    with pytest.raises(ValueError, match="max_batch_tokens"):
+        embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider(
+            model_id="test-model", dimension=3, max_batch_tokens=0
+        )
+
+
+def fake_model_factory(_model_id):
+    return LengthEncodingModel()
+
+
+def test_worker_pool_encodes_slices_in_input_order():
+    texts = [f"passage {'x' * index}" for index in range(7)]
+    local = embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider(
+        model_id="test-model", dimension=3, model_factory=fake_model_factory
+    )
+    pooled = embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider(
+        model_id="test-model",
+        dimension=3,
+        model_factory=fake_model_factory,
+        worker_processes=2,
+    )
+    try:
+        np.testing.assert_array_equal(
+            pooled.embed_documents_array(texts), local.embed_documents_array(texts)
+        )
+        assert pooled.embed_query("question") == local.embed_query("question")
+        assert pooled._model is None
+    finally:
+        pooled.close()
+    assert pooled._pool is None
+
+
+class FakeTokenizer:
+    def __call__(self, texts, **kwargs):
+        assert kwargs["return_tensors"] == "np"
+        tokens = [[len(word) for word in text.split()] for text in texts]
+        width = max(map(len, tokens))
+        ids = np.zeros((len(texts), width), dtype=np.int64)
+        mask = np.zeros_like(ids)
+        for row, values in enumerate(tokens):
+            ids[row, : len(values)] = values
+            mask[row, : len(values)] = 1
+        return {
+            "input_ids": ids,
+            "attention_mask": mask,
+            "token_type_ids": np.zeros_like(ids),
+        }
+
+
+class FakeInput:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeOnnxSession:
+    def __init__(self, *, dimension=3):
+        self.dimension = dimension
+        self.feeds: list[dict] = []
+
+    def get_inputs(self):
+        return [FakeInput("input_ids"), FakeInput("attention_mask")]
+
+    def run(self, output_names, feeds):
+        self.feeds.append(feeds)
+        ids = feeds["input_ids"].astype(np.float32)
+        # Padding positions carry large values that mean pooling must ignore.
+        hidden = np.stack([ids, np.ones_like(ids), np.full_like(ids, 50.0)], -1)
+        hidden[feeds["attention_mask"] == 0] = 100.0
+        return [hidden[..., : self.dimension]]
+
+
+def onnx_provider(session, **kwargs):
+    return embeddings.onnx.OnnxEmbeddingProvider(
+        model_id="intfloat/multilingual-e5-small",
+        model_path="model.onnx",
+        dimension=3,
+        session_factory=lambda _path: session,
+        tokenizer_factory=lambda _model_id: FakeTokenizer(),
+        **kwargs,
+    )
+
+
+def test_onnx_embedder_mean_pools_normalizes_and_applies_prefixes():
+    session = FakeOnnxSession()
+    provider = onnx_provider(session, batch_size=2)
+
+    vectors = provider.embed_documents_array(["alpha", "be ta", "gamma delta x"])
+    query = provider.embed_query("question")
+
+    assert vectors.dtype == np.float32 and vectors.flags.c_contiguous
+    pooled = np.array(
+        [[(8 + 5) / 2, 1.0, 50.0], [(8 + 2 + 2) / 3, 1.0, 50.0]], dtype=np.float32
+    )
+    np.testing.assert_allclose(
+        vectors[:2], pooled / np.linalg.norm(pooled, axis=1, keepdims=True), rtol=1e-6
+    )
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-6)
+    assert np.isclose(np.linalg.norm(query), 1.0)
+    assert [len(feeds["input_ids"]) for feeds in session.feeds] == [2, 1, 1]
+    assert all(set(feeds) == {"input_ids", "attention_mask"} for feeds in session.feeds)
+    assert session.feeds[-1]["input_ids"].tolist() == [[6, 8]]
+    assert provider.embed_documents(["alpha"]) == vectors[:1].tolist()
+
+
+def test_onnx_embedder_rejects_invalid_output_before_it_reaches_the_index():
+    with pytest.raises(embeddings.contracts.EmbeddingError, match="shape"):
+        onnx_provider(FakeOnnxSession(dimension=2)).embed_query("question")
+
+    zero = FakeOnnxSession()
+    zero.run = lambda _names, feeds: [np.zeros((*feeds["input_ids"].shape, 3))]
+    with pytest.raises(embeddings.contracts.EmbeddingError, match="non-finite"):
+        onnx_provider(zero).embed_query("question")
+
+    def unavailable(_path):
+        raise ImportError("onnxruntime")
+
+    provider = embeddings.onnx.OnnxEmbeddingProvider(
+        model_id="test-model",
+        model_path="model.onnx",
+        dimension=3,
+        session_factory=unavailable,
+    )
+    assert provider.embed_documents([]) == []
+    with pytest.raises(ValueError, match="non-empty"):
+        provider.embed_documents([" "])
+    with pytest.raises(embeddings.contracts.EmbeddingError, match="loaded"):
+        provider.embed_query("question")
+
+
+def test_onnx_embedder_matches_sentence_transformer_within_cosine_tolerance():
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("sentence_transformers")
+    model_path = os.environ.get("ONNX_EMBEDDING_MODEL_PATH")
+    if not model_path:
+        pytest.skip("ONNX_EMBEDDING_MODEL_PATH names no exported model")
+    model_id = os.environ.get("EMBEDDING_MODEL", "intfloat/multilingual-e5-small")
+    dimension = int(os.environ.get("EMBEDDING_DIMENSION", "384"))
+    reference = embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider(
+        model_id=model_id, dimension=dimension
+    )
+    candidate = embeddings.onnx.OnnxEmbeddingProvider(
+        model_id=model_id, model_path=model_path, dimension=dimension
+    )
+    texts = [
+        "The warranty covers manufacturing defects for two years.",
+        "Die Garantie deckt Herstellungsfehler zwei Jahre lang ab.",
+        "Revenue grew by 12 percent in the third quarter.",
+        "Short",
+    ]
+
+    documents = np.sum(
+        reference.embed_documents_array(texts) * candidate.embed_documents_array(texts),
+        axis=1,
+    )
+    query = np.dot(reference.embed_query(texts[0]), candidate.embed_query(texts[0]))
+
+    # Dynamic int8 quantization stays well above this bound for E5 models.
+    assert documents.min() >= 0.98
+    assert query >= 0.98
+
+
+def test_warm_up_loads_the_model_once_and_reports_readiness():
+    model = FakeSentenceTransformer()
+    factory_calls: list[str] = []
+
+    def factory(model_id):
+        factory_calls.append(model_id)
+        return model
+
+    provider = embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider(
+        model_id="test-model", dimension=3, model_factory=factory
+    )
+    cached = embeddings.cache.CachedEmbeddingProvider(provider, prefix_mode="e5")
+    assert not cached.ready
+
+    cached.warm_up()
+    cached.warm_up()
+
+    assert cached.ready and provider.ready
+    assert factory_calls == ["test-model"]
+    assert [call["texts"] for call in model.calls] == [["query: warm-up"]]
+
+    broken = embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider(
+        model_id="test-model",
+        dimension=3,
+        model_factory=lambda _model_id: FakeSentenceTransformer(non_finite=True),
+    )
+    with pytest.raises(embeddings.contracts.EmbeddingError):
+        broken.warm_up()
+    assert not broken.ready
+
+
+def test_pooled_warm_up_starts_and_warms_every_worker():
+    pooled = embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider(
+        model_id="test-model",
+        dimension=3,
+        model_factory=fake_model_factory,
+        worker_processes=2,
+    )
+    try:
+        pooled.warm_up()
+
+        assert pooled.ready
+        assert len(pooled._pool._processes) == 2
+        assert pooled._model is None
+    finally:
+        pooled.close()
+    assert not pooled.ready
+
+
+def non_finite_model_factory(_model_id):
+    return FakeSentenceTransformer(non_finite=True)
+
+
+def test_failed_pooled_warm_up_releases_the_other_workers():
+    pooled = embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider(
+        model_id="test-model",
+        dimension=3,
+        model_factory=non_finite_model_factory,
+        worker_processes=2,
+    )
+    try:
+        with pytest.raises(embeddings.contracts.EmbeddingError):
+            pooled.warm_up()
+        assert not pooled.ready
+    finally:
+        pooled.close()
@@ -1,8 +1,9 @@
 import hashlib
 
+import numpy as np
 import pytest
 
-from src import ingestion, vectorstore
+from src import embeddings, ingestion, vectorstore
 
 UniversalPDFLoader = ingestion.loader.UniversalPDFLoader
 
@@ -11,6 +12,7 @@ class FakePage:
     def __init__(self, text):
         self._text = text
         self.extract_text_calls = 0
+        self.closed = False
         self.chars = [
             {
                 "text": character,
@@ -29,6 +31,9 @@ class FakePage:
     def extract_tables(self):
         return [[["A", "B"], ["1", "2"]]]
 
+    def close(self):
+        self.closed = True
+
 
 class FakePDF:
     def __init__(self, pages):
@@ -69,6 +74,7 @@ def test_loader_processes_upload_bytes_without_a_temporary_file(monkeypatch):
     assert result["tables"][0]["table"] == [["A", "B"], ["1", "2"]]
     assert result["metadata"]["all_links"] == ["https://example.com/source"]
     assert page.extract_text_calls == 1
+    assert page.closed
 
 
 def test_loader_rejects_empty_upload_bytes():
@@ -137,3 +143,224 @@ def test_processor_translates_unexpected_parser_failure_without_leaking_detail()
 
     assert "upload.pdf" in str(captured.value)
     assert "sensitive parser path" not in str(captured.value)
+
+
+def minimal_pdf(page_texts):
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b""]
+    page_ids = []
+    for text in page_texts:
+        content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+        )
+        page_ids.append(len(objects) + 1)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 << /Type /Font /Subtype /Type1 "
+            b"/BaseFont /Helvetica >> >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+    body = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, payload in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += b"%d 0 obj\n%s\nendobj\n" % (number, payload)
+    xref = len(body)
+    body += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    body += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    body += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(body)
+
+
+def test_page_parallel_loading_matches_serial_loading():
+    content = minimal_pdf(
+        [
+            f"Page {index} of the handbook, see https://example.com/{index % 2}"
+            for index in range(6)
+        ]
+    )
+    parallel = UniversalPDFLoader(page_workers=2, min_pages_per_worker=2)
+    try:
+        loaded = parallel.load_pdf(content, file_name="handbook.pdf")
+        # Pages are extracted in batches of page_workers * min_pages_per_worker.
+        streamed = list(parallel.iter_pages(content))
+    finally:
+        parallel.close()
+
+    assert loaded == UniversalPDFLoader().load_pdf(content, file_name="handbook.pdf")
+    assert streamed == [{**page, "tables": []} for page in loaded["pages"]]
+    assert [page["paragraphs"][0]["text"][:6] for page in loaded["pages"]] == [
+        f"Page {index}" for index in range(6)
+    ]
+    assert loaded["pages"][2]["paragraphs"][0]["links"] == ["https://example.com/0"]
+    assert [page["links"] for page in loaded["pages"]] == [[]] * 6
+    assert loaded["metadata"]["all_links"] == [
+        "https://example.com/0",
+        "https://example.com/1",
+    ]
+    with pytest.raises(ValueError, match="page_workers"):
+        UniversalPDFLoader(page_workers=0)
+
+
+def test_paragraph_breaks_skip_blank_lines_and_follow_gaps_and_font_sizes():
+    page = FakePage("")
+    page.chars = [
+        {"text": text, "top": top, "size": size, "fontname": font}
+        for text, top, size, font in [
+            ("Body", 114.0, 10.0, "Serif"),
+            ("Title", 100.0, 14.0, "Bold"),
+            (" ", 107.0, 20.0, "Blank"),
+            ("text", 114.0, 10.0, "Italic"),
+            ("More", 126.0, 10.0, "Serif"),
+            ("Far", 150.0, 10.0, "Serif"),
+        ]
+    ]
+
+    paragraphs = UniversalPDFLoader()._group_paragraphs(
+        UniversalPDFLoader._text_lines(page)
+    )
+
+    assert [
+        (item["text"], item["font_size"], item["font_names"], item["y_position"])
+        for item in paragraphs
+    ] == [
+        ("Title", 14.0, ["Bold"], 100.0),
+        ("Bodytext More", 10.0, ["Italic", "Serif"], 114.0),
+        ("Far", 10.0, ["Serif"], 150.0),
+    ]
+    assert paragraphs[1]["text_hash"] == hashlib.sha256(b"Bodytext More").hexdigest()
+
+
+def per_character_paragraphs(characters):
+    lines_by_y = {}
+    for character in characters:
+        lines_by_y.setdefault(round(character["top"], 1), []).append(character)
+    paragraphs = []
+    previous = None
+    for y_position, line in sorted(lines_by_y.items()):
+        text = "".join(character["text"] for character in line).strip()
+        if not text:
+            continue
+        size = max(character["size"] for character in line)
+        fonts = {character["fontname"] for character in line}
+        if previous is None or (
+            abs(y_position - previous[0]) > previous[1] * 1.5
+            or abs(size - previous[1]) > 0.2
+        ):
+            paragraphs.append([text, size, fonts, y_position])
+        else:
+            paragraphs[-1][0] += f" {text}"
+            paragraphs[-1][2] |= fonts
+        previous = (y_position, size)
+    return [
+        (text, size, sorted(fonts), y_position)
+        for text, size, fonts, y_position in paragraphs
+    ]
+
+
+def test_line_grouping_matches_per_character_rounding_on_decimal_ties():
+    tops = [100.35, 100.35, 100.25, 100.34, 2.675, 2.675, 2.65, 112.05, 112.15]
+    page = FakePage("")
+    page.chars = [
+        {"text": text, "top": top, "size": 10.0 + index % 2, "fontname": f"F{index}"}
+        for index, (text, top) in enumerate(zip("abcdefghi", tops, strict=True))
+    ]
+
+    paragraphs = UniversalPDFLoader()._group_paragraphs(
+        UniversalPDFLoader._text_lines(page)
+    )
+
+    assert [
+        (item["text"], item["font_size"], item["font_names"], item["y_position"])
+        for item in paragraphs
+    ] == per_character_paragraphs(page.chars)
+    assert 100.3 in [item["y_position"] for item in paragraphs]
+
+
+class PageCountingLoader(UniversalPDFLoader):
+    def __init__(self):
+        super().__init__()
+        self.pages_read = 0
+
+    def iter_pages(self, pdf_source, extract_tables=True):
+        for page in super().iter_pages(pdf_source, extract_tables):
+            self.pages_read += 1
+            yield page
+
+
+class PageTrackingProvider:
+    model_id = "page-tracking"
+    dimension = 2
+
+    def __init__(self, loader, fail_on_call=None):
+        self.loader = loader
+        self.fail_on_call = fail_on_call
+        self.pages_read_per_call: list[int] = []
+
+    def embed_documents_array(self, texts):
+        self.pages_read_per_call.append(self.loader.pages_read)
+        if len(self.pages_read_per_call) == self.fail_on_call:
+            raise embeddings.contracts.EmbeddingError("embedding failed")
+        return np.array([[float(len(text)), 1.0] for text in texts], dtype=np.float32)
+
+    def embed_documents(self, texts):
+        return self.embed_documents_array(texts).tolist()
+
+    def embed_query(self, text):
+        return [0.0, 1.0]
+
+
+def page_processor(stream_min_pages, *, store=None, fail_on_call=None):
+    loader = PageCountingLoader()
+    return ingestion.processor.DocumentProcessor(
+        faiss_store=store
+        or vectorstore.faiss.FAISSStore(dimension=2, embedding_model="page-tracking"),
+        embedding_provider=PageTrackingProvider(loader, fail_on_call),
+        loader=loader,
+        embedding_window_size=1,
+        stream_min_pages=stream_min_pages,
+    )
+
+
+def test_long_documents_stream_pages_into_windows_with_identical_output():
+    content = minimal_pdf([f"Handbook page {index} body text" for index in range(5)])
+    streaming = page_processor(stream_min_pages=5)
+    whole = page_processor(stream_min_pages=None)
+
+    streamed = streaming.prepare_bytes(content, file_name="handbook.pdf")
+    loaded = whole.prepare_bytes(content, file_name="handbook.pdf")
+
+    assert streamed.records == loaded.records
+    np.testing.assert_array_equal(streamed.vectors, loaded.vectors)
+    # Each window is embedded before the next page is extracted.
+    assert streaming.embedding_provider.pages_read_per_call == [1, 2, 3, 4, 5]
+    assert whole.embedding_provider.pages_read_per_call == [0] * 5
+    with pytest.raises(ValueError, match="stream_min_pages"):
+        page_processor(stream_min_pages=0)
+
+
+def test_process_bytes_indexes_each_window_and_rolls_back_on_failure():
+    content = minimal_pdf([f"Handbook page {index} body text" for index in range(4)])
+    store = vectorstore.faiss.FAISSStore(dimension=2, embedding_model="page-tracking")
+    added_per_call: list[int] = []
+    add_vectors = store.add_vectors
+    store.add_vectors = lambda vectors, records: added_per_call.append(
+        add_vectors(vectors, records)
+    )
+
+    result = page_processor(1, store=store).process_bytes(
+        content, file_name="handbook.pdf"
+    )
+
+    assert added_per_call == [1, 1, 1, 1]
+    assert result.chunk_count == store.record_count == 4
+    store.remove_document(result.document_id)
+    with pytest.raises(embeddings.contracts.EmbeddingError):
+        page_processor(1, store=store, fail_on_call=3).process_bytes(
+            content, file_name="handbook.pdf"
+        )
+    assert store.record_count == 0
@@ -0,0 +1,69 @@
+import numpy as np
+
+from src import ingestion
+
+PreparedDocument = ingestion.processor.PreparedDocument
+PreparedDocumentCache = ingestion.cache.PreparedDocumentCache
+ProcessingResult = ingestion.processor.ProcessingResult
+
+
+def prepared(document_id, rows=4):
+    records = tuple(
+        {
+            "chunk_id": f"{document_id}:{index:06d}",
+            "text": f"chunk {index}",
+            "metadata": {"document_id": document_id, "page_number": index + 1},
+        }
+        for index in range(rows)
+    )
+    return PreparedDocument(
+        result=ProcessingResult(document_id, f"{document_id}.pdf", rows),
+        records=records,
+        vectors=np.arange(rows * 8, dtype=np.float32).reshape(rows, 8),
+    )
+
+
+def test_memory_bound_evicts_least_recently_used_documents():
+    first, second, third = prepared("a"), prepared("b"), prepared("c")
+    probe = PreparedDocumentCache(configuration_key="config", max_bytes=10**6)
+    probe.put(first)
+    cache = PreparedDocumentCache(
+        configuration_key="config", max_bytes=2 * probe.size_bytes
+    )
+
+    cache.put(first)
+    cache.put(second)
+    assert cache.get("a") is first
+    cache.put(third)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is first
+    assert cache.size_bytes == 2 * probe.size_bytes
+    cache.put(prepared("huge", rows=10_000))
+    assert cache.get("huge") is None
+
+
+def test_disk_entries_survive_restarts_only_for_the_same_configuration(
+    workspace_tmp_path,
+):
+    directory = workspace_tmp_path / "prepared"
+    original = prepared("a")
+    PreparedDocumentCache(
+        configuration_key="config", max_bytes=10**6, path=directory
+    ).put(original)
+
+    restored = PreparedDocumentCache(
+        configuration_key="config", max_bytes=10**6, path=directory
+    ).get("a")
+    other = PreparedDocumentCache(
+        configuration_key="other", max_bytes=10**6, path=directory
+    )
+
+    assert restored is not None
+    assert restored.result == original.result
+    assert restored.records == original.records
+    np.testing.assert_array_equal(restored.vectors, original.vectors)
+    assert not restored.vectors.flags.writeable
+    assert other.get("a") is None
+    assert not any(path.name.startswith(".") for path in directory.iterdir())
@@ -1,5 +1,7 @@
 import copy
 
+import pytest
+
 from src import ingestion
 
 PdfPreprocessor = ingestion.preprocessing.PdfPreprocessor
@@ -153,3 +155,85 @@ def test_pseudo_table_lookahead_does_not_consume_rest_of_page():
 
     assert [item["is_type"] for item in paragraphs[:4]] == ["pseudo_table"] * 4
     assert paragraphs[4]["is_type"] == "normal"
+
+
+def test_header_clustering_matches_pairwise_sequence_ratios():
+    texts = [
+        *[f"Annual report - page {number}" for number in range(1, 9)],
+        "",
+        "Annual report - page 3",
+        "Appendix",
+        "Appendix",
+        "Completely different running title",
+    ]
+    preprocessor = PdfPreprocessor({"metadata": {}, "pages": []})
+
+    clusters: list[str] = []
+    counts: list[int] = []
+    for text in filter(None, texts):
+        for index, cluster in enumerate(clusters):
+            if preprocessor._similarity(text, cluster) >= 0.9:
+                counts[index] += 1
+                break
+        else:
+            clusters.append(text)
+            counts.append(1)
+    expected = [cluster for cluster, count in zip(clusters, counts) if count >= 7]
+
+    recognized = preprocessor._cluster_repeated_texts(texts, 0.9, 0.5)
+
+    assert recognized == expected
+    assert recognized == ["Annual report - page 1"]
+
+
+def handbook_pages(header):
+    pages = []
+    for number in range(1, 5):
+        pages.append(
+            {
+                "page": number,
+                "paragraphs": [
+                    paragraph(header(number), size=9.0, y=40.0),
+                    paragraph("Handbook" if number == 1 else "Chapter", size=20.0),
+                    paragraph(f"Body text of page {number} " * 4, y=260.0),
+                    paragraph("Figure caption", size=8.0, y=420.0),
+                    paragraph("Setup .... 3", y=460.0),
+                    paragraph(f"{number}", size=9.0, y=760.0),
+                ],
+            }
+        )
+    return pages
+
+
+@pytest.mark.parametrize(
+    "header",
+    [lambda number: "Company handbook", lambda number: f"Note {number}"],
+    ids=["repeated-header", "fallback-removal"],
+)
+def test_page_by_page_preprocessing_matches_whole_document_preprocessing(header):
+    document = {
+        "metadata": {"file_name": "handbook.pdf", "file_hash": "a" * 64},
+        "pages": handbook_pages(header),
+        "tables": [],
+    }
+    expected, _ = PdfPreprocessor(copy.deepcopy(document)).run_preprocessing()
+
+    survey = copy.deepcopy(document["pages"])
+    preprocessor = PdfPreprocessor.from_page_paragraphs(
+        copy.deepcopy(document["metadata"]),
+        (page["paragraphs"] for page in survey),
+    )
+    streamed = [
+        preprocessor.preprocess_page(page)
+        for page in copy.deepcopy(document["pages"])
+    ]
+
+    assert streamed == expected["pages"]
+    metadata = preprocessor.get_metadata()
+    for key in ("document_title", "main_font_size", "recognized_headers"):
+        assert metadata[key] == expected["metadata"][key]
+    assert [para["is_type"] for para in streamed[0]["paragraphs"]][:3] == [
+        "heading",
+        "normal",
+        "caption",
+    ]
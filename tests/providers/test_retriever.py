@@ -81,3 +81,48 @@ def test_retriever_rejects_incompatible_vector_store(
 
     with pytest.raises(agents.retriever.RetrievalConfigurationError):
         agents.retriever.RetrieverAgent(store, RecordingEmbedder())
+
+
+def test_query_cache_reuses_vectors_per_model_and_exact_input():
+    cache = agents.retriever.QueryEmbeddingCache(max_entries=2)
+    embedder = RecordingEmbedder()
+    store = RecordingStore()
+    first = agents.retriever.RetrieverAgent(store, embedder, query_cache=cache)
+    second = agents.retriever.RetrieverAgent(store, embedder, query_cache=cache)
+
+    first.retrieve_documents("question", [])
+    second.retrieve_documents("question", [])
+    second.retrieve_documents("question", [{"role": "user", "content": "earlier"}])
+
+    assert len(embedder.queries) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert store.searches == [([1.0, 0.0], 5)] * 3
+    assert cache.get("other-model", embedder.queries[0]) is None
+
+    cache.put("test-model", "third", [0.0, 1.0])
+    assert len(cache) == 2
+    assert cache.get("test-model", embedder.queries[0]) is None
+    with pytest.raises(ValueError, match="max_entries"):
+        agents.retriever.QueryEmbeddingCache(max_entries=0)
+
+
+@pytest.mark.parametrize(
+    "vector", [[float("nan"), 0.0], [1.0, 0.0, 0.0], [[1.0], [0.0, 1.0]]]
+)
+def test_query_cache_skips_vectors_the_store_would_reject(vector):
+    cache = agents.retriever.QueryEmbeddingCache()
+    embedder = RecordingEmbedder()
+    embedder.embed_query = lambda text: vector
+    retriever = agents.retriever.RetrieverAgent(
+        RecordingStore(), embedder, query_cache=cache
+    )
+
+    retriever.retrieve_documents("question", [])
+
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("vector", [[float("inf"), 0.0], [[1.0], [0.0, 1.0]], []])
+def test_query_cache_rejects_non_finite_or_ragged_vectors(vector):
+    with pytest.raises(ValueError, match="finite one-dimensional"):
+        agents.retriever.QueryEmbeddingCache().put("test-model", "question", vector)
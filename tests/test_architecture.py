@@ -84,6 +84,7 @@ def test_importing_src_is_side_effect_free_in_a_fresh_process(workspace_tmp_path
 
         assert calls == []
         assert "src.cli.cli_quota" not in sys.modules
+        assert "src.cli.cli_snapshots" not in sys.modules
         assert list(Path.cwd().iterdir()) == []
         """
     )
@@ -44,6 +44,8 @@ def test_credential_free_defaults_use_local_e5_and_auto_free_route():
     assert config.max_upload_total_mb == 128
     assert config.max_upload_files == 10
     assert config.max_output_tokens == 384
+    assert config.vector_index_type == "Flat"
+    assert config.vector_metric == "inner_product"
     assert config.openai_api_key is None
     assert config.redis_url is None
     with pytest.raises(ConfigurationError, match="HUGGINGFACE_API_TOKEN"):
@@ -60,9 +62,11 @@ def test_credential_free_defaults_use_local_e5_and_auto_free_route():
         ("MAX_UPLOAD_TOTAL_MB", "0"),
         ("MAX_UPLOAD_FILES", "0"),
         ("MAX_OUTPUT_TOKENS", "0"),
+        ("EMBEDDING_MAX_BATCH_TOKENS", "0"),
         ("PROVIDER_TIMEOUT_SECONDS", "nope"),
         ("GENERATION_PROVIDER", "unknown"),
         ("OPENAI_FALLBACK_ENABLED", "sometimes"),
+        ("VECTOR_METRIC", "cosine"),
     ],
 )
 def test_invalid_configuration_is_rejected_with_canonical_variable(name, value):
@@ -70,6 +74,17 @@ def test_invalid_configuration_is_rejected_with_canonical_variable(name, value):
         AppConfig.from_sources(secrets={}, environ={name: value})
 
 
+def test_embedding_batch_token_budget_is_optional():
+    assert (
+        AppConfig.from_sources(secrets={}, environ={}).embedding_max_batch_tokens
+        is None
+    )
+    config = AppConfig.from_sources(
+        secrets={}, environ={"EMBEDDING_MAX_BATCH_TOKENS": "4096"}
+    )
+    assert config.embedding_max_batch_tokens == 4096
+
+
 @pytest.mark.parametrize(("raw", "expected"), [("yes", True), ("0", False)])
 def test_boolean_configuration_is_parsed_strictly(raw, expected):
     config = AppConfig.from_sources(
@@ -84,3 +99,20 @@ def test_total_upload_limit_cannot_be_smaller_than_per_file_limit():
             secrets={},
             environ={"MAX_UPLOAD_FILE_MB": "64", "MAX_UPLOAD_TOTAL_MB": "63"},
         )
+
+
+def test_vector_index_settings_are_resolved_and_validated():
+    config = AppConfig.from_sources(
+        secrets={},
+        environ={"VECTOR_INDEX_TYPE": "hnswflat", "VECTOR_INDEX_HNSW_M": "16"},
+    )
+    assert config.vector_index_type == "HNSWFlat"
+    assert config.vector_index_hnsw_m == 16
+
+    with pytest.raises(ConfigurationError, match="VECTOR_INDEX_TYPE"):
+        AppConfig.from_sources(secrets={}, environ={"VECTOR_INDEX_TYPE": "LSH"})
+    with pytest.raises(ConfigurationError, match="VECTOR_INDEX_PQ_M"):
+        AppConfig.from_sources(
+            secrets={},
+            environ={"VECTOR_INDEX_TYPE": "IVFPQ", "VECTOR_INDEX_PQ_M": "7"},
+        )
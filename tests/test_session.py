@@ -1,8 +1,9 @@
 import hashlib
 
+import numpy as np
 import pytest
 
-from src import application, configuration, ingestion, memory, vectorstore
+from src import application, configuration, embeddings, ingestion, memory, vectorstore
 
 AppConfig = configuration.runtime.AppConfig
 ConfigurationError = configuration.runtime.ConfigurationError
@@ -26,7 +27,7 @@ class FakeProcessor:
         if content == b"FAIL":
             raise DocumentProcessingError("simulated processing failure")
         vector = [1.0, 0.0] if content.startswith(b"A") else [0.0, 1.0]
-        embedded_chunk = {
+        record = {
             "chunk_id": f"{document_id}:000000:paragraph:part-0000",
             "text": content.decode("ascii"),
             "metadata": {
@@ -34,6 +35,7 @@ class FakeProcessor:
                 "length_unit": "characters",
                 "document_id": document_id,
                 "document_title": file_name,
+                "file_name": file_name,
                 "source_type": "paragraph",
                 "source_sequence": 0,
                 "chunk_sequence": 0,
@@ -41,11 +43,11 @@ class FakeProcessor:
                 "part_count": 1,
                 "page_number": 1,
             },
-            "embedding": vector,
         }
         return PreparedDocument(
             result=ProcessingResult(document_id, file_name, 1),
-            embedded_chunks=(embedded_chunk,),
+            records=(record,),
+            vectors=np.array([vector], dtype=np.float32),
         )
 
 
@@ -119,6 +121,73 @@ def test_upload_changes_are_detected_without_reembedding_unchanged_documents():
     assert session.store.records[0]["metadata"]["document_id"] == second.content_hash
 
 
+def test_upload_changes_update_the_active_store_in_place(monkeypatch):
+    session = manager([])
+    first = UploadedDocument("one.pdf", b"A content")
+    second = UploadedDocument("two.pdf", b"B content")
+    session.sync([first])
+    store = session.store
+    added = []
+    monkeypatch.setattr(
+        store,
+        "add_vectors",
+        lambda vectors, records, add=store.add_vectors: added.append(records)
+        or add(vectors, records),
+    )
+
+    session.sync([first, second])
+    session.sync([second])
+
+    assert session.store is store
+    assert len(added) == 1
+    assert [record["text"] for record in store.records] == ["B content"]
+
+
+def test_failed_store_change_restores_the_previous_documents(monkeypatch):
+    session = manager([])
+    first = UploadedDocument("one.pdf", b"A content")
+    session.sync([first])
+
+    def fail_add(_vectors, _records):
+        raise vectorstore.faiss.FAISSStoreError("simulated indexing failure")
+
+    monkeypatch.setattr(session.store, "add_vectors", fail_add)
+    with pytest.raises(vectorstore.faiss.FAISSStoreError, match="simulated"):
+        session.sync([UploadedDocument("two.pdf", b"B content")])
+
+    assert [record["text"] for record in session.store.records] == ["A content"]
+    assert session.sync([first]).changed is False
+
+
+def test_sessions_with_segment_stores_share_documents_but_not_state():
+    cache = vectorstore.segments.SegmentCache(dimension=2, embedding_model="fake")
+
+    def shared_manager():
+        return SessionDocumentManager(
+            store_factory=lambda: vectorstore.segments.SegmentStore(cache),
+            processor_factory=lambda store: FakeProcessor(store, []),
+            max_upload_file_bytes=1024,
+            max_upload_total_bytes=1024,
+            max_upload_files=10,
+        )
+
+    first = shared_manager()
+    second = shared_manager()
+    handbook = UploadedDocument("handbook.pdf", b"A handbook")
+    first.sync([handbook])
+    second.sync([handbook, UploadedDocument("notes.pdf", b"B notes")])
+
+    assert first.store.records[0] is second.store.records[0]
+    assert len(cache) == 2
+
+    first.sync([])
+    assert first.store.record_count == 0
+    assert [record["text"] for record in second.store.records] == [
+        "A handbook",
+        "B notes",
+    ]
+
+
 def test_conversation_history_is_explicitly_session_specific():
     store = InMemoryConversationStore(max_history=10)
     store.append("session-a", "user", "question a")
@@ -253,3 +322,137 @@ def test_embedding_provider_is_reused_across_application_sessions():
     second = application.factory.create_embedding_provider(config)
 
     assert first is second
+
+
+def test_configured_batch_token_budget_reaches_the_local_provider(monkeypatch):
+    batch_sizes = []
+
+    class BatchRecordingModel:
+        def get_sentence_embedding_dimension(self):
+            return 384
+
+        def encode(self, texts, **kwargs):
+            batch_sizes.append(len(texts))
+            return np.ones((len(texts), 384), dtype=np.float32)
+
+    monkeypatch.setattr(
+        embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider,
+        "_default_model_factory",
+        staticmethod(lambda model_id: BatchRecordingModel()),
+    )
+    # Six short passages share one batch; two long ones fill the budget alone.
+    texts = [f"short passage {number}" for number in range(6)] + [
+        f"{number} " + "long passage " * 300 for number in range(2)
+    ]
+    budgeted = application.factory.create_embedding_provider(
+        AppConfig(embedding_model="budget/test-model", embedding_max_batch_tokens=2_048)
+    )
+
+    budgeted.embed_documents_array(texts)
+    assert batch_sizes == [6, 2]
+
+    batch_sizes.clear()
+    unbudgeted = application.factory.create_embedding_provider(
+        AppConfig(embedding_model="budget/test-model")
+    )
+    unbudgeted.embed_documents_array(texts)
+    assert batch_sizes == [8]
+
+
+def test_enabled_warm_up_failure_is_logged_without_failing_startup(caplog, monkeypatch):
+    load_attempts = []
+
+    def unavailable(model_id):
+        load_attempts.append(model_id)
+        raise OSError(model_id)
+
+    monkeypatch.setattr(
+        embeddings.sentence_transformer.SentenceTransformerEmbeddingProvider,
+        "_default_model_factory",
+        staticmethod(unavailable),
+    )
+    config = AppConfig(embedding_model="missing/test-model", embedding_warm_up=True)
+
+    provider = application.factory.create_embedding_provider(config)
+
+    assert not provider.ready
+    assert "embedding_warm_up_failed model=missing/test-model" in caplog.text
+
+    assert application.factory.create_embedding_provider(config) is provider
+    assert load_attempts == ["missing/test-model"]
+
+
+@pytest.mark.parametrize("from_disk", [False, True])
+def test_prepared_documents_are_shared_between_sessions_through_the_cache(
+    workspace_tmp_path, from_disk
+):
+    directory = workspace_tmp_path / "prepared"
+    cache = ingestion.cache.PreparedDocumentCache(
+        configuration_key="fake", max_bytes=1024 * 1024, path=directory
+    )
+    calls = []
+
+    def cached_manager():
+        return SessionDocumentManager(
+            store_factory=lambda: FAISSStore(dimension=2, embedding_model="fake"),
+            processor_factory=lambda store: FakeProcessor(store, calls),
+            max_upload_file_bytes=1024,
+            max_upload_total_bytes=1024,
+            max_upload_files=10,
+            prepared_cache=cache,
+        )
+
+    first_manager = cached_manager()
+    first = first_manager.sync([UploadedDocument("one.pdf", b"A content")])
+    if from_disk:
+        cache = ingestion.cache.PreparedDocumentCache(
+            configuration_key="fake", max_bytes=1024 * 1024, path=directory
+        )
+    second_manager = cached_manager()
+    second = second_manager.sync([UploadedDocument("renamed.pdf", b"A content")])
+
+    assert len(calls) == 1
+    assert [result.file_name for result in first.processed] == ["one.pdf"]
+    assert [result.file_name for result in second.processed] == ["renamed.pdf"]
+    assert [
+        (record["metadata"]["file_name"], record["metadata"]["document_title"])
+        for record in second_manager.store.records
+    ] == [("renamed.pdf", "renamed.pdf")]
+    assert [
+        (record["metadata"]["file_name"], record["metadata"]["document_title"])
+        for record in first_manager.store.records
+    ] == [("one.pdf", "one.pdf")]
+    assert second_manager.store.records[0]["text"] == "A content"
+    cached = cache.get(second.processed[0].document_id)
+    assert isinstance(cached.records[0], vectorstore.records.ReadOnlyDict)
+    assert cached.records[0]["metadata"]["file_name"] == "one.pdf"
+
+
+def test_bumped_pipeline_version_misses_persisted_preparations(
+    workspace_tmp_path, monkeypatch
+):
+    directory = workspace_tmp_path / "prepared"
+    config = AppConfig()
+    record = {"chunk_id": "c1", "text": "one", "metadata": {}}
+    document = PreparedDocument(
+        result=ProcessingResult("doc", "doc.pdf", 1),
+        records=(record,),
+        vectors=np.array([[1.0, 0.0]], dtype=np.float32),
+    )
+
+    def persisted_cache():
+        return ingestion.cache.PreparedDocumentCache(
+            configuration_key=application.factory._preparation_key(config),
+            max_bytes=1024 * 1024,
+            path=directory,
+        )
+
+    persisted_cache().put(document)
+    assert persisted_cache().get("doc") is not None
+
+    monkeypatch.setattr(
+        ingestion.processor,
+        "PREPARATION_PIPELINE_VERSION",
+        ingestion.processor.PREPARATION_PIPELINE_VERSION + 1,
+    )
+    assert persisted_cache().get("doc") is None
@@ -0,0 +1,68 @@
+import json
+from io import StringIO
+
+from src import vectorstore
+from src.cli import cli_snapshots
+
+
+def test_cli_passes_the_retention_policy_and_prints_a_report(workspace_tmp_path):
+    calls = []
+
+    def collector(directory, retention, *, dry_run):
+        calls.append((directory, retention, dry_run))
+        return vectorstore.faiss.SnapshotCollection(
+            removed=(".pending-old",), retained=(), dry_run=dry_run
+        )
+
+    stdout = StringIO()
+    stderr = StringIO()
+    result = cli_snapshots.run(
+        [
+            str(workspace_tmp_path),
+            "--keep-generations",
+            "2",
+            "--max-age-seconds",
+            "86400",
+            "--dry-run",
+        ],
+        stdout=stdout,
+        stderr=stderr,
+        collector=collector,
+    )
+
+    assert result == 0
+    assert calls == [
+        (
+            workspace_tmp_path,
+            vectorstore.faiss.SnapshotRetention(
+                keep_generations=2, max_age_seconds=86400
+            ),
+            True,
+        )
+    ]
+    assert json.loads(stdout.getvalue()) == {
+        "dry_run": True,
+        "removed": [".pending-old"],
+        "retained": [],
+    }
+    assert stderr.getvalue() == ""
+
+
+def test_cli_reports_invalid_policies_and_missing_pointers(workspace_tmp_path):
+    stderr = StringIO()
+    assert (
+        cli_snapshots.run(
+            [str(workspace_tmp_path), "--keep-generations", "-1"],
+            stdout=StringIO(),
+            stderr=stderr,
+        )
+        == 1
+    )
+    assert "keep_generations" in stderr.getvalue()
+
+    stderr = StringIO()
+    assert (
+        cli_snapshots.run([str(workspace_tmp_path)], stdout=StringIO(), stderr=stderr)
+        == 1
+    )
+    assert "No snapshot pointer" in stderr.getvalue()
@@ -1,9 +1,12 @@
+import copy
 import json
 import os
+import pickle
 import subprocess
 import sys
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from src import vectorstore
@@ -22,14 +25,14 @@ DIMENSION = 3
 MODEL = "test-embedding-model"
 
 
-def embedded_chunk(chunk_id, vector, *, page=1, labels=None):
+def embedded_chunk(chunk_id, vector, *, page=1, labels=None, document="doc-a"):
     return {
         "chunk_id": chunk_id,
         "text": f"text for {chunk_id}",
         "metadata": {
             "schema_version": 1,
             "length_unit": "characters",
-            "document_id": "doc-a",
+            "document_id": document,
             "document_title": "Test document",
             "source_type": "paragraph",
             "source_sequence": page - 1,
@@ -44,9 +47,12 @@ def embedded_chunk(chunk_id, vector, *, page=1, labels=None):
     }
 
 
+def current_generations(snapshot_directory: Path) -> list[str]:
+    return (snapshot_directory / "CURRENT").read_text(encoding="utf-8").splitlines()
+
+
 def generation_directory(snapshot_directory: Path) -> Path:
-    generation = (snapshot_directory / "CURRENT").read_text(encoding="utf-8")
-    return snapshot_directory / "snapshots" / generation
+    return snapshot_directory / "snapshots" / current_generations(snapshot_directory)[0]
 
 
 def manifest(snapshot_directory: Path) -> tuple[Path, dict]:
@@ -58,6 +64,28 @@ def write_manifest(path: Path, data: dict) -> None:
     path.write_text(json.dumps(data), encoding="utf-8")
 
 
+def rewrite_column(snapshot_directory: Path, name: str, values: list[str]) -> None:
+    path, data = manifest(snapshot_directory)
+    data["columns"][name] = vectorstore.columns.write_string_column(
+        path.parent, name, values
+    )
+    write_manifest(path, data)
+
+
+def legacy_manifest(snapshot_directory: Path, store) -> tuple[Path, dict]:
+    """Rewrite the current generation in the schema-1 inline-records layout."""
+
+    path, data = manifest(snapshot_directory)
+    for description in data.pop("columns").values():
+        (path.parent / description["offsets"]).unlink()
+        (path.parent / description["data"]).unlink()
+    del data["record_count"]
+    data["schema_version"] = 1
+    data["records"] = [copy.deepcopy(record) for record in store.records]
+    write_manifest(path, data)
+    return path, data
+
+
 def test_snapshot_reloads_records_and_metadata(workspace_tmp_path):
     snapshot_directory = workspace_tmp_path / "store"
     store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
@@ -82,10 +110,11 @@ def test_snapshot_reloads_records_and_metadata(workspace_tmp_path):
     assert reloaded_record["metadata"]["page_number"] == 2
 
     _, saved_manifest = manifest(snapshot_directory)
-    assert saved_manifest["schema_version"] == 1
+    assert saved_manifest["schema_version"] == 3
     assert saved_manifest["embedding_dimension"] == DIMENSION
     assert saved_manifest["embedding_model"] == MODEL
-    assert len(saved_manifest["records"]) == reloaded.index.ntotal == 2
+    assert saved_manifest["record_count"] == reloaded.index.ntotal == 2
+    assert "records" not in saved_manifest
 
 
 def test_snapshot_reloads_in_a_clean_process(workspace_tmp_path):
@@ -193,7 +222,7 @@ def test_index_and_metadata_count_mismatch_is_rejected(workspace_tmp_path):
     snapshot_directory = workspace_tmp_path / "store"
     store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
     store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
-    path, data = manifest(snapshot_directory)
+    path, data = legacy_manifest(snapshot_directory, store)
     data["records"] = []
     write_manifest(path, data)
 
@@ -205,7 +234,7 @@ def test_corrupted_record_metadata_is_rejected(workspace_tmp_path):
     snapshot_directory = workspace_tmp_path / "store"
     store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
     store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
-    path, data = manifest(snapshot_directory)
+    path, data = legacy_manifest(snapshot_directory, store)
     data["records"][0]["metadata"] = "not-an-object"
     write_manifest(path, data)
 
@@ -213,11 +242,30 @@ def test_corrupted_record_metadata_is_rejected(workspace_tmp_path):
         FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
 
 
+def test_corrupted_column_metadata_is_rejected_at_load(workspace_tmp_path):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
+    rewrite_column(snapshot_directory, "metadata", ['"not-an-object"'])
+
+    with pytest.raises(CorruptSnapshotError, match="not a JSON object"):
+        FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+
+    # A well-framed row outside the chunk schema must not activate either.
+    rewrite_column(snapshot_directory, "metadata", ["{}"])
+    with pytest.raises(CorruptSnapshotError, match="shared chunk schema"):
+        FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+
+    rewrite_column(snapshot_directory, "document_id", [""])
+    with pytest.raises(CorruptSnapshotError, match="empty document_id"):
+        FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+
+
 def test_snapshot_record_outside_shared_schema_is_rejected(workspace_tmp_path):
     snapshot_directory = workspace_tmp_path / "store"
     store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
     store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
-    path, data = manifest(snapshot_directory)
+    path, data = legacy_manifest(snapshot_directory, store)
     del data["records"][0]["metadata"]["part_count"]
     write_manifest(path, data)
 
@@ -281,9 +329,901 @@ def test_duplicate_ids_in_snapshot_are_rejected(workspace_tmp_path):
             embedded_chunk("chunk-b", [1.0, 0.0, 0.0]),
         ]
     )
-    path, data = manifest(snapshot_directory)
+    path, data = legacy_manifest(snapshot_directory, store)
     data["records"][1]["chunk_id"] = "chunk-a"
     write_manifest(path, data)
 
     with pytest.raises(DuplicateChunkIDError, match="chunk-a"):
         FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+
+
+def test_duplicate_ids_in_snapshot_columns_are_rejected_at_load(workspace_tmp_path):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks(
+        [
+            embedded_chunk("chunk-a", [0.0, 0.0, 0.0]),
+            embedded_chunk("chunk-b", [1.0, 0.0, 0.0]),
+        ]
+    )
+    rewrite_column(snapshot_directory, "chunk_id", ["chunk-a", "chunk-a"])
+
+    with pytest.raises(DuplicateChunkIDError, match="chunk-a"):
+        FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+
+
+def test_duplicate_ids_across_delta_columns_are_rejected_at_load(workspace_tmp_path):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
+    store.add_embedded_chunks([embedded_chunk("chunk-b", [1.0, 0.0, 0.0])])
+    delta_directory = (
+        snapshot_directory / "snapshots" / current_generations(snapshot_directory)[1]
+    )
+    delta_path = delta_directory / "manifest.json"
+    delta = json.loads(delta_path.read_text(encoding="utf-8"))
+    delta["columns"]["chunk_id"] = vectorstore.columns.write_string_column(
+        delta_directory, "chunk_id", ["chunk-a"]
+    )
+    write_manifest(delta_path, delta)
+
+    with pytest.raises(DuplicateChunkIDError, match="chunk-a"):
+        FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+
+
+def test_legacy_inline_manifest_still_loads(workspace_tmp_path):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
+    legacy_manifest(snapshot_directory, store)
+
+    reloaded = FAISSStore(
+        snapshot_directory, dimension=DIMENSION, embedding_model=MODEL
+    )
+    assert reloaded.search([0.0, 0.0, 0.0], k=1)[0]["chunk_id"] == "chunk-a"
+
+    reloaded.add_embedded_chunks([embedded_chunk("chunk-b", [1.0, 0.0, 0.0])])
+    assert reloaded.compact() is True
+    _, upgraded = manifest(snapshot_directory)
+    assert upgraded["schema_version"] == 3
+    assert upgraded["record_count"] == 2
+
+
+def test_snapshot_columns_are_memory_mapped_and_decoded_lazily(
+    workspace_tmp_path, monkeypatch
+):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks(
+        [
+            embedded_chunk("chunk-a", [0.0, 0.0, 0.0], labels=["naïve"]),
+            embedded_chunk("chunk-b", [10.0, 0.0, 0.0]),
+        ]
+    )
+    path, data = manifest(snapshot_directory)
+    assert set(data["columns"]) == {"chunk_id", "document_id", "text", "metadata"}
+    metadata_rows = (path.parent / data["columns"]["metadata"]["data"]).read_text(
+        encoding="utf-8"
+    )
+    assert "naïve" in metadata_rows and ", " not in metadata_rows
+
+    read_flags = []
+    original_read_index = faiss_store_module.faiss.read_index
+
+    def recording_read_index(filename, flags=0):
+        read_flags.append(flags)
+        return original_read_index(filename, flags)
+
+    monkeypatch.setattr(faiss_store_module.faiss, "read_index", recording_read_index)
+    decoded = []
+    original_loads = faiss_store_module.json.loads
+
+    def recording_loads(text, **kwargs):
+        if not kwargs:
+            # json.load passes keyword arguments; metadata rows are decoded bare.
+            decoded.append(text)
+        return original_loads(text, **kwargs)
+
+    monkeypatch.setattr(faiss_store_module.json, "loads", recording_loads)
+    FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    assert len(decoded) == 2
+
+    read_flags.clear()
+    decoded.clear()
+    reloaded = FAISSStore(
+        snapshot_directory,
+        dimension=DIMENSION,
+        embedding_model=MODEL,
+        lazy_records=True,
+    )
+
+    assert read_flags == [faiss_store_module.faiss.IO_FLAG_MMAP_IFC]
+    assert decoded == []
+    assert reloaded.search([0.0, 0.0, 0.0], k=1)[0]["metadata"]["labels"] == ["naïve"]
+    assert len(decoded) == 1
+    assert reloaded.get_record("chunk-b")["metadata"]["page_number"] == 1
+
+    # The mapped index is copied before the first append instead of aborting.
+    reloaded.add_embedded_chunks([embedded_chunk("chunk-c", [5.0, 0.0, 0.0])])
+    assert reloaded.search([5.0, 0.0, 0.0], k=1)[0]["chunk_id"] == "chunk-c"
+
+
+def test_corrupted_snapshot_columns_are_rejected(workspace_tmp_path):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
+    path, data = manifest(snapshot_directory)
+    text_data = path.parent / data["columns"]["text"]["data"]
+    metadata_data = path.parent / data["columns"]["metadata"]["data"]
+
+    original_text = text_data.read_bytes()
+    text_data.write_bytes(original_text[:-1])
+    with pytest.raises(CorruptSnapshotError, match="snapshot columns"):
+        FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    text_data.write_bytes(original_text)
+
+    original_metadata = metadata_data.read_bytes()
+    metadata_data.write_bytes(b"{" * len(original_metadata))
+    with pytest.raises(CorruptSnapshotError, match="not a JSON object"):
+        FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+
+    # Rows framed like objects are parsed before the snapshot becomes active.
+    metadata_data.write_bytes(b"{" * (len(original_metadata) - 1) + b"}")
+    with pytest.raises(CorruptSnapshotError, match="Could not decode"):
+        FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+
+    # Lazy decoding is an explicit opt-in that defers the failure to first access.
+    reloaded = FAISSStore(
+        snapshot_directory,
+        dimension=DIMENSION,
+        embedding_model=MODEL,
+        lazy_records=True,
+    )
+    with pytest.raises(CorruptSnapshotError, match="Could not decode"):
+        reloaded.search([0.0, 0.0, 0.0], k=1)
+
+
+def test_appends_publish_delta_generations_until_compaction(workspace_tmp_path):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(
+        snapshot_directory,
+        dimension=DIMENSION,
+        embedding_model=MODEL,
+        max_delta_generations=2,
+    )
+    for position in range(3):
+        store.add_embedded_chunks(
+            [embedded_chunk(f"chunk-{position}", [float(position), 0.0, 0.0])]
+        )
+
+    base, *deltas = current_generations(snapshot_directory)
+    assert base.startswith("snapshot-") and len(deltas) == 2
+    delta_directory = snapshot_directory / "snapshots" / deltas[-1]
+    assert sorted(path.name for path in delta_directory.iterdir()) == [
+        "chunk_id.data",
+        "chunk_id.offsets",
+        "document_id.data",
+        "document_id.offsets",
+        "manifest.json",
+        "metadata.data",
+        "metadata.offsets",
+        "text.data",
+        "text.offsets",
+        "vectors.npy",
+    ]
+
+    reloaded = FAISSStore(
+        snapshot_directory, dimension=DIMENSION, embedding_model=MODEL
+    )
+    assert [record["chunk_id"] for record in reloaded.records] == [
+        "chunk-0",
+        "chunk-1",
+        "chunk-2",
+    ]
+    assert reloaded.search([2.0, 0.0, 0.0], k=1)[0]["chunk_id"] == "chunk-2"
+    assert reloaded.get_record("chunk-1")["text"] == "text for chunk-1"
+
+    # A third delta would exceed the limit, so the append compacts the chain.
+    store.add_embedded_chunks([embedded_chunk("chunk-3", [3.0, 0.0, 0.0])])
+    assert len(current_generations(snapshot_directory)) == 1
+    _, compacted = manifest(snapshot_directory)
+    assert compacted["record_count"] == 4
+    assert store.compact() is False
+
+    store.add_embedded_chunks([embedded_chunk("chunk-4", [4.0, 0.0, 0.0])])
+    assert store.compact() is True
+    assert len(current_generations(snapshot_directory)) == 1
+    assert (
+        FAISSStore(
+            snapshot_directory, dimension=DIMENSION, embedding_model=MODEL
+        ).record_count
+        == 5
+    )
+
+
+def test_corrupt_delta_generations_are_rejected(workspace_tmp_path):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
+    store.add_embedded_chunks([embedded_chunk("chunk-b", [1.0, 0.0, 0.0])])
+    delta_directory = (
+        snapshot_directory / "snapshots" / current_generations(snapshot_directory)[1]
+    )
+    delta_manifest_path = delta_directory / "manifest.json"
+    delta_manifest = json.loads(delta_manifest_path.read_text(encoding="utf-8"))
+
+    write_manifest(delta_manifest_path, {**delta_manifest, "start": 0})
+    with pytest.raises(CorruptSnapshotError, match=r"mismatched fields: \['start'\]"):
+        FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+
+    write_manifest(delta_manifest_path, {**delta_manifest, "removed": [1]})
+    with pytest.raises(CorruptSnapshotError, match="removed positions below 1"):
+        FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+
+    write_manifest(delta_manifest_path, delta_manifest)
+    vectors = delta_directory / "vectors.npy"
+    vectors_bytes = vectors.read_bytes()
+    vectors.unlink()
+    with pytest.raises(CorruptSnapshotError, match="incomplete"):
+        FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+
+    vectors.write_bytes(vectors_bytes)
+    (snapshot_directory / "CURRENT").write_text(
+        "\n".join([*current_generations(snapshot_directory), delta_directory.name]),
+        encoding="utf-8",
+    )
+    with pytest.raises(CorruptSnapshotError, match="does not continue its chain"):
+        FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+
+
+def test_appends_extend_the_active_index_in_place(monkeypatch):
+    store = FAISSStore(dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
+    active_index = store.index
+
+    def fail_clone(_index):
+        raise AssertionError("appends must not clone the active index")
+
+    monkeypatch.setattr(faiss_store_module.faiss, "clone_index", fail_clone)
+    store.add_embedded_chunks([embedded_chunk("chunk-b", [1.0, 0.0, 0.0], page=2)])
+
+    assert store.index is active_index
+    assert store.index.ntotal == store.record_count == 2
+    results = store.search([1.0, 0.0, 0.0], k=1)
+    assert [result["chunk_id"] for result in results] == ["chunk-b"]
+
+
+def test_add_vectors_validates_a_matrix_without_per_row_conversion(monkeypatch):
+    store = FAISSStore(dimension=DIMENSION, embedding_model=MODEL)
+    records = [
+        embedded_chunk(f"chunk-{index}", None, page=index + 1) for index in range(3)
+    ]
+    for record in records:
+        del record["embedding"]
+    matrix = np.array(
+        [[0.0, 0.0, 0.0], [5.0, 0.0, 0.0], [9.0, 0.0, 0.0]], dtype=np.float32
+    )
+
+    def fail_row_validation(*_args):
+        raise AssertionError("valid matrices must not be validated row by row")
+
+    with pytest.raises(DimensionMismatchError, match=r"shape \(3, 3\)"):
+        store.add_vectors(matrix, records[:2])
+    poisoned = matrix.copy()
+    poisoned[1, 2] = np.inf
+    with pytest.raises(InvalidVectorRecordError, match="'chunk-1' contains non-finite"):
+        store.add_vectors(poisoned, records)
+    with pytest.raises(DimensionMismatchError, match="'chunk-0' has dimension 2"):
+        store.add_vectors([[0.0, 0.0], [1.0, 0.0, 0.0], [2.0, 0.0, 0.0]], records)
+
+    assert store.record_count == 0
+    monkeypatch.setattr(store, "_validate_vector", fail_row_validation)
+    assert store.add_vectors(matrix, records) == 3
+    results = store.search([5.0, 0.0, 0.0], k=1)
+    assert [result["chunk_id"] for result in results] == ["chunk-1"]
+    assert "embedding" not in results[0]
+
+
+def test_failed_snapshot_rolls_back_the_appended_tail(workspace_tmp_path, monkeypatch):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
+
+    def fail_snapshot(*_args):
+        raise FAISSStoreError("simulated snapshot failure")
+
+    monkeypatch.setattr(store, "_publish_generation", fail_snapshot)
+    with pytest.raises(FAISSStoreError, match="simulated snapshot failure"):
+        store.add_embedded_chunks(
+            [
+                embedded_chunk("chunk-b", [1.0, 0.0, 0.0], page=2),
+                embedded_chunk("chunk-c", [2.0, 0.0, 0.0], page=3),
+            ]
+        )
+
+    assert store.index.ntotal == store.record_count == 1
+    assert store.get_record("chunk-b") is None
+    assert [result["chunk_id"] for result in store.search([2.0, 0.0, 0.0], k=5)] == [
+        "chunk-a"
+    ]
+
+    monkeypatch.undo()
+    store.add_embedded_chunks([embedded_chunk("chunk-b", [1.0, 0.0, 0.0], page=2)])
+    assert [record["chunk_id"] for record in store.records] == ["chunk-a", "chunk-b"]
+
+
+def grid_chunks(count, *, offset=0, document="doc-a"):
+    return [
+        embedded_chunk(
+            f"chunk-{offset + index:03d}",
+            [float(offset + index), float((offset + index) % 5), 1.0],
+            page=offset + index + 1,
+            document=document,
+        )
+        for index in range(count)
+    ]
+
+
+def test_ivf_index_trains_once_enough_vectors_are_staged(workspace_tmp_path):
+    spec = faiss_store_module.FAISSIndexSpec(
+        index_type="IVFFlat", nlist=2, nprobe=2, training_threshold=8
+    )
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(
+        snapshot_directory,
+        dimension=DIMENSION,
+        embedding_model=MODEL,
+        index_spec=spec,
+    )
+    store.add_embedded_chunks(grid_chunks(4))
+    assert isinstance(store.index, faiss_store_module.faiss.IndexFlat)
+    _, staged_manifest = manifest(snapshot_directory)
+    assert staged_manifest["index"] == {
+        "type": "IVFFlat",
+        "parameters": {"nlist": 2},
+        "trained": False,
+    }
+
+    store.add_embedded_chunks(grid_chunks(6, offset=4))
+    assert isinstance(store.index, faiss_store_module.faiss.IndexIVFFlat)
+    assert store.index.ntotal == store.record_count == 10
+
+    reloaded = FAISSStore(
+        snapshot_directory,
+        dimension=DIMENSION,
+        embedding_model=MODEL,
+        index_spec=spec,
+    )
+    assert isinstance(reloaded.index, faiss_store_module.faiss.IndexIVFFlat)
+    results = reloaded.search([7.0, 2.0, 1.0], k=1)
+    assert [result["chunk_id"] for result in results] == ["chunk-007"]
+
+
+def test_hnsw_index_rolls_back_failed_appends(monkeypatch):
+    spec = faiss_store_module.FAISSIndexSpec(index_type="HNSWFlat", hnsw_m=4)
+    store = FAISSStore(dimension=DIMENSION, embedding_model=MODEL, index_spec=spec)
+    store.add_embedded_chunks(grid_chunks(3))
+
+    def fail_training(index):
+        raise FAISSStoreError("simulated failure")
+
+    monkeypatch.setattr(store, "_trained_index", fail_training)
+    with pytest.raises(FAISSStoreError, match="simulated failure"):
+        store.add_embedded_chunks(grid_chunks(2, offset=3))
+
+    assert isinstance(store.index, faiss_store_module.faiss.IndexHNSWFlat)
+    assert store.index.ntotal == store.record_count == 3
+    results = store.search([2.0, 2.0, 1.0], k=5)
+    assert results[0]["chunk_id"] == "chunk-002"
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        faiss_store_module.FAISSIndexSpec(),
+        faiss_store_module.FAISSIndexSpec(
+            index_type="IVFFlat", nlist=2, nprobe=2, training_threshold=8
+        ),
+        faiss_store_module.FAISSIndexSpec(index_type="HNSWFlat", hnsw_m=4),
+    ],
+    ids=["Flat", "IVFFlat", "HNSWFlat"],
+)
+def test_remove_document_keeps_survivors_dense_and_searchable(spec):
+    store = FAISSStore(dimension=DIMENSION, embedding_model=MODEL, index_spec=spec)
+    store.add_embedded_chunks(grid_chunks(4, document="doc-a"))
+    store.add_embedded_chunks(grid_chunks(4, offset=4, document="doc-b"))
+    store.add_embedded_chunks(grid_chunks(4, offset=8, document="doc-a"))
+
+    assert store.remove_document("doc-a") == 8
+    assert store.remove_document("doc-a") == 0
+
+    assert store.index.ntotal == store.record_count == 4
+    assert [record["chunk_id"] for record in store.records] == [
+        "chunk-004",
+        "chunk-005",
+        "chunk-006",
+        "chunk-007",
+    ]
+    assert store.get_record("chunk-000") is None
+    for chunk in grid_chunks(4, offset=4):
+        results = store.search(chunk["embedding"], k=1)
+        assert [result["chunk_id"] for result in results] == [chunk["chunk_id"]]
+
+    store.add_embedded_chunks(grid_chunks(1, offset=20, document="doc-c"))
+    record = store.get_record("chunk-020")
+    assert record is not None
+    assert store.records[4] is record
+
+
+def test_replace_document_publishes_one_generation(workspace_tmp_path):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks(grid_chunks(3, document="doc-a"))
+    store.add_embedded_chunks(grid_chunks(2, offset=3, document="doc-b"))
+    previous = current_generations(snapshot_directory)
+    replacement = [
+        embedded_chunk("chunk-001", [20.0, 0.0, 0.0], document="doc-a"),
+        embedded_chunk("chunk-new", [30.0, 0.0, 0.0], document="doc-a"),
+    ]
+
+    assert store.replace_document("doc-a", replacement) == 2
+
+    *chain, delta = current_generations(snapshot_directory)
+    assert chain == previous and delta.startswith("delta-")
+    delta_manifest = json.loads(
+        (snapshot_directory / "snapshots" / delta / "manifest.json").read_text(
+            encoding="utf-8"
+        )
+    )
+    assert delta_manifest["removed"] == [0, 1, 2]
+    assert delta_manifest["record_count"] == 2
+    reloaded = FAISSStore(
+        snapshot_directory, dimension=DIMENSION, embedding_model=MODEL
+    )
+    assert [record["chunk_id"] for record in reloaded.records] == [
+        "chunk-003",
+        "chunk-004",
+        "chunk-001",
+        "chunk-new",
+    ]
+    results = reloaded.search([20.0, 0.0, 0.0], k=1)
+    assert [result["chunk_id"] for result in results] == ["chunk-001"]
+    # Tombstones would now outnumber live records, so the removal compacts.
+    assert reloaded.remove_document("doc-b") == 2
+    assert [record["chunk_id"] for record in reloaded.records] == [
+        "chunk-001",
+        "chunk-new",
+    ]
+    assert reloaded.index.ntotal == 2
+    assert len(current_generations(snapshot_directory)) == 1
+
+
+def test_replace_document_rejects_foreign_and_duplicate_chunks():
+    store = FAISSStore(dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks(grid_chunks(2, document="doc-a"))
+    store.add_embedded_chunks(grid_chunks(1, offset=2, document="doc-b"))
+
+    with pytest.raises(InvalidVectorRecordError, match="doc-b"):
+        store.replace_document("doc-a", grid_chunks(1, offset=5, document="doc-b"))
+    with pytest.raises(DuplicateChunkIDError, match="chunk-002"):
+        store.replace_document("doc-a", grid_chunks(1, offset=2, document="doc-a"))
+
+    assert [record["chunk_id"] for record in store.records] == [
+        "chunk-000",
+        "chunk-001",
+        "chunk-002",
+    ]
+
+
+def test_failed_removal_leaves_the_store_unchanged(workspace_tmp_path, monkeypatch):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks(grid_chunks(2, document="doc-a"))
+    store.add_embedded_chunks(grid_chunks(2, offset=2, document="doc-b"))
+    generations = current_generations(snapshot_directory)
+    index = store.index
+
+    def fail_publication(*_args):
+        raise FAISSStoreError("simulated failure")
+
+    monkeypatch.setattr(store, "_publish_generation", fail_publication)
+    with pytest.raises(FAISSStoreError, match="simulated failure"):
+        store.remove_document("doc-a")
+
+    assert store.index is index
+    assert store.index.ntotal == store.record_count == 4
+    assert store.get_record("chunk-000") is not None
+    assert current_generations(snapshot_directory) == generations
+    monkeypatch.undo()
+    assert store.remove_document("doc-a") == 2
+    assert store.get_record("chunk-002") is store.records[0]
+
+
+def test_removal_from_a_large_store_leaves_other_records_in_place(
+    workspace_tmp_path, monkeypatch
+):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks(grid_chunks(500, document="doc-bulk"))
+    store.add_embedded_chunks(grid_chunks(3, offset=500, document="doc-small"))
+    index = store.index
+    survivor = store.get_record("chunk-499")
+
+    def fail_rebuild(*_args):
+        raise AssertionError("removal rebuilt the remaining records")
+
+    for name in ("_index_without", "_shift_positions", "_write_atomic_snapshot"):
+        monkeypatch.setattr(store, name, fail_rebuild)
+    assert store.remove_document("doc-small") == 3
+
+    assert store.index is index and index.ntotal == 503
+    assert store.record_count == len(store.records) == 500
+    assert store.get_record("chunk-501") is None
+    assert store.get_record("chunk-499") is survivor
+    results = store.search([501.0, 1.0, 1.0], k=5)
+    assert len(results) == 5
+    assert all(result["metadata"]["document_id"] == "doc-bulk" for result in results)
+    assert len(current_generations(snapshot_directory)) == 3
+
+    reloaded = FAISSStore(
+        snapshot_directory, dimension=DIMENSION, embedding_model=MODEL
+    )
+    assert reloaded.record_count == 500
+    assert reloaded.get_record("chunk-500") is None
+    assert reloaded.search([501.0, 4.0, 1.0], k=1)[0]["chunk_id"] == "chunk-499"
+
+    # Tombstoned identifiers are free again, and compaction drops their slots.
+    reloaded.add_embedded_chunks(grid_chunks(3, offset=500, document="doc-small"))
+    assert reloaded.get_record("chunk-501")["metadata"]["page_number"] == 502
+    assert reloaded.compact() is True
+    assert reloaded.index.ntotal == reloaded.record_count == 503
+    assert reloaded.get_record("chunk-501") is reloaded.records[501]
+
+
+def filterable_chunks(count, *, offset=0, document="doc-a", language="en"):
+    chunks = grid_chunks(count, offset=offset, document=document)
+    for chunk in chunks:
+        page = chunk["metadata"]["page_number"]
+        chunk["metadata"]["source_type"] = "table" if page % 2 else "paragraph"
+        chunk["metadata"]["document_language"] = language
+    return chunks
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        faiss_store_module.FAISSIndexSpec(),
+        faiss_store_module.FAISSIndexSpec(
+            index_type="IVFFlat", nlist=2, nprobe=2, training_threshold=8
+        ),
+        faiss_store_module.FAISSIndexSpec(index_type="HNSWFlat", hnsw_m=4),
+    ],
+    ids=["Flat", "IVFFlat", "HNSWFlat"],
+)
+def test_filtered_search_returns_only_matching_records(spec):
+    SearchFilter = vectorstore.filters.SearchFilter
+    store = FAISSStore(dimension=DIMENSION, embedding_model=MODEL, index_spec=spec)
+    store.add_embedded_chunks(filterable_chunks(6, document="doc-a"))
+    store.add_embedded_chunks(
+        filterable_chunks(6, offset=6, document="doc-b", language="de")
+    )
+
+    def chunk_ids(search_filter, k=12):
+        results = store.search([0.0, 0.0, 1.0], k=k, filter=search_filter)
+        return sorted(result["chunk_id"] for result in results)
+
+    assert chunk_ids(SearchFilter(document_ids=["doc-b"])) == [
+        f"chunk-{index:03d}" for index in range(6, 12)
+    ]
+    assert chunk_ids(SearchFilter(page_range=(2, 4))) == [
+        "chunk-001",
+        "chunk-002",
+        "chunk-003",
+    ]
+    assert chunk_ids(
+        SearchFilter(source_types={"table"}, document_languages=("de",))
+    ) == ["chunk-006", "chunk-008", "chunk-010"]
+    assert chunk_ids(SearchFilter(document_ids=["doc-a"]), k=2) == [
+        "chunk-000",
+        "chunk-001",
+    ]
+    assert chunk_ids(SearchFilter(document_ids=["doc-missing"])) == []
+    assert chunk_ids(SearchFilter(source_types=["heading"])) == []
+
+
+def test_filter_index_follows_appends_and_removals():
+    SearchFilter = vectorstore.filters.SearchFilter
+    store = FAISSStore(dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks(filterable_chunks(4, document="doc-a"))
+    tables = SearchFilter(source_types=["table"])
+    assert len(store.search([0.0, 0.0, 1.0], k=10, filter=tables)) == 2
+
+    store.add_embedded_chunks(filterable_chunks(4, offset=4, document="doc-b"))
+    batch = store.search_batch([[0.0, 0.0, 1.0], [7.0, 2.0, 1.0]], k=1, filter=tables)
+    assert [[result["chunk_id"] for result in results] for results in batch] == [
+        ["chunk-000"],
+        ["chunk-006"],
+    ]
+
+    store.remove_document("doc-a")
+    results = store.search([0.0, 0.0, 1.0], k=10, filter=tables)
+    assert sorted(result["chunk_id"] for result in results) == [
+        "chunk-004",
+        "chunk-006",
+    ]
+
+
+def test_search_filters_are_validated():
+    SearchFilter = vectorstore.filters.SearchFilter
+    store = FAISSStore(dimension=DIMENSION, embedding_model=MODEL)
+
+    with pytest.raises(TypeError, match="SearchFilter"):
+        store.search([0.0, 0.0, 0.0], filter={"document_ids": ["doc-a"]})
+    with pytest.raises(TypeError, match="document_ids"):
+        SearchFilter(document_ids="doc-a")
+    with pytest.raises(ValueError, match="source_types"):
+        SearchFilter(source_types=[])
+    with pytest.raises(ValueError, match="page_range"):
+        SearchFilter(page_range=(3, 1))
+    assert SearchFilter(document_ids=["a", "a"]) == SearchFilter(document_ids={"a"})
+
+
+def test_snapshot_index_type_mismatch_is_rejected(workspace_tmp_path):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
+
+    with pytest.raises(IncompatibleSnapshotError, match="'Flat'"):
+        FAISSStore(
+            snapshot_directory,
+            dimension=DIMENSION,
+            embedding_model=MODEL,
+            index_spec=faiss_store_module.FAISSIndexSpec(index_type="HNSWFlat"),
+        )
+
+
+def test_manifest_without_index_description_loads_as_flat(workspace_tmp_path):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
+    path, data = manifest(snapshot_directory)
+    del data["index"]
+    write_manifest(path, data)
+
+    reloaded = FAISSStore(
+        snapshot_directory, dimension=DIMENSION, embedding_model=MODEL
+    )
+    assert reloaded.record_count == 1
+
+
+def test_inner_product_metric_reports_cosine_scores(workspace_tmp_path):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(
+        snapshot_directory,
+        dimension=DIMENSION,
+        embedding_model=MODEL,
+        metric="inner_product",
+    )
+    store.add_embedded_chunks(
+        [
+            embedded_chunk("chunk-a", [1.0, 0.0, 0.0], page=1),
+            embedded_chunk("chunk-b", [0.6, 0.8, 0.0], page=2),
+        ]
+    )
+    assert isinstance(store.index, faiss_store_module.faiss.IndexFlatIP)
+
+    results = store.search([0.0, 1.0, 0.0], k=2)
+    assert [result["chunk_id"] for result in results] == ["chunk-b", "chunk-a"]
+    assert results[0]["score"] == pytest.approx(0.8)
+    assert results[0]["distance"] == pytest.approx(0.2)
+    assert results[1]["score"] == pytest.approx(0.0)
+
+    _, saved_manifest = manifest(snapshot_directory)
+    assert saved_manifest["metric"] == "inner_product"
+    with pytest.raises(IncompatibleSnapshotError, match="metric"):
+        FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+
+
+def test_l2_score_is_negated_distance_and_legacy_manifests_use_l2(
+    workspace_tmp_path,
+):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks([embedded_chunk("chunk-a", [1.0, 0.0, 0.0])])
+    path, data = manifest(snapshot_directory)
+    del data["metric"]
+    write_manifest(path, data)
+
+    reloaded = FAISSStore(
+        snapshot_directory, dimension=DIMENSION, embedding_model=MODEL
+    )
+    [result] = reloaded.search([0.0, 0.0, 0.0], k=1)
+    assert result["distance"] == pytest.approx(1.0)
+    assert result["score"] == pytest.approx(-1.0)
+
+
+def test_batch_search_matches_single_queries_with_one_faiss_call(monkeypatch):
+    store = FAISSStore(dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks(grid_chunks(6))
+    queries = faiss_store_module.np.asarray(
+        [[0.0, 0.0, 1.0], [4.0, 4.0, 1.0], [2.0, 2.0, 1.0]], dtype="float32"
+    )
+    expected = [store.search(query.tolist(), k=2) for query in queries]
+
+    calls = []
+    original_search = store.index.search
+
+    def counting_search(matrix, count):
+        calls.append(matrix.shape)
+        return original_search(matrix, count)
+
+    monkeypatch.setattr(store.index, "search", counting_search)
+    results = store.search_batch(queries, k=2)
+
+    assert calls == [(3, DIMENSION)]
+    assert results == expected
+    assert store.search_batch(queries[:0], k=2) == []
+    assert store.search_batch(queries, k=0) == [[], [], []]
+
+
+def test_batch_search_validates_the_whole_matrix():
+    store = FAISSStore(dimension=DIMENSION, embedding_model=MODEL)
+    with pytest.raises(DimensionMismatchError, match="Query matrix shape"):
+        store.search_batch([0.0, 0.0, 0.0], k=1)
+    with pytest.raises(DimensionMismatchError, match=r"\(n, 3\)"):
+        store.search_batch([[0.0, 0.0]], k=1)
+    with pytest.raises(InvalidVectorRecordError, match="non-finite"):
+        store.search_batch([[0.0, 0.0, 0.0], [0.0, float("inf"), 0.0]], k=1)
+    with pytest.raises(InvalidVectorRecordError, match="numeric"):
+        store.search_batch([["a", "b", "c"]], k=1)
+
+
+def test_search_results_share_read_only_records_without_copying(monkeypatch):
+    store = FAISSStore(dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
+
+    def fail_deepcopy(*_args, **_kwargs):
+        raise AssertionError("search must not deep-copy records")
+
+    monkeypatch.setattr(
+        faiss_store_module.records_module.copy, "deepcopy", fail_deepcopy
+    )
+    first, second = store.search([0.0, 0.0, 0.0], k=1), store.search(
+        [0.0, 0.0, 0.0], k=1
+    )
+    monkeypatch.undo()
+
+    assert first[0]["metadata"] is second[0]["metadata"]
+    assert first[0]["metadata"] is store.get_record("chunk-a")["metadata"]
+    assert json.loads(json.dumps(first[0]))["metadata"]["labels"] == ["one", "two"]
+    with pytest.raises(TypeError, match="read-only"):
+        first[0]["metadata"]["page_number"] = 9
+    with pytest.raises(TypeError, match="read-only"):
+        first[0]["metadata"]["labels"].append("three")
+    with pytest.raises(TypeError, match="read-only"):
+        store.records[0]["text"] = "changed"
+
+    editable = copy.deepcopy(first[0]["metadata"])
+    editable["nested"]["active"] = False
+    assert type(editable) is dict and type(editable["labels"]) is list
+    assert store.get_record("chunk-a")["metadata"]["nested"]["active"] is True
+
+
+def test_caller_owned_chunks_stay_independent_of_the_store():
+    chunk = embedded_chunk("chunk-a", [0.0, 0.0, 0.0])
+    store = FAISSStore(dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks([chunk])
+
+    chunk["metadata"]["labels"].append("later")
+
+    assert store.get_record("chunk-a")["metadata"]["labels"] == ["one", "two"]
+    assert (
+        pickle.loads(pickle.dumps(store.get_record("chunk-a")))["chunk_id"] == "chunk-a"
+    )
+
+
+def age_path(path: Path, seconds: float) -> None:
+    timestamp = path.stat().st_mtime - seconds
+    os.utime(path, (timestamp, timestamp))
+
+
+def snapshot_names(snapshot_directory: Path) -> set[str]:
+    return {path.name for path in (snapshot_directory / "snapshots").iterdir()}
+
+
+def test_publication_keeps_only_retained_superseded_generations(workspace_tmp_path):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(
+        snapshot_directory,
+        dimension=DIMENSION,
+        embedding_model=MODEL,
+        max_delta_generations=1,
+        retention=faiss_store_module.SnapshotRetention(
+            keep_generations=1, pending_grace_seconds=0
+        ),
+    )
+    store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
+    store.add_embedded_chunks([embedded_chunk("chunk-b", [1.0, 0.0, 0.0])])
+    first_chain = current_generations(snapshot_directory)
+    store.add_embedded_chunks([embedded_chunk("chunk-c", [2.0, 0.0, 0.0])])
+    second_chain = current_generations(snapshot_directory)
+
+    # The superseded base and its delta are the one retained rollback generation.
+    assert snapshot_names(snapshot_directory) == {*first_chain, *second_chain}
+
+    store.add_embedded_chunks([embedded_chunk("chunk-d", [3.0, 0.0, 0.0])])
+    store.add_embedded_chunks([embedded_chunk("chunk-e", [4.0, 0.0, 0.0])])
+    assert not snapshot_names(snapshot_directory) & set(first_chain)
+    assert set(second_chain) <= snapshot_names(snapshot_directory)
+    assert (
+        FAISSStore(
+            snapshot_directory, dimension=DIMENSION, embedding_model=MODEL
+        ).record_count
+        == 5
+    )
+
+
+def test_garbage_collection_respects_grace_age_and_dry_run(workspace_tmp_path):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+    store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
+    superseded = generation_directory(snapshot_directory)
+    store.save_snapshot()
+    abandoned = snapshot_directory / ".pending-abandoned"
+    abandoned.mkdir()
+    in_flight = snapshot_directory / ".pending-in-flight"
+    in_flight.mkdir()
+    for path in (superseded, abandoned):
+        age_path(path, 7200)
+
+    dry_run = store.collect_garbage(dry_run=True)
+    assert dry_run.removed == (".pending-abandoned",)
+    assert dry_run.retained == (f"snapshots/{superseded.name}",)
+    assert abandoned.exists()
+
+    collection = faiss_store_module.collect_snapshot_garbage(
+        snapshot_directory,
+        faiss_store_module.SnapshotRetention(keep_generations=1, max_age_seconds=60),
+    )
+    assert set(collection.removed) == {
+        ".pending-abandoned",
+        f"snapshots/{superseded.name}",
+    }
+    assert not abandoned.exists() and not superseded.exists()
+    assert in_flight.exists()
+    assert FAISSStore(
+        snapshot_directory, dimension=DIMENSION, embedding_model=MODEL
+    ).get_record("chunk-a")
+
+
+def test_garbage_collection_requires_a_current_pointer(workspace_tmp_path):
+    snapshot_directory = workspace_tmp_path / "store"
+    (snapshot_directory / "snapshots" / "snapshot-orphan").mkdir(parents=True)
+
+    with pytest.raises(faiss_store_module.SnapshotNotFoundError):
+        faiss_store_module.collect_snapshot_garbage(snapshot_directory)
+    assert (snapshot_directory / "snapshots" / "snapshot-orphan").exists()
+    with pytest.raises(FAISSStoreError, match="in-memory store"):
+        FAISSStore(dimension=DIMENSION, embedding_model=MODEL).collect_garbage()
+
+
+def test_failed_garbage_collection_does_not_undo_publication(
+    workspace_tmp_path, monkeypatch, caplog
+):
+    snapshot_directory = workspace_tmp_path / "store"
+    store = FAISSStore(snapshot_directory, dimension=DIMENSION, embedding_model=MODEL)
+
+    def fail_collection(*_args, **_kwargs):
+        raise FAISSStoreError("simulated sweep failure")
+
+    monkeypatch.setattr(faiss_store_module, "collect_snapshot_garbage", fail_collection)
+    store.add_embedded_chunks([embedded_chunk("chunk-a", [0.0, 0.0, 0.0])])
+
+    assert store.record_count == 1
+    assert "simulated sweep failure" in caplog.text
+    assert (
+        FAISSStore(
+            snapshot_directory, dimension=DIMENSION, embedding_model=MODEL
+        ).record_count
+        == 1
+    )
@@ -0,0 +1,249 @@
+import gc
+
+import numpy as np
+import pytest
+
+from src import vectorstore
+
+DuplicateChunkIDError = vectorstore.faiss.DuplicateChunkIDError
+FAISSStore = vectorstore.faiss.FAISSStore
+InvalidVectorRecordError = vectorstore.faiss.InvalidVectorRecordError
+SearchFilter = vectorstore.filters.SearchFilter
+SegmentCache = vectorstore.segments.SegmentCache
+SegmentStore = vectorstore.segments.SegmentStore
+
+
+DIMENSION = 3
+MODEL = "test-embedding-model"
+
+
+def document_chunks(document_id, vectors, *, source_type="paragraph"):
+    return [
+        {
+            "chunk_id": f"{document_id}:{index:06d}",
+            "text": f"text {index} of {document_id}",
+            "metadata": {
+                "schema_version": 1,
+                "length_unit": "characters",
+                "document_id": document_id,
+                "document_title": document_id,
+                "source_type": source_type,
+                "source_sequence": index,
+                "chunk_sequence": index,
+                "part_index": 0,
+                "part_count": 1,
+                "page_number": index + 1,
+            },
+            "embedding": vector,
+        }
+        for index, vector in enumerate(vectors)
+    ]
+
+
+HANDBOOK = document_chunks("handbook", [[0.0, 0.0, 0.0], [4.0, 0.0, 0.0]])
+NOTES = document_chunks(
+    "notes", [[1.0, 0.0, 0.0], [9.0, 0.0, 0.0]], source_type="table"
+)
+
+
+def cache():
+    return SegmentCache(dimension=DIMENSION, embedding_model=MODEL)
+
+
+def test_sessions_share_one_segment_per_document():
+    shared = cache()
+    first = SegmentStore(shared)
+    second = SegmentStore(shared)
+
+    first.add_embedded_chunks(HANDBOOK)
+    second.add_embedded_chunks(HANDBOOK + NOTES)
+
+    assert len(shared) == 2
+    assert first.get_record("handbook:000000") is second.get_record("handbook:000000")
+    assert first.record_count == 2
+    assert second.document_ids == ("handbook", "notes")
+    assert first.search([9.0, 0.0, 0.0], k=5)[0]["chunk_id"] == "handbook:000001"
+
+
+def test_search_merges_segments_like_a_single_store():
+    overlay = SegmentStore(cache())
+    overlay.add_embedded_chunks(HANDBOOK)
+    overlay.add_embedded_chunks(NOTES)
+    single = FAISSStore(dimension=DIMENSION, embedding_model=MODEL)
+    single.add_embedded_chunks(HANDBOOK + NOTES)
+    queries = [[0.5, 0.0, 0.0], [8.0, 0.0, 0.0]]
+
+    assert overlay.search_batch(queries, k=3) == single.search_batch(queries, k=3)
+    assert overlay.search([3.0, 0.0, 0.0], k=2) == single.search([3.0, 0.0, 0.0], k=2)
+    assert overlay.records == single.records
+    tables = SearchFilter(source_types=["table"])
+    assert overlay.search([0.0, 0.0, 0.0], k=1, filter=tables) == single.search(
+        [0.0, 0.0, 0.0], k=1, filter=tables
+    )
+    only_notes = SearchFilter(document_ids=["notes"])
+    results = overlay.search([0.0, 0.0, 0.0], k=5, filter=only_notes)
+    assert [result["chunk_id"] for result in results] == [
+        "notes:000000",
+        "notes:000001",
+    ]
+
+
+def test_mutations_change_only_the_session_references():
+    shared = cache()
+    first = SegmentStore(shared)
+    second = SegmentStore(shared)
+    first.add_embedded_chunks(HANDBOOK + NOTES)
+    second.add_embedded_chunks(HANDBOOK)
+
+    assert first.remove_document("handbook") == 2
+    assert first.remove_document("handbook") == 0
+    revised = document_chunks("notes", [[2.0, 0.0, 0.0]])
+    assert first.replace_document("notes", revised) == 1
+
+    assert [record["chunk_id"] for record in first.records] == ["notes:000000"]
+    assert first.search([9.0, 0.0, 0.0], k=1)[0]["metadata"]["source_type"] == (
+        "paragraph"
+    )
+    assert [record["chunk_id"] for record in second.records] == [
+        "handbook:000000",
+        "handbook:000001",
+    ]
+
+
+def test_invalid_additions_leave_the_session_unchanged():
+    overlay = SegmentStore(cache())
+    overlay.add_embedded_chunks(HANDBOOK)
+
+    with pytest.raises(InvalidVectorRecordError, match="already stored"):
+        overlay.add_embedded_chunks(NOTES + HANDBOOK)
+    with pytest.raises(InvalidVectorRecordError, match="notes"):
+        overlay.replace_document("handbook", NOTES)
+    clashing = document_chunks("other", [[1.0, 1.0, 1.0]])
+    clashing[0]["chunk_id"] = "handbook:000000"
+    with pytest.raises(DuplicateChunkIDError, match="handbook:000000"):
+        overlay.add_embedded_chunks(clashing)
+
+    assert overlay.document_ids == ("handbook",)
+    assert overlay.search([0.0, 0.0, 0.0], k=0) == []
+
+
+def test_unreferenced_segments_are_released_and_mismatches_stay_apart():
+    shared = cache()
+    overlay = SegmentStore(shared)
+    overlay.add_embedded_chunks(HANDBOOK)
+    other = SegmentStore(shared)
+    other.add_embedded_chunks(HANDBOOK[:1])
+
+    assert other.record_count == 1
+    assert overlay.record_count == 2
+
+    overlay.remove_document("handbook")
+    other.remove_document("handbook")
+    gc.collect()
+    assert len(shared) == 0
+
+
+def test_empty_session_validates_queries():
+    overlay = SegmentStore(cache())
+
+    assert overlay.search([0.0, 0.0, 0.0]) == []
+    with pytest.raises(vectorstore.faiss.DimensionMismatchError):
+        overlay.search([0.0, 0.0])
+    with pytest.raises(ValueError, match="dimension"):
+        SegmentCache(dimension=0, embedding_model=MODEL)
+
+
+def test_matrix_additions_match_embedded_chunk_additions():
+    chunks = HANDBOOK + NOTES
+    records = [
+        {key: value for key, value in chunk.items() if key != "embedding"}
+        for chunk in chunks
+    ]
+    vectors = np.array([chunk["embedding"] for chunk in chunks], dtype=np.float32)
+    shared = cache()
+    from_matrix = SegmentStore(shared)
+    from_chunks = SegmentStore(shared)
+
+    assert from_matrix.add_vectors(vectors, records) == 4
+    from_chunks.add_embedded_chunks(chunks)
+
+    assert len(shared) == 2
+    assert from_matrix.records == from_chunks.records
+    assert from_matrix.search([8.0, 0.0, 0.0], k=4) == from_chunks.search(
+        [8.0, 0.0, 0.0], k=4
+    )
+    with pytest.raises(vectorstore.faiss.DimensionMismatchError, match="rows"):
+        SegmentStore(shared).add_vectors(vectors[:1], records)
+
+
+def test_equal_chunk_ids_with_other_vectors_get_their_own_segment():
+    shared = cache()
+    original = SegmentStore(shared)
+    original.add_embedded_chunks(HANDBOOK)
+    reembedded = SegmentStore(shared)
+    reembedded.add_embedded_chunks(
+        document_chunks("handbook", [[9.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    )
+    repeated = SegmentStore(shared)
+    repeated.add_embedded_chunks(HANDBOOK)
+
+    assert len(shared) == 2
+    assert repeated.get_record("handbook:000000") is original.get_record(
+        "handbook:000000"
+    )
+    assert original.search([9.0, 0.0, 0.0], k=1)[0]["chunk_id"] == "handbook:000001"
+    assert reembedded.search([9.0, 0.0, 0.0], k=1)[0]["chunk_id"] == ("handbook:000000")
+    assert shared.empty_segment.search([0.0, 0.0, 0.0]) == []
+
+
+def test_same_bytes_under_another_name_keep_their_own_metadata():
+    shared = cache()
+    first = SegmentStore(shared)
+    second = SegmentStore(shared)
+    original, renamed = (
+        document_chunks("handbook", [[0.0, 0.0, 0.0], [4.0, 0.0, 0.0]])
+        for _ in range(2)
+    )
+    for chunk in original:
+        chunk["metadata"]["file_name"] = "handbook.pdf"
+    for chunk in renamed:
+        chunk["metadata"]["file_name"] = "renamed.pdf"
+        chunk["metadata"]["document_title"] = "renamed.pdf"
+
+    first.add_embedded_chunks(original)
+    second.add_embedded_chunks(renamed)
+
+    assert len(shared) == 2
+    hit = second.search([0.0, 0.0, 0.0], k=1)[0]["metadata"]
+    assert (hit["file_name"], hit["document_title"]) == ("renamed.pdf", "renamed.pdf")
+    assert first.search([0.0, 0.0, 0.0], k=1)[0]["metadata"]["file_name"] == (
+        "handbook.pdf"
+    )
+
+
+def test_trained_index_types_search_one_combined_index():
+    spec = vectorstore.faiss.FAISSIndexSpec(
+        index_type="IVFFlat", nlist=2, nprobe=1, training_threshold=4
+    )
+    shared = SegmentCache(dimension=DIMENSION, embedding_model=MODEL, index_spec=spec)
+    overlay = SegmentStore(shared)
+    overlay.add_embedded_chunks(HANDBOOK)
+    single = FAISSStore(dimension=DIMENSION, embedding_model=MODEL, index_spec=spec)
+    single.add_embedded_chunks(HANDBOOK)
+    queries = [[0.5, 0.0, 0.0], [8.0, 0.0, 0.0]]
+
+    assert overlay.search_batch(queries, k=4) == single.search_batch(queries, k=4)
+
+    overlay.add_embedded_chunks(NOTES)
+    single.add_embedded_chunks(NOTES)
+    only_notes = SearchFilter(document_ids=["notes"])
+
+    assert overlay.search_batch(queries, k=4) == single.search_batch(queries, k=4)
+    assert overlay.search([8.0, 0.0, 0.0], k=4, filter=only_notes) == single.search(
+        [8.0, 0.0, 0.0], k=4, filter=only_notes
+    )
+    overlay.remove_document("handbook")
+    assert [result["chunk_id"] for result in overlay.search([0.0, 0.0, 0.0], k=4)] == [
+        "notes:000000",
+        "notes:000001",
+    ]